@@ -0,0 +1,46 @@
+import os
+from typing import Optional
+
+from .callbacks import TelemetryCallbacks, instrument, prepend_callback
+from .exporters import BackgroundExporter, ConsoleExporter, JsonlExporter, OtelExporter
+from .recorder import TELEMETRY, Span, SpanRecorder, percentile, summarize_durations
+
+_env_exporter: Optional[BackgroundExporter] = None
+
+
+def start_exporter_from_env(recorder: SpanRecorder = TELEMETRY) -> Optional[BackgroundExporter]:
+    """Starts the exporter selected by environment variables, at most once.
+
+    AGENT_TELEMETRY_JSONL=<path> writes spans to a JSONL file;
+    AGENT_TELEMETRY_OTEL=1 sends them to the global OpenTelemetry tracer.
+    Otherwise spans are printed to the console, unless AGENT_TELEMETRY_CONSOLE=0.
+
+    Call it where the agent starts running, not at import: it starts a thread.
+    """
+    global _env_exporter
+    if _env_exporter is None and recorder.enabled:
+        jsonl_path = os.environ.get("AGENT_TELEMETRY_JSONL")
+        if jsonl_path:
+            _env_exporter = JsonlExporter(recorder, jsonl_path).start()
+        elif os.environ.get("AGENT_TELEMETRY_OTEL") == "1":
+            _env_exporter = OtelExporter(recorder).start()
+        elif os.environ.get("AGENT_TELEMETRY_CONSOLE", "1") != "0":
+            _env_exporter = ConsoleExporter(recorder).start()
+    return _env_exporter
+
+
+__all__ = [
+    "BackgroundExporter",
+    "ConsoleExporter",
+    "JsonlExporter",
+    "OtelExporter",
+    "Span",
+    "SpanRecorder",
+    "TELEMETRY",
+    "TelemetryCallbacks",
+    "instrument",
+    "percentile",
+    "prepend_callback",
+    "start_exporter_from_env",
+    "summarize_durations",
+]
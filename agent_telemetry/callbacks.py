@@ -0,0 +1,127 @@
+from typing import Any, Dict, Optional
+
+from google.adk.agents import BaseAgent, LlmAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest, LlmResponse
+from google.adk.tools import BaseTool
+from google.adk.tools.tool_context import ToolContext
+from google.genai import types
+
+from .recorder import TELEMETRY, SpanRecorder
+
+
+class TelemetryCallbacks:
+    """ADK callbacks that time agent runs, model calls and tool calls.
+
+    Every callback returns None, so they never change agent behaviour. When
+    the recorder is disabled each callback costs a single attribute check.
+    """
+
+    def __init__(self, recorder: SpanRecorder = TELEMETRY) -> None:
+        self.recorder = recorder
+
+    def before_agent(self, callback_context: CallbackContext) -> Optional[types.Content]:
+        if self.recorder.enabled:
+            self.recorder.start(
+                "agent", (callback_context.invocation_id, callback_context.agent_name)
+            )
+        return None
+
+    def after_agent(self, callback_context: CallbackContext) -> Optional[types.Content]:
+        if self.recorder.enabled:
+            agent_name = callback_context.agent_name
+            self.recorder.end(
+                "agent", (callback_context.invocation_id, agent_name), agent_name
+            )
+        return None
+
+    def before_model(
+        self, callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> Optional[LlmResponse]:
+        if self.recorder.enabled:
+            self.recorder.start(
+                "model", (callback_context.invocation_id, callback_context.agent_name)
+            )
+        return None
+
+    def after_model(
+        self, callback_context: CallbackContext, llm_response: LlmResponse
+    ) -> Optional[LlmResponse]:
+        # Streaming chunks are not separate model calls; wait for the final one.
+        if not self.recorder.enabled or llm_response.partial:
+            return None
+        agent_name = callback_context.agent_name
+        self.recorder.end(
+            "model", (callback_context.invocation_id, agent_name), agent_name
+        )
+        usage = llm_response.usage_metadata
+        if usage:
+            self.recorder.increment(
+                f"model.{agent_name}.prompt_tokens", usage.prompt_token_count or 0
+            )
+            self.recorder.increment(
+                f"model.{agent_name}.output_tokens", usage.candidates_token_count or 0
+            )
+        return None
+
+    def before_tool(
+        self, tool: BaseTool, args: Dict[str, Any], tool_context: ToolContext
+    ) -> Optional[Dict]:
+        if self.recorder.enabled:
+            self.recorder.start("tool", _tool_span_key(tool, tool_context))
+        return None
+
+    def after_tool(
+        self,
+        tool: BaseTool,
+        args: Dict[str, Any],
+        tool_context: ToolContext,
+        tool_response: Dict,
+    ) -> Optional[Dict]:
+        if self.recorder.enabled:
+            self.recorder.end("tool", _tool_span_key(tool, tool_context), tool.name)
+        return None
+
+
+def _tool_span_key(tool: BaseTool, tool_context: ToolContext) -> Any:
+    return tool_context.function_call_id or (tool_context.invocation_id, tool.name)
+
+
+def prepend_callback(callback: Any, existing: Any) -> list:
+    """Returns `existing` (None, one callback or a list) with `callback` run first."""
+    if existing is None:
+        return [callback]
+    if isinstance(existing, list):
+        return [callback, *existing]
+    return [callback, existing]
+
+
+def instrument(agent: BaseAgent, recorder: SpanRecorder = TELEMETRY) -> BaseAgent:
+    """Attaches telemetry callbacks to `agent` and all of its sub-agents.
+
+    The telemetry callbacks run before any existing callbacks, because ADK
+    skips the remaining callbacks once one of them returns a value.
+    """
+    callbacks = TelemetryCallbacks(recorder)
+    agent.before_agent_callback = prepend_callback(
+        callbacks.before_agent, agent.before_agent_callback
+    )
+    agent.after_agent_callback = prepend_callback(
+        callbacks.after_agent, agent.after_agent_callback
+    )
+    if isinstance(agent, LlmAgent):
+        agent.before_model_callback = prepend_callback(
+            callbacks.before_model, agent.before_model_callback
+        )
+        agent.after_model_callback = prepend_callback(
+            callbacks.after_model, agent.after_model_callback
+        )
+        agent.before_tool_callback = prepend_callback(
+            callbacks.before_tool, agent.before_tool_callback
+        )
+        agent.after_tool_callback = prepend_callback(
+            callbacks.after_tool, agent.after_tool_callback
+        )
+    for sub_agent in agent.sub_agents:
+        instrument(sub_agent, recorder)
+    return agent
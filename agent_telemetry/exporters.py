@@ -0,0 +1,135 @@
+import abc
+import atexit
+import json
+import threading
+from typing import List, Optional
+
+from .recorder import Span, SpanRecorder
+
+try:
+    from opentelemetry import trace as otel_trace
+except ImportError:  # OpenTelemetry is optional
+    otel_trace = None
+
+
+class BackgroundExporter(abc.ABC):
+    """Periodically drains new spans from a recorder on a daemon thread.
+
+    Callbacks only write to the recorder's ring buffer; serialization and I/O
+    happen here, off the agent's hot path. If the buffer wraps before a flush,
+    the overwritten spans are counted in `dropped`. Subclasses implement
+    `export`.
+    """
+
+    def __init__(self, recorder: SpanRecorder, interval_seconds: float = 1.0) -> None:
+        self.recorder = recorder
+        self.interval_seconds = interval_seconds
+        self.exported = 0
+        self.dropped = 0
+        self._cursor = recorder.total_recorded
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "BackgroundExporter":
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name=type(self).__name__, daemon=True
+            )
+            self._thread.start()
+            atexit.register(self.stop)
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def flush(self) -> int:
+        """Exports spans recorded since the last flush. Returns how many."""
+        with self._flush_lock:
+            spans, self._cursor, dropped = self.recorder.spans_since(self._cursor)
+            self.dropped += dropped
+            if spans:
+                self.export(spans)
+                self.exported += len(spans)
+            return len(spans)
+
+    @abc.abstractmethod
+    def export(self, spans: List[Span]) -> None:
+        """Writes out one batch of spans; runs on the exporter thread."""
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"[TELEMETRY] Export failed: {e}")
+
+
+class ConsoleExporter(BackgroundExporter):
+    """Prints one line per span, e.g. `[TELEMETRY] agent my_agent took 1.234s`."""
+
+    def export(self, spans: List[Span]) -> None:
+        for span in spans:
+            print(f"[TELEMETRY] {span.kind} {span.name} took {span.duration_ns / 1e9:.3f}s")
+
+
+class JsonlExporter(BackgroundExporter):
+    """Appends one JSON object per span to `path`."""
+
+    def __init__(
+        self, recorder: SpanRecorder, path: str, interval_seconds: float = 1.0
+    ) -> None:
+        super().__init__(recorder, interval_seconds)
+        self.path = path
+
+    def export(self, spans: List[Span]) -> None:
+        offset = self.recorder.epoch_offset_ns
+        with open(self.path, "a", encoding="utf-8") as jsonl_file:
+            for span in spans:
+                jsonl_file.write(
+                    json.dumps(
+                        {
+                            "kind": span.kind,
+                            "name": span.name,
+                            "start_unix_ns": span.start_ns + offset,
+                            "duration_ns": span.duration_ns,
+                        }
+                    )
+                    + "\n"
+                )
+
+
+class OtelExporter(BackgroundExporter):
+    """Re-emits spans through an OpenTelemetry tracer.
+
+    Requires the `opentelemetry-api` package; the SDK and exporter setup (e.g.
+    OTLP) is left to the application's tracer provider.
+    """
+
+    def __init__(
+        self,
+        recorder: SpanRecorder,
+        tracer_provider=None,
+        interval_seconds: float = 1.0,
+    ) -> None:
+        if otel_trace is None:
+            raise ImportError(
+                "OtelExporter requires the 'opentelemetry-api' package to be installed."
+            )
+        super().__init__(recorder, interval_seconds)
+        self.tracer = otel_trace.get_tracer("agent_telemetry", tracer_provider=tracer_provider)
+
+    def export(self, spans: List[Span]) -> None:
+        offset = self.recorder.epoch_offset_ns
+        for span in spans:
+            start_time = span.start_ns + offset
+            otel_span = self.tracer.start_span(
+                f"{span.kind} {span.name}",
+                start_time=start_time,
+                attributes={"agent_telemetry.kind": span.kind, "agent_telemetry.name": span.name},
+            )
+            otel_span.end(end_time=start_time + span.duration_ns)
@@ -0,0 +1,146 @@
+import os
+import threading
+import time
+from array import array
+from typing import Any, Dict, Hashable, List, NamedTuple, Optional, Tuple
+
+SPAN_KINDS = ("agent", "model", "tool")
+_KIND_INDEX = {kind: index for index, kind in enumerate(SPAN_KINDS)}
+
+
+class Span(NamedTuple):
+    kind: str
+    name: str
+    start_ns: int  # time.perf_counter_ns() at span start
+    duration_ns: int
+
+
+class SpanRecorder:
+    """Records agent, model and tool spans into a preallocated ring buffer.
+
+    Durations come from `time.perf_counter_ns()`. Completed spans are written
+    into fixed-size arrays, so recording never grows memory; once the buffer
+    is full the oldest spans are overwritten. Histograms are computed from
+    the spans currently in the buffer, and counters are kept per span name.
+
+    When `enabled` is False every method returns immediately.
+    """
+
+    def __init__(self, capacity: int = 4096, enabled: bool = True) -> None:
+        if capacity <= 0:
+            raise ValueError("capacity must be a positive integer.")
+        self.capacity = capacity
+        self.enabled = enabled
+        self._kinds = bytearray(capacity)
+        self._names: List[Optional[str]] = [None] * capacity
+        self._starts = array("q", bytes(8 * capacity))
+        self._durations = array("q", bytes(8 * capacity))
+        self._written = 0  # Total spans ever written; next slot is _written % capacity.
+        self._open: Dict[Hashable, int] = {}
+        self._max_open = capacity
+        self._lock = threading.Lock()
+        self.counters: Dict[str, int] = {}
+        # Converts perf_counter_ns() readings to Unix epoch nanoseconds for exporters.
+        self.epoch_offset_ns = time.time_ns() - time.perf_counter_ns()
+
+    def start(self, kind: str, key: Hashable) -> None:
+        if not self.enabled:
+            return
+        self._open[(kind, key)] = time.perf_counter_ns()
+        # Spans whose end callback never runs (e.g. a short-circuited model
+        # call) must not accumulate; drop the oldest open span instead.
+        if len(self._open) > self._max_open:
+            del self._open[next(iter(self._open))]
+
+    def end(self, kind: str, key: Hashable, name: str) -> Optional[int]:
+        """Closes a span started with the same kind/key. Returns its duration in ns."""
+        if not self.enabled:
+            return None
+        start_ns = self._open.pop((kind, key), None)
+        if start_ns is None:
+            return None
+        duration_ns = time.perf_counter_ns() - start_ns
+        self.record(kind, name, start_ns, duration_ns)
+        return duration_ns
+
+    def record(self, kind: str, name: str, start_ns: int, duration_ns: int) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            slot = self._written % self.capacity
+            self._kinds[slot] = _KIND_INDEX[kind]
+            self._names[slot] = name
+            self._starts[slot] = start_ns
+            self._durations[slot] = duration_ns
+            self._written += 1
+        self.increment(f"{kind}.{name}.count")
+
+    def increment(self, counter: str, value: int = 1) -> None:
+        if not self.enabled:
+            return
+        self.counters[counter] = self.counters.get(counter, 0) + value
+
+    @property
+    def total_recorded(self) -> int:
+        return self._written
+
+    def spans_since(self, position: int) -> Tuple[List[Span], int, int]:
+        """Returns (spans written after `position`, new position, dropped count).
+
+        `position` is a value previously returned by this method (start at 0).
+        Spans overwritten before they were read are reported as dropped.
+        """
+        with self._lock:
+            written = self._written
+            first = max(position, written - self.capacity)
+            spans = [self._span_at(index % self.capacity) for index in range(first, written)]
+        return spans, written, first - position
+
+    def spans(self) -> List[Span]:
+        """Returns the spans currently in the buffer, oldest first."""
+        return self.spans_since(0)[0]
+
+    def _span_at(self, slot: int) -> Span:
+        return Span(
+            SPAN_KINDS[self._kinds[slot]],
+            self._names[slot],
+            self._starts[slot],
+            self._durations[slot],
+        )
+
+    def histograms(self) -> Dict[str, Dict[str, Any]]:
+        """Returns count and p50/p95/p99/max latency (ms) per `kind.name`."""
+        durations: Dict[str, List[int]] = {}
+        for span in self.spans():
+            durations.setdefault(f"{span.kind}.{span.name}", []).append(span.duration_ns)
+        return {
+            span_name: summarize_durations(sorted(values))
+            for span_name, values in sorted(durations.items())
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._written = 0
+            self._open.clear()
+            self.counters.clear()
+
+
+def percentile(sorted_values: List[Any], fraction: float) -> Any:
+    """Nearest-rank percentile of an already sorted, non-empty list."""
+    index = max(0, min(len(sorted_values) - 1, int(fraction * len(sorted_values) + 0.5) - 1))
+    return sorted_values[index]
+
+
+def summarize_durations(sorted_values: List[int]) -> Dict[str, Any]:
+    return {
+        "count": len(sorted_values),
+        "p50_ms": percentile(sorted_values, 0.50) / 1e6,
+        "p95_ms": percentile(sorted_values, 0.95) / 1e6,
+        "p99_ms": percentile(sorted_values, 0.99) / 1e6,
+        "max_ms": sorted_values[-1] / 1e6,
+    }
+
+
+# Process-wide recorder shared by every instrumented agent.
+# Set AGENT_TELEMETRY=0 to disable recording.
+TELEMETRY = SpanRecorder(enabled=os.environ.get("AGENT_TELEMETRY", "1") != "0")
@@ -7,38 +7,50 @@ from google.adk.agents import Agent as LlmAgent
 from google.adk.agents.callback_context import CallbackContext
 from google.genai import types
 
+try:
+    # The shared package at the repository root; only importable when the root is on the path.
+    from agent_telemetry import TELEMETRY, instrument, start_exporter_from_env
+except ImportError:
+    TELEMETRY = None
+
 
 def before_agent_callback(callback_context: CallbackContext) -> Optional[types.Content]:
     if "session_id" not in callback_context.state:
         callback_context.state["session_id"] = str(uuid.uuid4())
 
-    callback_context.state["interaction_start_time"] = datetime.now(timezone.utc)
     request_num = callback_context.state.get("request_counter", 0) + 1
     callback_context.state["request_counter"] = request_num
+    if TELEMETRY is not None:
+        # Started on the first run rather than at import; later calls return the running exporter.
+        start_exporter_from_env()
+        # Timing is recorded by agent_telemetry; only per-session counters live in state.
+        TELEMETRY.increment("agent.lifecycle_logger_agent.interactions_started")
+        return None
 
+    callback_context.state["interaction_start_time"] = datetime.now(timezone.utc).isoformat()
     print(
         f"\n[BEFORE AGENT - SID: {callback_context.state['session_id']}] Interaction #{request_num} initiated."
     )
     print(f"Timestamp: {callback_context.state['interaction_start_time']}")
-    print("\n\n")
-    # Here you could also log incoming user_id if passed via context
     return None
 
 
 def after_agent_callback(callback_context: CallbackContext) -> Optional[types.Content]:
+    if TELEMETRY is not None:
+        # Started minus completed interactions shows runs that failed or were cancelled.
+        TELEMETRY.increment("agent.lifecycle_logger_agent.interactions_completed")
+        return None
+
     start_time = callback_context.state.get("interaction_start_time")
     duration_str = "N/A"
     if start_time:
-        duration = datetime.now(timezone.utc) - start_time
+        duration = datetime.now(timezone.utc) - datetime.fromisoformat(start_time)
         duration_str = f"{duration.total_seconds():.2f}s"
-
     print(
         f"\n[AFTER AGENT - SID: {callback_context.state['session_id']}] Interaction #{callback_context.state['request_counter']} completed."
     )
     print(f"Duration: {duration_str}")
-    print("\n\n")
     # Potentially log final response or any errors encountered
-    # callback_context.state can be used to persist metrics for the session
     return None
 
 
@@ -51,4 +63,8 @@ lifecycle_logger_agent = LlmAgent(
     after_agent_callback=after_agent_callback,
 )
 
+if TELEMETRY is not None:
+    # Adds agent, model and tool spans ahead of the callbacks above.
+    instrument(lifecycle_logger_agent)
+
 root_agent = lifecycle_logger_agent
@@ -1,12 +1,15 @@
 # agent.py in 02_model_input_sanitization
 import re
-from typing import Optional
+from typing import Dict, Optional
 
 from google.adk.agents import Agent as LlmAgent
 from google.adk.agents.callback_context import CallbackContext
 from google.adk.models import LlmRequest, LlmResponse
 from google.genai import types
 
+from .incremental import IncrementalSanitizer
+from .redaction import PiiRedactor
+
 # Simplified PII patterns for demo
 PII_PATTERNS = {
     "CREDIT_CARD": re.compile(r"\b\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b"),
@@ -14,39 +17,79 @@ PII_PATTERNS = {
 }
 REDACTION_PLACEHOLDER = "[REDACTED PII]"
 
+# All patterns compiled into one alternation: one scan per text part.
+# Every pattern above starts with a digit, which lets the scan skip other characters.
+PII_REDACTOR = PiiRedactor(PII_PATTERNS, REDACTION_PLACEHOLDER, first_char=r"\d")
+
+# "last_user_message": redact only the latest user turn.
+# "incremental": redact every user turn and tool output, scanning only turns
+# added since the previous model call (progress is kept in session state).
+SANITIZATION_MODE = "incremental"
+SANITIZER_MARKER_KEY = "pii_sanitizer_marker"
+INCREMENTAL_SANITIZER = IncrementalSanitizer(PII_REDACTOR)
+
+
+def _sanitize_last_user_message(
+    callback_context: CallbackContext, llm_request: LlmRequest
+) -> None:
+    # Process the last user message for sanitization
+    last_user_content_index = -1
+    for i in range(len(llm_request.contents) - 1, -1, -1):
+        if llm_request.contents[i].role == "user":
+            last_user_content_index = i
+            break
+
+    if (
+        last_user_content_index != -1
+        and llm_request.contents[last_user_content_index].parts
+    ):
+        total_counts: Dict[str, int] = {}
+        for part in llm_request.contents[last_user_content_index].parts:
+            if not part.text:
+                continue
+
+            print(f"\n[BEFORE MODEL] Original user input: '{part.text}'")
+            sanitized_text, counts = PII_REDACTOR.redact(part.text)
+            if counts:
+                part.text = sanitized_text
+                for pii_type, count in counts.items():
+                    total_counts[pii_type] = total_counts.get(pii_type, 0) + count
+                    print(f"[BEFORE MODEL] Redacted {count} x {pii_type}.")
+                print(f"[BEFORE MODEL] Sanitized input to LLM: '{sanitized_text}'")
+
+        if total_counts:
+            callback_context.state["pii_redaction_counts"] = total_counts
+        print("\n")
+
+
+def _sanitize_new_turns(
+    callback_context: CallbackContext, llm_request: LlmRequest
+) -> None:
+    marker = callback_context.state.get(SANITIZER_MARKER_KEY)
+    previously_scanned = marker["count"] if marker else 0
+    new_marker, counts = INCREMENTAL_SANITIZER.sanitize(llm_request.contents, marker)
+
+    print(
+        f"\n[BEFORE MODEL] Scanned {len(llm_request.contents) - previously_scanned} new "
+        f"of {len(llm_request.contents)} content entries."
+    )
+    for pii_type, count in counts.items():
+        print(f"[BEFORE MODEL] Redacted {count} x {pii_type}.")
+    if counts:
+        callback_context.state["pii_redaction_counts"] = counts
+    if new_marker != marker:
+        callback_context.state[SANITIZER_MARKER_KEY] = new_marker
+    print("\n")
+
 
 def before_model_callback_sanitize(
     callback_context: CallbackContext, llm_request: LlmRequest
 ) -> Optional[LlmResponse]:
-    modified = False
     if llm_request.contents:
-        # Process the last user message for sanitization
-        last_user_content_index = -1
-        for i in range(len(llm_request.contents) - 1, -1, -1):
-            if llm_request.contents[i].role == "user":
-                last_user_content_index = i
-                break
-
-        if (
-            last_user_content_index != -1
-            and llm_request.contents[last_user_content_index].parts
-        ):
-            original_text = llm_request.contents[last_user_content_index].parts[0].text
-            sanitized_text = original_text
-
-            print(f"\n[BEFORE MODEL] Original user input: '{original_text}'")
-            for pii_type, pattern in PII_PATTERNS.items():
-                if pattern.search(sanitized_text):
-                    sanitized_text = pattern.sub(REDACTION_PLACEHOLDER, sanitized_text)
-                    modified = True
-                    print(f"[BEFORE MODEL] Redacted {pii_type}.")
-
-            if modified:
-                llm_request.contents[last_user_content_index].parts[
-                    0
-                ].text = sanitized_text
-                print(f"[BEFORE MODEL] Sanitized input to LLM: '{sanitized_text}'")
-            print("\n")
+        if SANITIZATION_MODE == "incremental":
+            _sanitize_new_turns(callback_context, llm_request)
+        else:
+            _sanitize_last_user_message(callback_context, llm_request)
     return None
 
 
@@ -0,0 +1,111 @@
+# incremental.py in example_02_model_input_sanitization
+import hashlib
+from typing import Any, Dict, List, Optional, Tuple
+
+from google.genai import types
+
+from .redaction import PiiRedactor
+
+
+def content_fingerprint(content: types.Content) -> str:
+    """Hashes the role and text/tool-output payload of one content entry."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update((content.role or "").encode())
+    for part in content.parts or ():
+        if part.text:
+            digest.update(part.text.encode())
+        elif part.function_response:
+            digest.update(repr(part.function_response.response).encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class IncrementalSanitizer:
+    """Sanitizes only the `llm_request.contents` entries added since last call.
+
+    ADK rebuilds `llm_request.contents` from the (unredacted) session events
+    on every model call. The marker returned by `sanitize` remembers how many
+    entries were already scanned, a fingerprint of the last one, and the
+    positions of the few parts that contained PII. On the next call only
+    those parts are redacted again and only the new entries are scanned, so
+    the cost per turn is O(new content) instead of O(history). If the
+    fingerprint no longer matches (the history was rewritten), the whole
+    history is scanned again.
+
+    The marker holds no text, so writing it to session state on every turn
+    stays cheap however long the conversation gets.
+
+    User turns are scanned, which includes tool outputs (function responses).
+    """
+
+    def __init__(self, redactor: PiiRedactor) -> None:
+        self.redactor = redactor
+
+    def sanitize(
+        self, contents: List[types.Content], marker: Optional[Dict[str, Any]]
+    ) -> Tuple[Dict[str, Any], Dict[str, int]]:
+        """Redacts `contents` in place. Returns (new marker, counts for new turns)."""
+        marker = marker or {}
+        scanned = marker.get("count", 0)
+        pii_parts: List[List[int]] = marker.get("pii_parts", [])
+        if scanned > len(contents) or (
+            scanned
+            and content_fingerprint(contents[scanned - 1]) != marker.get("fingerprint")
+        ):
+            scanned, pii_parts = 0, []
+
+        # Fingerprint before redacting: the next request carries the raw content again.
+        tail_fingerprint = content_fingerprint(contents[-1]) if contents else None
+
+        for index, part_index in pii_parts:
+            part = contents[index].parts[part_index]
+            _set_payload(part, self._redact_part(part)[0])
+
+        counts: Dict[str, int] = {}
+        new_pii_parts = list(pii_parts)
+        for index in range(scanned, len(contents)):
+            content = contents[index]
+            if content.role != "user" or not content.parts:
+                continue
+            for part_index, part in enumerate(content.parts):
+                value, part_counts = self._redact_part(part)
+                if not part_counts:
+                    continue
+                _set_payload(part, value)
+                new_pii_parts.append([index, part_index])
+                for pii_type, count in part_counts.items():
+                    counts[pii_type] = counts.get(pii_type, 0) + count
+
+        new_marker = {
+            "count": len(contents),
+            "fingerprint": tail_fingerprint,
+            "pii_parts": new_pii_parts,
+        }
+        return new_marker, counts
+
+    def _redact_part(self, part: types.Part) -> Tuple[Any, Dict[str, int]]:
+        if part.text:
+            return self.redactor.redact(part.text)
+        if part.function_response and part.function_response.response:
+            counts: Dict[str, int] = {}
+            return self._redact_value(part.function_response.response, counts), counts
+        return None, {}
+
+    def _redact_value(self, value: Any, counts: Dict[str, int]) -> Any:
+        if isinstance(value, str):
+            redacted, value_counts = self.redactor.redact(value)
+            for pii_type, count in value_counts.items():
+                counts[pii_type] = counts.get(pii_type, 0) + count
+            return redacted
+        if isinstance(value, dict):
+            return {key: self._redact_value(item, counts) for key, item in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [self._redact_value(item, counts) for item in value]
+        return value
+
+
+def _set_payload(part: types.Part, value: Any) -> None:
+    if isinstance(value, str):
+        part.text = value
+    else:
+        part.function_response.response = value
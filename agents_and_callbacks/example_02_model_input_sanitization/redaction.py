@@ -0,0 +1,46 @@
+# redaction.py in example_02_model_input_sanitization
+import re
+from typing import Dict, Optional, Pattern, Tuple
+
+
+class PiiRedactor:
+    """Redacts several PII patterns in a single pass over the text.
+
+    All patterns are combined into one alternation with a named group per PII
+    type, so each text is scanned once no matter how many patterns exist.
+    The name of the matching group tells us which PII type was redacted.
+
+    `first_char` is an optional character class that every match starts with
+    (e.g. `\\d`). It becomes a lookahead guard in front of the alternation, so
+    the engine skips other positions without trying each alternative.
+    """
+
+    def __init__(
+        self,
+        patterns: Dict[str, Pattern[str]],
+        placeholder: str,
+        first_char: Optional[str] = None,
+    ) -> None:
+        flags = {pattern.flags for pattern in patterns.values()}
+        if len(flags) > 1:
+            raise ValueError("All PII patterns must be compiled with the same flags.")
+        self.placeholder = placeholder
+        alternation = "|".join(
+            f"(?P<{pii_type}>{pattern.pattern})"
+            for pii_type, pattern in patterns.items()
+        )
+        if first_char:
+            alternation = f"(?={first_char})(?:{alternation})"
+        self.pattern = re.compile(alternation, flags.pop() if flags else 0)
+
+    def redact(self, text: str) -> Tuple[str, Dict[str, int]]:
+        """Returns the redacted text and the number of redactions per PII type."""
+        counts: Dict[str, int] = {}
+        placeholder = self.placeholder
+
+        def _replace(match: "re.Match[str]") -> str:
+            pii_type = match.lastgroup
+            counts[pii_type] = counts.get(pii_type, 0) + 1
+            return placeholder
+
+        return self.pattern.sub(_replace, text), counts
@@ -1,72 +1,92 @@
-import copy  # For deepcopy
-import re
-from typing import Any, Dict, Optional
+from typing import Optional
 
 from google.adk.agents import Agent as LlmAgent
 from google.adk.agents.callback_context import CallbackContext
 from google.adk.models import LlmResponse
 from google.genai import types
 
+from .enhancements import QUICK_LINKS, ResponseEnhancer
+from .streaming import StreamingEnhancer
+
+RESPONSE_ENHANCER = ResponseEnhancer(QUICK_LINKS)
+# Used when the agent runs with streaming (e.g. RunConfig(streaming_mode=StreamingMode.SSE)).
+STREAMING_ENHANCER = StreamingEnhancer(RESPONSE_ENHANCER)
+
+
+def _answer_part_index(llm_response: LlmResponse) -> int:
+    """Returns the index of the first non-thought text part, or -1."""
+    for index, part in enumerate(llm_response.content.parts):
+        if part.text and not part.thought:
+            return index
+    return -1
+
+
+def _with_part_text(llm_response: LlmResponse, index: int, text: str) -> LlmResponse:
+    """Copy-on-write: shallow-copies only the objects on the path to parts[index].text."""
+    parts = list(llm_response.content.parts)
+    parts[index] = parts[index].model_copy(update={"text": text})
+    content = llm_response.content.model_copy(update={"parts": parts})
+    return llm_response.model_copy(update={"content": content})
+
 
 def after_model_callback_enhance(
     callback_context: CallbackContext, llm_response: LlmResponse
 ) -> Optional[LlmResponse]:
     if not llm_response.content or not llm_response.content.parts:
         print("\n[AFTER MODEL] LLM response is empty or malformed. No modifications.")
-        return llm_response
-
-    # Deepcopy to avoid modifying the original response object directly if it's immutable
-    # or if other callbacks might need the original.
-    modified_llm_response = copy.deepcopy(llm_response)
-
-    # Assuming the main text is in the first part
-    original_text = modified_llm_response.content.parts[0].text
-    current_text = original_text  # Start with original for modification
-
-    print(f"\n[AFTER MODEL] Original LLM response: '{original_text}'")
-
-    # 1. Attempt to extract mock flight details
-    # Example: "Okay, I've booked flight BA245 from London to Paris on 2025-12-25 for you."
-    flight_match = re.search(
-        r"flight\s+(?P<flight_number>[A-Z0-9]{2,6})\s+from\s+(?P<origin>[\w\s]+?)\s+to\s+(?P<destination>[\w\s]+?)\s+on\s+(?P<date>\d{4}-\d{2}-\d{2})",
-        original_text,
-        re.IGNORECASE,
-    )
-    if flight_match:
-        flight_details = flight_match.groupdict()  # Gets a dict with named groups
-        flight_details["origin"] = flight_details["origin"].strip()
-        flight_details["destination"] = flight_details["destination"].strip()
+        return None
+
+    stream_id = callback_context.invocation_id
+    if llm_response.partial:
+        # Scan the chunk incrementally but pass it through untouched, so
+        # streaming output (and time-to-first-token) is never delayed.
+        chunk_text = "".join(
+            part.text
+            for part in llm_response.content.parts
+            if part.text and not part.thought
+        )
+        if chunk_text:
+            STREAMING_ENHANCER.feed(stream_id, chunk_text)
+        return None
 
+    # A non-partial response ends any stream for this invocation.
+    stream_scan = STREAMING_ENHANCER.finish(stream_id)
+
+    # The main text is the first part that isn't a model "thought".
+    part_index = _answer_part_index(llm_response)
+    if part_index == -1:
+        print("\n[AFTER MODEL] Response has no answer text. No modifications.")
+        return None
+    original_text = llm_response.content.parts[part_index].text
+
+    if stream_scan is not None:
+        # Final aggregated response of a stream: everything was already scanned.
+        print(
+            f"\n[AFTER MODEL] Stream finished after {stream_scan.chunks} chunks "
+            f"({len(original_text)} chars)."
+        )
+        flight_details = stream_scan.flight_details
+        suffix = STREAMING_ENHANCER.build_suffix(original_text, stream_scan)
+        enhanced_text = original_text + suffix if suffix else None
+    else:
+        print(f"\n[AFTER MODEL] Original LLM response: '{original_text}'")
+        # Scan with precompiled patterns first; the response is only copied if
+        # an enhancement actually applies.
+        enhanced_text, flight_details = RESPONSE_ENHANCER.enhance(original_text)
+
+    if flight_details:
         callback_context.state["extracted_flight_info"] = flight_details
         # For ADK web, artifacts are usually added differently, often by the tool itself or agent logic.
         # Storing in state is a simple way to demonstrate data extraction.
-        # To show it in UI, you might need to modify the response text or use ADK's specific artifact features.
         print(f"[AFTER MODEL] Extracted flight info: {flight_details}")
-        current_text += f"\n\n**Flight Summary Logged:**\nNumber: {flight_details['flight_number']}\nFrom: {flight_details['origin']}\nTo: {flight_details['destination']}\nDate: {flight_details['date']}"
 
-    # 2. Add quick links for common topics
-    if "refund policy" in original_text.lower():
-        refund_link = (
-            "\nFor more details, see our [Refund Policy](https://example.com/refunds)."
-        )
-        if refund_link not in current_text:  # Avoid adding duplicate links
-            current_text += refund_link
-            print("[AFTER MODEL] Added refund policy link.")
-
-    if "baggage allowance" in original_text.lower():
-        baggage_link = "\nCheck our [Baggage Allowance](https://example.com/baggage)."
-        if baggage_link not in current_text:
-            current_text += baggage_link
-            print("[AFTER MODEL] Added baggage allowance link.")
-
-    if current_text != original_text:
-        modified_llm_response.content.parts[0].text = current_text
-        print(f"[AFTER MODEL] Enhanced response being sent to user: '{current_text}'")
-    else:
-        print("[AFTER MODEL] No enhancements made to the LLM response text.")
+    if enhanced_text is None:
+        print("[AFTER MODEL] No enhancements made to the LLM response text.\n")
+        # Returning None keeps the original response without copying it.
+        return None
 
-    print("\n")
-    return modified_llm_response
+    print(f"[AFTER MODEL] Enhanced response being sent to user: '{enhanced_text}'\n")
+    return _with_part_text(llm_response, part_index, enhanced_text)
 
 
 travel_response_enhancer_agent = LlmAgent(
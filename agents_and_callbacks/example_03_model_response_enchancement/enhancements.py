@@ -0,0 +1,88 @@
+# enhancements.py in example_03_model_response_enchancement
+import re
+from typing import Dict, Iterable, List, Optional, Pattern, Tuple
+
+# Example: "Okay, I've booked flight BA245 from London to Paris on 2025-12-25 for you."
+FLIGHT_PATTERN = re.compile(
+    r"flight\s+(?P<flight_number>[A-Z0-9]{2,6})\s+from\s+(?P<origin>[\w\s]+?)\s+to\s+(?P<destination>[\w\s]+?)\s+on\s+(?P<date>\d{4}-\d{2}-\d{2})",
+    re.IGNORECASE,
+)
+
+# Keyword (matched case-insensitively) -> text appended to the response.
+QUICK_LINKS: Dict[str, str] = {
+    "refund policy": "\nFor more details, see our [Refund Policy](https://example.com/refunds).",
+    "baggage allowance": "\nCheck our [Baggage Allowance](https://example.com/baggage).",
+}
+
+
+def format_flight_summary(flight_details: Dict[str, str]) -> str:
+    return (
+        f"\n\n**Flight Summary Logged:**\nNumber: {flight_details['flight_number']}"
+        f"\nFrom: {flight_details['origin']}\nTo: {flight_details['destination']}"
+        f"\nDate: {flight_details['date']}"
+    )
+
+
+class ResponseEnhancer:
+    """Detects flight confirmations and quick-link keywords in response text.
+
+    All keywords from the link table are compiled into one case-insensitive
+    alternation, so a response is scanned once for every keyword instead of
+    being lower-cased and searched once per keyword. Callers only need to
+    build a new response when `enhance` reports a change.
+    """
+
+    def __init__(
+        self,
+        quick_links: Dict[str, str],
+        flight_pattern: Pattern[str] = FLIGHT_PATTERN,
+    ) -> None:
+        self.flight_pattern = flight_pattern
+        # Keys are lower-cased so matches can be looked up without re-scanning.
+        self.quick_links = {keyword.lower(): link for keyword, link in quick_links.items()}
+        # Longest keywords first so overlapping keywords prefer the longer one.
+        self.keyword_pattern = re.compile(
+            "|".join(
+                re.escape(keyword)
+                for keyword in sorted(self.quick_links, key=len, reverse=True)
+            ),
+            re.IGNORECASE,
+        )
+
+    def extract_flight(self, text: str) -> Optional[Dict[str, str]]:
+        flight_match = self.flight_pattern.search(text)
+        if not flight_match:
+            return None
+        flight_details = flight_match.groupdict()
+        flight_details["origin"] = flight_details["origin"].strip()
+        flight_details["destination"] = flight_details["destination"].strip()
+        return flight_details
+
+    def find_keywords(self, text: str) -> List[str]:
+        """Returns the distinct keywords found in `text`, in link table order."""
+        found = set()
+        for keyword_match in self.keyword_pattern.finditer(text):
+            found.add(keyword_match.group().lower())
+            if len(found) == len(self.quick_links):
+                break
+        return [keyword for keyword in self.quick_links if keyword in found]
+
+    def build_suffix(
+        self,
+        text: str,
+        flight_details: Optional[Dict[str, str]],
+        keywords: Iterable[str],
+    ) -> str:
+        """Returns the text to append to `text`, or "" if nothing applies."""
+        suffix = format_flight_summary(flight_details) if flight_details else ""
+        for keyword in keywords:
+            link = self.quick_links[keyword]
+            if link not in text and link not in suffix:  # Avoid duplicate links
+                suffix += link
+        return suffix
+
+    def enhance(self, text: str) -> Tuple[Optional[str], Optional[Dict[str, str]]]:
+        """Returns (enhanced text or None if unchanged, extracted flight details)."""
+        flight_details = self.extract_flight(text)
+        suffix = self.build_suffix(text, flight_details, self.find_keywords(text))
+        return (text + suffix if suffix else None), flight_details
@@ -0,0 +1,67 @@
+# streaming.py in example_03_model_response_enchancement
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Set
+
+from .enhancements import ResponseEnhancer
+
+
+@dataclass
+class StreamScan:
+    """What has been detected so far in one streamed model response."""
+
+    tail: str = ""
+    flight_details: Optional[Dict[str, str]] = None
+    keywords: Set[str] = field(default_factory=set)
+    chunks: int = 0
+
+
+class StreamingEnhancer:
+    """Runs flight extraction and keyword detection as partial chunks arrive.
+
+    Each chunk is scanned together with a bounded tail of the previous text,
+    so matches that span chunk boundaries are still found while memory per
+    stream stays at `tail_chars`. Chunks are never held back; the summary and
+    links are attached once the final (aggregated) response arrives.
+
+    A flight confirmation longer than `tail_chars` that spans a chunk boundary
+    is not detected, so keep the tail comfortably above a typical sentence.
+    """
+
+    def __init__(
+        self,
+        enhancer: ResponseEnhancer,
+        tail_chars: int = 512,
+        max_streams: int = 1024,
+    ) -> None:
+        self.enhancer = enhancer
+        longest_keyword = max(map(len, enhancer.quick_links), default=0)
+        self.tail_chars = max(tail_chars, longest_keyword)
+        self.max_streams = max_streams
+        self._streams: "OrderedDict[str, StreamScan]" = OrderedDict()
+
+    def feed(self, stream_id: str, text: str) -> StreamScan:
+        scan = self._streams.get(stream_id)
+        if scan is None:
+            scan = self._streams[stream_id] = StreamScan()
+            # Streams that never finish (e.g. cancelled runs) are evicted oldest first.
+            while len(self._streams) > self.max_streams:
+                self._streams.popitem(last=False)
+
+        window = scan.tail + text
+        if scan.flight_details is None:
+            scan.flight_details = self.enhancer.extract_flight(window)
+        if len(scan.keywords) < len(self.enhancer.quick_links):
+            scan.keywords.update(self.enhancer.find_keywords(window))
+        scan.tail = window[-self.tail_chars :]
+        scan.chunks += 1
+        return scan
+
+    def finish(self, stream_id: str) -> Optional[StreamScan]:
+        """Ends a stream and returns its scan, or None if no chunks were seen."""
+        return self._streams.pop(stream_id, None)
+
+    def build_suffix(self, final_text: str, scan: StreamScan) -> str:
+        # Keep link table order, like the non-streaming path.
+        keywords = [k for k in self.enhancer.quick_links if k in scan.keywords]
+        return self.enhancer.build_suffix(final_text, scan.flight_details, keywords)
@@ -1,14 +1,17 @@
 # agent.py in example_05_tool_response_transformation_caching
 
 import copy
-from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Hashable, Optional
 
 from google.adk.agents import Agent as LlmAgent
-from google.adk.tools import BaseTool
+from google.adk.tools import BaseTool, FunctionTool
 from google.adk.tools.tool_context import ToolContext
 from google.genai import types
 
+from .cache import ToolResultCache
+from .cache_keys import CacheKeyBuilder
+from .single_flight import SingleFlight
+
 MOCK_RATES = {
     ("USD", "EUR"): 0.92,
     ("EUR", "USD"): 1.08,
@@ -18,6 +21,30 @@ MOCK_RATES = {
     ("JPY", "USD"): 0.0066,
 }
 CACHE_EXPIRY_SECONDS = 10
+CACHE_MAX_ENTRIES = 1024
+# Any function tool listed here is cached; keys are derived from its signature.
+CACHEABLE_TOOLS = {"convert_currency_tool"}
+# When True, cached results are only shared within the session that produced them.
+CACHE_PER_SESSION = False
+# How long a concurrent caller waits for an identical in-flight tool call.
+SINGLE_FLIGHT_TIMEOUT_SECONDS = 30
+# Where the before callback leaves a call's key for the tool and the after callback.
+# "temp:" state only lives for the current invocation and is never persisted.
+CALL_KEY_STATE = "temp:tool_cache_key"
+
+# Shared by every session in this process; kept out of tool_context.state.
+TOOL_RESULT_CACHE = ToolResultCache(
+    max_entries=CACHE_MAX_ENTRIES, ttl_seconds=CACHE_EXPIRY_SECONDS
+)
+# Amounts are keyed to the cent, matching how results are presented to the user;
+# currency codes are case-insensitive ("usd" and "USD" share an entry).
+CACHE_KEYS = CacheKeyBuilder(
+    float_digits=2, case_insensitive={"from_currency", "to_currency"}
+)
+# Identical calls that miss the cache at the same time share one execution.
+IN_FLIGHT_TOOL_CALLS = SingleFlight(
+    wait_timeout_seconds=SINGLE_FLIGHT_TIMEOUT_SECONDS
+)
 
 
 def convert_currency_tool(
@@ -50,31 +77,78 @@ def convert_currency_tool(
         }
 
 
-def _generate_cache_key(tool_name: str, args: Dict[str, Any]) -> str:
-    """Helper function to generate a consistent cache key."""
-    try:
-        amount_val = args.get("amount")
-        if amount_val is None:
-            amount_str = "0.00"
-        elif isinstance(amount_val, (int, float)):
-            amount_str = f"{float(amount_val):.2f}"
-        else:
-            try:
-                amount_str = f"{float(str(amount_val)):.2f}"
-            except ValueError:
-                amount_str = (
-                    str(amount_val).lower().strip()
-                    if str(amount_val).strip()
-                    else "invalid_amount_str"
-                )
-    except Exception:
-        amount_str = "amount_key_gen_error"
+def format_conversion(
+    tool_response: Dict[str, Any], result: Dict[str, Any], is_error: bool
+) -> Dict[str, Any]:
+    """Adds a one-line summary of a conversion (or its error) for the LLM."""
+    modified_tool_output: Dict[str, Any] = {"raw_details": copy.deepcopy(tool_response)}
+    if not is_error and "converted_amount" in result:
+        modified_tool_output["result_summary"] = (
+            f"{result['original_amount']:.2f} {result['from_currency']} is "
+            f"approximately {result['converted_amount']:.2f} {result['to_currency']} "
+            f"(Rate: {result.get('rate_used', 'N/A')})."
+        )
+    elif is_error:
+        modified_tool_output["result_summary"] = (
+            f"I encountered an issue during conversion: {result['error']}"
+        )
+    return modified_tool_output
+
 
-    from_c_str = str(args.get("from_currency", "")).upper().strip()
-    to_c_str = str(args.get("to_currency", "")).upper().strip()
+# Per-tool hooks that turn a (possibly cached) result into what the LLM sees:
+# (tool_response, unwrapped result, is_error) -> modified output. Tools without
+# one get their response back unchanged.
+RESPONSE_FORMATTERS: Dict[
+    str, Callable[[Dict[str, Any], Dict[str, Any], bool], Dict[str, Any]]
+] = {"convert_currency_tool": format_conversion}
 
-    key = f"{tool_name}_{amount_str}_{from_c_str}_{to_c_str}"
-    return key
+
+def _generate_cache_key(tool: BaseTool, args: Dict[str, Any]) -> Hashable:
+    """Helper function to generate a consistent cache key for any function tool."""
+    return CACHE_KEYS.build(tool.name, getattr(tool, "func", None), args)
+
+
+def _session_id(tool_context: ToolContext) -> str:
+    # ToolContext does not expose the session, so this reads the private
+    # _invocation_context; check it when upgrading from the pinned google-adk 1.5.0.
+    return tool_context._invocation_context.session.id
+
+
+def _cache_namespace(tool_context: ToolContext) -> Optional[Hashable]:
+    """Returns the session ID when per-session caching is enabled."""
+    if not CACHE_PER_SESSION:
+        return None
+    return _session_id(tool_context)
+
+
+def _call_key(
+    tool: BaseTool, args: Dict[str, Any], tool_context: ToolContext
+) -> Hashable:
+    """Returns the (namespace, cache key) pair the before callback built for this call."""
+    call_key = tool_context.state.get(CALL_KEY_STATE)
+    if call_key is None:
+        call_key = (_cache_namespace(tool_context), _generate_cache_key(tool, args))
+    return call_key
+
+
+class SingleFlightTool(FunctionTool):
+    """A FunctionTool that ends its in-flight call when the function raises.
+
+    ADK skips the after-tool callback when a tool raises or is cancelled, so
+    without this the callers waiting on the leader would only give up after
+    the wait timeout.
+    """
+
+    async def run_async(self, *, args: Dict[str, Any], tool_context: ToolContext) -> Any:
+        try:
+            return await super().run_async(args=args, tool_context=tool_context)
+        except Exception as e:
+            IN_FLIGHT_TOOL_CALLS.fail(_call_key(self, args, tool_context), e)
+            raise
+        except BaseException:
+            # Cancelled: there is no error to share, so the waiters run the tool.
+            IN_FLIGHT_TOOL_CALLS.release(_call_key(self, args, tool_context))
+            raise
 
 
 async def before_tool_callback_cache(
@@ -82,62 +156,33 @@ async def before_tool_callback_cache(
 ) -> Optional[Dict[str, Any]]:
     tool_name = tool.name
 
-    if tool_name == "convert_currency_tool":
-        cache_key = _generate_cache_key(tool_name, args)
-
-        # Read current cache state from tool_context.state
-        # .get("app_cache", {}) ensures it defaults to an empty dict if not present
-        current_app_cache = tool_context.state.get("app_cache", {})
-        cached_entry = current_app_cache.get(cache_key)
+    if tool_name in CACHEABLE_TOOLS:
+        cache_key = _generate_cache_key(tool, args)
+        namespace = _cache_namespace(tool_context)
+        flight_key = (namespace, cache_key)
+        tool_context.state[CALL_KEY_STATE] = flight_key
+        cached_result_data = TOOL_RESULT_CACHE.get(cache_key, namespace=namespace)
 
-        modified_app_cache = None  # To track if current_app_cache needs to be updated
-
-        if cached_entry:
-            timestamp_str, cached_result_data = cached_entry
-            try:
-                cached_timestamp = datetime.fromisoformat(timestamp_str)
-                current_time = datetime.now(timezone.utc)
-                age_seconds = (current_time - cached_timestamp).total_seconds()
+        if cached_result_data is not None:
+            print(
+                f"[CACHE DEBUG] Using FRESH CACHED result for {cache_key}: {cached_result_data}"
+            )
+            return {"cached_result": copy.deepcopy(cached_result_data)}
 
-                print(
-                    f"[CACHE DEBUG] Found entry for {cache_key}. Age: {age_seconds:.2f}s. Expiry: {CACHE_EXPIRY_SECONDS}s."
-                )
+        # Expired entries are dropped by the cache itself on lookup.
+        print(f"[CACHE DEBUG] Cache MISS for key: {cache_key}.")
 
-                if age_seconds < CACHE_EXPIRY_SECONDS:
-                    print(
-                        f"[CACHE DEBUG] Using FRESH CACHED result for {cache_key}: {cached_result_data}"
-                    )
-                    # Return cached result. ADK handles state persistence if modified_app_cache was set.
-                    return {"cached_result": copy.deepcopy(cached_result_data)}
-                else:  # Cache expired
-                    print(f"[CACHE DEBUG] Cache EXPIRED for {cache_key}.")
-                    # Prepare to delete the expired entry from our copy of the cache
-                    modified_app_cache = current_app_cache.copy()
-                    if cache_key in modified_app_cache:
-                        del modified_app_cache[cache_key]
-                        print(
-                            f"[CACHE DEBUG] Prepared deletion of expired entry for {cache_key}."
-                        )
-            except ValueError:
+        is_leader, flight = IN_FLIGHT_TOOL_CALLS.acquire(flight_key)
+        if not is_leader:
+            print(f"[CACHE DEBUG] Waiting on in-flight call for {cache_key}.")
+            shared_result = await IN_FLIGHT_TOOL_CALLS.wait(flight_key, flight)
+            if shared_result is not None:
                 print(
-                    f"[CACHE DEBUG] Invalid timestamp format in cache for {cache_key}. Treating as miss."
+                    f"[CACHE DEBUG] Using SHARED in-flight result for {cache_key}: {shared_result}"
                 )
-                # Optionally prepare to delete the malformed entry
-                modified_app_cache = current_app_cache.copy()
-                if cache_key in modified_app_cache:
-                    del modified_app_cache[cache_key]
-                    print(
-                        f"[CACHE DEBUG] Prepared deletion of malformed entry for {cache_key}."
-                    )
-        else:
-            print(f"[CACHE DEBUG] Cache MISS for key: {cache_key}.")
-
-        # If the app_cache was modified (e.g., an expired entry was deleted),
-        # update tool_context.state. ADK framework will persist this.
-        if modified_app_cache is not None and modified_app_cache != current_app_cache:
-            tool_context.state["app_cache"] = modified_app_cache
+                return {"cached_result": copy.deepcopy(shared_result)}
             print(
-                f"[BEFORE TOOL] Updated tool_context.state['app_cache'] to: {modified_app_cache}"
+                f"[CACHE DEBUG] In-flight call for {cache_key} did not report back. Running tool."
             )
 
     # If not returned cached_result, proceed with actual tool call.
@@ -156,55 +201,44 @@ async def after_tool_callback_format_and_cache(
         f"\n[AFTER TOOL] Original tool response for '{tool_name}' with args {args}: {tool_response}"
     )
 
-    modified_tool_output: Dict[str, Any] = {}
-
-    if tool_name == "convert_currency_tool":
-        modified_tool_output["raw_details"] = copy.deepcopy(tool_response)
-
-        if "converted_amount" in tool_response and "error" not in tool_response:
-            cache_key = _generate_cache_key(tool_name, args)
-
-            # Read current cache state from tool_context.state and prepare to update it
-            current_app_cache = tool_context.state.get("app_cache", {})
-            new_app_cache_to_set = current_app_cache.copy()  # Make a mutable copy
-
-            new_app_cache_to_set[cache_key] = (
-                datetime.now(timezone.utc).isoformat(),
-                copy.deepcopy(tool_response),  # Cache the original tool_response
+    # ADK runs this callback for short-circuited calls too. A cache hit (or a
+    # shared in-flight result) comes back wrapped in "cached_result" and must
+    # not be cached or published again.
+    is_cache_hit = (
+        tool_name in CACHEABLE_TOOLS
+        and isinstance(tool_response, dict)
+        and "cached_result" in tool_response
+    )
+    result = tool_response["cached_result"] if is_cache_hit else tool_response
+    is_error = isinstance(result, dict) and "error" in result
+
+    if tool_name in CACHEABLE_TOOLS and not is_cache_hit:
+        namespace, cache_key = _call_key(tool, args, tool_context)
+        if not is_error:
+            # Cache the original tool_response in the process-wide store.
+            TOOL_RESULT_CACHE.set(
+                cache_key, copy.deepcopy(tool_response), namespace=namespace
             )
-
-            # Update tool_context.state with the new cache. ADK framework will persist this.
-            tool_context.state["app_cache"] = new_app_cache_to_set
             print(
-                f"[AFTER TOOL] Updated tool_context.state['app_cache'] to: {new_app_cache_to_set}"
+                f"[AFTER TOOL] Cached result for {cache_key}. Cache stats: {TOOL_RESULT_CACHE.stats()}"
             )
-
-            formatted_result_string = (
-                f"{tool_response['original_amount']:.2f} {tool_response['from_currency']} is "
-                f"approximately {tool_response['converted_amount']:.2f} {tool_response['to_currency']} "
-                f"(Rate: {tool_response.get('rate_used', 'N/A')})."
-            )
-            modified_tool_output["result_summary"] = formatted_result_string
-
-        elif "error" in tool_response:
-            modified_tool_output["result_summary"] = (
-                f"I encountered an issue during conversion: {tool_response['error']}"
-            )
-            # No caching if there's an error from the tool
-
-        print(f"[AFTER TOOL] Formatted result/error for LLM: {modified_tool_output}")
-
-    # return original tool_response to be safe. Otherwise, return the modified version.
-    if not modified_tool_output:
-        return tool_response
-
+        # No caching if there's an error from the tool, but callers waiting on
+        # this execution still get the result (or error).
+        IN_FLIGHT_TOOL_CALLS.resolve((namespace, cache_key), tool_response)
+
+    format_response = RESPONSE_FORMATTERS.get(tool_name)
+    if format_response is None:
+        # Unwrapped, so a cached result looks the same to the LLM as a fresh one.
+        return result
+    modified_tool_output = format_response(tool_response, result, is_error)
+    print(f"[AFTER TOOL] Formatted result/error for LLM: {modified_tool_output}")
     return modified_tool_output
 
 
 currency_converter_agent = LlmAgent(
     name="currency_converter_agent",
-    description="Converts currencies using mock rates, demonstrates caching and response formatting by modifying tool_context.state.",
-    tools=[convert_currency_tool],
+    description="Converts currencies using mock rates, demonstrates caching and response formatting with a process-wide tool result cache.",
+    tools=[SingleFlightTool(convert_currency_tool)],
     model="gemini-2.0-flash",  # Ensure this model is appropriate / available
     instruction="You are a currency converter. When asked to convert currency, use the convert_currency_tool. Based on the tool's output (look for 'result_summary' or 'error_message' in the tool's returned dictionary), provide a clear and concise answer to the user.",
     before_tool_callback=before_tool_callback_cache,
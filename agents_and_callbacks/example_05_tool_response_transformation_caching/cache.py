@@ -0,0 +1,94 @@
+# cache.py in example_05_tool_response_transformation_caching
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class ToolResultCache:
+    """A bounded LRU cache with per-entry TTL for tool results.
+
+    Entries live in a process-wide store instead of `tool_context.state`, so
+    lookups and inserts are O(1) and the session state payload stays constant
+    no matter how many results are cached. Pass a `namespace` (e.g. the session
+    ID) to keep entries private to one session.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_entries <= 0:
+            raise ValueError("max_entries must be a positive integer.")
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        # key -> (expires_at, value); insertion order doubles as LRU order.
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _full_key(key: Hashable, namespace: Optional[Hashable]) -> Hashable:
+        return key if namespace is None else (namespace, key)
+
+    def get(self, key: Hashable, namespace: Optional[Hashable] = None) -> Optional[Any]:
+        """Returns the cached value, or None if it is missing or expired."""
+        full_key = self._full_key(key, namespace)
+        with self._lock:
+            entry = self._entries.get(full_key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if self._clock() >= expires_at:
+                del self._entries[full_key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(full_key)
+            self.hits += 1
+            return value
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        namespace: Optional[Hashable] = None,
+        ttl_seconds: Optional[float] = None,
+    ) -> None:
+        """Stores a value, evicting the least recently used entry when full."""
+        full_key = self._full_key(key, namespace)
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        with self._lock:
+            self._entries[full_key] = (self._clock() + ttl, value)
+            self._entries.move_to_end(full_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: Hashable, namespace: Optional[Hashable] = None) -> None:
+        with self._lock:
+            self._entries.pop(self._full_key(key, namespace), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "expirations": self.expirations,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,168 @@
+# cache_keys.py in example_05_tool_response_transformation_caching
+import hashlib
+import inspect
+import typing
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+Normalizer = Callable[[Any], Hashable]
+KeyMaker = Callable[[str, Dict[str, Any]], Tuple[Hashable, ...]]
+
+
+class CacheKeyBuilder:
+    """Builds canonical cache keys for any function tool.
+
+    Each tool's signature is read once and turned into a key function with
+    one normalizer per declared parameter, chosen from its type hint. Keys are
+    compact tuples such as `("convert_currency_tool", 10000, "usd", "eur")`,
+    or a fixed-size 16-byte digest when `digest=True`.
+
+    Floats are quantized to `float_digits` decimal places and stored as ints
+    (100.0 -> 10000 for two digits). Strings are used as they are, except for
+    the parameters named in `case_insensitive` (codes, identifiers), which are
+    stripped and case-folded; free text keeps its own entry per spelling.
+    """
+
+    def __init__(self, float_digits: int = 6, case_insensitive: Iterable[str] = ()) -> None:
+        self.float_scale = 10**float_digits
+        self.case_insensitive = frozenset(case_insensitive)
+        self._key_makers: Dict[Callable[..., Any], KeyMaker] = {}
+        # Plain functions rather than methods: they run once per parameter per key.
+        scale = self.float_scale
+        normalize = self.normalize
+
+        def normalize_float(value: Any) -> Hashable:
+            try:
+                return round(float(value) * scale)
+            except (TypeError, ValueError, OverflowError):
+                # NaN/inf floats cannot be quantized; key them as-is.
+                return value if isinstance(value, float) else normalize(value)
+
+        def fold_str(value: Any) -> Hashable:
+            try:
+                return value.strip().casefold()
+            except AttributeError:
+                return normalize(value)
+
+        self._normalize_float = normalize_float
+        self._fold_str = fold_str
+
+    def build(
+        self,
+        tool_name: str,
+        func: Optional[Callable[..., Any]],
+        args: Dict[str, Any],
+        digest: bool = False,
+    ) -> Hashable:
+        """Returns the cache key for calling `func` (named `tool_name`) with `args`."""
+        if func is None:
+            key = (tool_name, *self._normalize_items(args, ()))
+        else:
+            make_key = self._key_makers.get(func)
+            if make_key is None:
+                make_key = self._key_makers[func] = self._compile(func)
+            key = make_key(tool_name, args)
+        if digest:
+            return hashlib.blake2b(repr(key).encode(), digest_size=16).digest()
+        return key
+
+    def _compile(self, func: Callable[..., Any]) -> KeyMaker:
+        """Reads the tool's signature once and returns its key function."""
+        try:
+            hints = typing.get_type_hints(func)
+        except Exception:
+            hints = {}
+        params: List[Tuple[str, Any, Normalizer]] = []
+        for name, param in inspect.signature(func).parameters.items():
+            # ADK injects tool_context itself; it never belongs in a cache key.
+            if name == "tool_context" or param.kind in (
+                param.VAR_POSITIONAL,
+                param.VAR_KEYWORD,
+            ):
+                continue
+            default = None if param.default is param.empty else param.default
+            fold = name in self.case_insensitive
+            params.append((name, default, self._normalizer_for(hints.get(name), fold)))
+        declared = frozenset(name for name, _, _ in params)
+        # A straight-line function per tool (generated, as dataclasses does for
+        # __init__): no loop or per-parameter indirection when a key is built.
+        namespace: Dict[str, Any] = {
+            "declared": declared,
+            "declares_all": declared.issuperset,
+            "normalize_items": self._normalize_items,
+        }
+        items = []
+        for index, (name, default, normalizer) in enumerate(params):
+            namespace[f"normalize_{index}"] = normalizer
+            namespace[f"default_{index}"] = default
+            lookup = f"get({name!r}, default_{index})"
+            if normalizer is self._fold_str:
+                # Strings are folded inline; anything else goes through the normalizer.
+                items.append(
+                    f"value.strip().casefold() if type(value := {lookup}) is str "
+                    f"else normalize_{index}(value), "
+                )
+            else:
+                items.append(f"normalize_{index}({lookup}), ")
+        source = (
+            "def make_key(tool_name, args):\n"
+            "    get = args.get\n"
+            f"    key = (tool_name, {''.join(items)})\n"
+            "    if declares_all(args):\n"
+            "        return key\n"
+            "    return key + normalize_items(args, declared)\n"
+        )
+        exec(source, namespace)
+        return namespace["make_key"]
+
+    def _normalizer_for(self, annotation: Any, fold: bool = False) -> Normalizer:
+        origin = typing.get_origin(annotation) or annotation
+        if origin is bool:
+            return self.normalize
+        if origin is int:
+            return self._normalize_int
+        if origin is float:
+            return self._normalize_float
+        if origin is str:
+            return self._fold_str if fold else self.normalize
+        if origin in (list, tuple, set, frozenset):
+            item_args = typing.get_args(annotation)
+            normalize_item = (
+                self._normalizer_for(item_args[0], fold) if item_args else self.normalize
+            )
+            if origin in (set, frozenset):
+                return lambda value: tuple(
+                    sorted([normalize_item(item) for item in value or ()], key=repr)
+                )
+            return lambda value: tuple([normalize_item(item) for item in value or ()])
+        return self._fold_str if fold else self.normalize
+
+    def _normalize_int(self, value: Any) -> Hashable:
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return self.normalize(value)
+
+    def normalize(self, value: Any) -> Hashable:
+        """Normalizes a value whose type is not declared in the signature."""
+        if value is None or isinstance(value, (bool, int, str)):
+            return value
+        if isinstance(value, float):
+            return self._normalize_float(value)
+        if isinstance(value, (list, tuple)):
+            return tuple([self.normalize(item) for item in value])
+        if isinstance(value, (set, frozenset)):
+            return tuple(sorted([self.normalize(item) for item in value], key=repr))
+        if isinstance(value, dict):
+            return self._normalize_items(value, ())
+        return repr(value)
+
+    def _normalize_items(
+        self, args: Dict[str, Any], skip: Any
+    ) -> Tuple[Hashable, ...]:
+        return tuple(
+            [
+                (name, self.normalize(args[name]))
+                for name in sorted(args)
+                if name not in skip
+            ]
+        )
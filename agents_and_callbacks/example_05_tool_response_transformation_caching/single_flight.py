@@ -0,0 +1,69 @@
+# single_flight.py in example_05_tool_response_transformation_caching
+import asyncio
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class SingleFlight:
+    """Coalesces concurrent tool calls that share a cache key.
+
+    The first caller for a key becomes the leader and runs the tool. Callers
+    arriving while the leader is still running wait on the leader's future and
+    reuse its result instead of running the tool again. If the leader fails
+    or is cancelled, the flight is dropped and the waiting callers run the
+    tool themselves.
+    """
+
+    def __init__(self, wait_timeout_seconds: float = 30.0) -> None:
+        self.wait_timeout_seconds = wait_timeout_seconds
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+
+    def acquire(self, key: Hashable) -> Tuple[bool, asyncio.Future]:
+        """Returns (is_leader, future) for the given key."""
+        future = self._in_flight.get(key)
+        if future is not None and not future.done():
+            return False, future
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        return True, future
+
+    async def wait(self, key: Hashable, future: asyncio.Future) -> Optional[Any]:
+        """Waits for the leader's result.
+
+        Returns None if the leader failed or never reported back within the
+        timeout; the flight is dropped so the caller can run the tool itself
+        and the next caller becomes a leader.
+        """
+        try:
+            return await asyncio.wait_for(
+                asyncio.shield(future), timeout=self.wait_timeout_seconds
+            )
+        except asyncio.TimeoutError:
+            pass
+        except Exception as e:
+            print(f"[SINGLE FLIGHT] In-flight call for {key} failed: {e}")
+        if self._in_flight.get(key) is future:
+            del self._in_flight[key]
+        return None
+
+    def resolve(self, key: Hashable, result: Any) -> None:
+        """Publishes the leader's result to every waiting caller."""
+        future = self._in_flight.pop(key, None)
+        if future is not None and not future.done():
+            future.set_result(result)
+
+    def release(self, key: Hashable) -> None:
+        """Drops the flight without a result; waiting callers run the tool themselves."""
+        future = self._in_flight.pop(key, None)
+        if future is not None and not future.done():
+            future.set_result(None)
+
+    def fail(self, key: Hashable, error: BaseException) -> None:
+        """Drops the flight and wakes every waiting caller with the leader's error."""
+        future = self._in_flight.pop(key, None)
+        if future is not None and not future.done():
+            future.set_exception(error)
+            # Mark the error as seen, so a flight nobody waited on logs nothing.
+            future.exception()
+
+    def __len__(self) -> int:
+        return len(self._in_flight)
@@ -0,0 +1,260 @@
+"""Offline benchmark for every root_agent in the repository.
+
+Each agent's models are replaced by benchmarks.fake_llm.FakeLlm, and the agent
+is driven through Runner + InMemorySessionService with one new session per run.
+For every concurrency level this reports throughput, end-to-end run latency,
+per-stage latency (model and tool spans, via agent_telemetry) and peak traced
+memory. Because model latency is fixed and scripted, changes in these numbers
+come from the framework and the repository's callbacks.
+
+Run from the repository root:
+    python -m benchmarks.bench_agents
+    python -m benchmarks.bench_agents --agents example_05 --concurrency 1,8,32
+    python -m benchmarks.bench_agents --json baseline.json
+"""
+
+import argparse
+import asyncio
+import contextlib
+import importlib
+import json
+import logging
+import os
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+from agent_telemetry import SpanRecorder, instrument, summarize_durations
+
+from .fake_llm import FakeLlm, use_fake_llm
+
+# multi_model reads its model names from the environment at import time.
+os.environ.setdefault("GOOGLE_GENAI_MODEL", "gemini-2.0-flash")
+os.environ.setdefault("OPENAI_MODEL", "openai/gpt-4o")
+os.environ.setdefault("CLAUDE_MODEL", "anthropic/claude-3-5-sonnet")
+os.environ.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "True")
+# example_01 would otherwise print its spans from a background thread mid-report.
+os.environ.setdefault("AGENT_TELEMETRY_CONSOLE", "0")
+
+# ParallelAgent finishes its branches in other tasks, which makes ADK's tracing
+# spans log "Failed to detach context" on every run; the spans are unaffected.
+logging.getLogger("opentelemetry.context").setLevel(logging.CRITICAL)
+
+
+@dataclass
+class Scenario:
+    module: str
+    message: str
+    tool_calls: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    text: Optional[str] = None
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    # get_randomuser_from_ramdomuserme needs the network, so only the clock tool is scripted.
+    "tools_agent": Scenario(
+        "tools_agent.agent",
+        "What time is it?",
+        tool_calls={"get_current_date_and_time": {}},
+    ),
+    "structured_output": Scenario(
+        "structured_output.agent", "I feel stressed about my finances."
+    ),
+    "marketing_campaign_agent": Scenario(
+        "marketing_campaign_agent.agent",
+        "Plan a campaign for a reusable water bottle aimed at students.",
+    ),
+    "multi_model": Scenario("multi_model.agent", "Remote work productivity"),
+    "example_01": Scenario(
+        "agents_and_callbacks.example_01_agent_lifecycle_logging.agent", "Hello there"
+    ),
+    "example_02": Scenario(
+        "agents_and_callbacks.example_02_model_input_sanitization.agent",
+        "My card is 4111-1111-1111-1111 and my phone is 555-123-4567.",
+    ),
+    "example_03": Scenario(
+        "agents_and_callbacks.example_03_model_response_enchancement.agent",
+        "Book me a flight to Paris.",
+        text="Okay, I've booked flight BA245 from London to Paris on 2025-12-25 for you. "
+        "Our refund policy and baggage allowance apply.",
+    ),
+    "example_04": Scenario(
+        "agents_and_callbacks.example_04_tool_arg_validation_modification.agent",
+        "Schedule a sync tomorrow afternoon with alice and bob.",
+        tool_calls={
+            "schedule_meeting_tool": {
+                "meeting_date": "2025-12-01",
+                "topic": "Sync",
+                "attendees": ["alice", "bob"],
+                "time": "afternoon",
+            }
+        },
+    ),
+    "example_05": Scenario(
+        "agents_and_callbacks.example_05_tool_response_transformation_caching.agent",
+        "Convert 100 USD to EUR.",
+        tool_calls={
+            "convert_currency_tool": {
+                "amount": 100,
+                "from_currency": "USD",
+                "to_currency": "EUR",
+            }
+        },
+    ),
+}
+
+
+async def _run_level(
+    root_agent, scenario: Scenario, runs: int, concurrency: int
+) -> List[int]:
+    """Runs `runs` single-turn sessions, `concurrency` at a time. Returns run latencies (ns)."""
+    session_service = InMemorySessionService()
+    runner = Runner(agent=root_agent, app_name="bench", session_service=session_service)
+    message = types.Content(role="user", parts=[types.Part(text=scenario.message)])
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[int] = []
+
+    async def one_run(index: int) -> None:
+        async with semaphore:
+            start_ns = time.perf_counter_ns()
+            session = await session_service.create_session(
+                app_name="bench", user_id=f"user_{index}"
+            )
+            async for _ in runner.run_async(
+                user_id=session.user_id, session_id=session.id, new_message=message
+            ):
+                pass
+            latencies.append(time.perf_counter_ns() - start_ns)
+
+    await asyncio.gather(*(one_run(index) for index in range(runs)))
+    return latencies
+
+
+def bench_scenario(
+    name: str,
+    scenario: Scenario,
+    concurrency_levels: List[int],
+    runs: int,
+    llm_kwargs: Dict[str, Any],
+    measure_memory: bool,
+) -> List[Dict[str, Any]]:
+    root_agent = importlib.import_module(scenario.module).root_agent
+    llm = FakeLlm(tool_calls=scenario.tool_calls, text=scenario.text, **llm_kwargs)
+    use_fake_llm(root_agent, llm)
+    recorder = SpanRecorder(capacity=max(4096, runs * 32))
+    instrument(root_agent, recorder)
+
+    results = []
+    for concurrency in concurrency_levels:
+        recorder.reset()
+        llm.calls = 0
+        start = time.perf_counter()
+        latencies = asyncio.run(_run_level(root_agent, scenario, runs, concurrency))
+        elapsed = time.perf_counter() - start
+        model_calls = llm.calls
+        spans = recorder.histograms()
+        stages: Dict[str, List[int]] = {}
+        for span in recorder.spans():
+            if span.kind != "agent":
+                stages.setdefault(span.kind, []).append(span.duration_ns)
+
+        peak_mib = None
+        if measure_memory:
+            # Separate pass: tracemalloc slows allocation-heavy code noticeably.
+            tracemalloc.start()
+            asyncio.run(_run_level(root_agent, scenario, runs, concurrency))
+            peak_mib = tracemalloc.get_traced_memory()[1] / 2**20
+            tracemalloc.stop()
+
+        results.append(
+            {
+                "agent": name,
+                "concurrency": concurrency,
+                "runs": runs,
+                "runs_per_second": runs / elapsed,
+                "model_calls_per_run": model_calls / runs,
+                "run": summarize_durations(sorted(latencies)),
+                "stages": {
+                    kind: summarize_durations(sorted(values)) for kind, values in stages.items()
+                },
+                "spans": spans,
+                "peak_mib": peak_mib,
+            }
+        )
+    return results
+
+
+def _format_row(result: Dict[str, Any]) -> str:
+    def stage_p50(kind: str) -> str:
+        stage = result["stages"].get(kind)
+        return f"{stage['p50_ms']:8.2f}" if stage else f"{'-':>8}"
+
+    peak = f"{result['peak_mib']:8.2f}" if result["peak_mib"] is not None else f"{'-':>8}"
+    return (
+        f"{result['agent']:<26} {result['concurrency']:>4} {result['runs_per_second']:9.1f} "
+        f"{result['run']['p50_ms']:8.2f} {result['run']['p95_ms']:8.2f} "
+        f"{stage_p50('model')} {stage_p50('tool')} {result['model_calls_per_run']:6.1f} {peak}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Offline benchmark for all root agents.")
+    parser.add_argument(
+        "--agents",
+        default=",".join(SCENARIOS),
+        help="Comma-separated subset of: " + ", ".join(SCENARIOS),
+    )
+    parser.add_argument("--concurrency", default="1,4,16", help="Comma-separated levels.")
+    parser.add_argument("--runs", type=int, default=64, help="Sessions per level.")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Fake model latency.")
+    parser.add_argument("--output-tokens", type=int, default=32)
+    parser.add_argument("--skip-memory", action="store_true")
+    parser.add_argument("--json", help="Also write full results (with span histograms) here.")
+    args = parser.parse_args()
+
+    concurrency_levels = [int(level) for level in args.concurrency.split(",")]
+    llm_kwargs = {
+        "latency_seconds": args.latency_ms / 1000,
+        "output_tokens": args.output_tokens,
+    }
+    print(
+        f"{args.runs} runs per level, fake model latency {args.latency_ms} ms, "
+        f"{args.output_tokens} output tokens\n"
+    )
+    print(
+        f"{'agent':<26} {'conc':>4} {'runs/s':>9} {'run p50':>8} {'run p95':>8} "
+        f"{'model50':>8} {'tool50':>8} {'calls':>6} {'peakMiB':>8}"
+    )
+
+    all_results = []
+    for name in args.agents.split(","):
+        try:
+            # The agents and their callbacks log to stdout; keep that out of the report.
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                results = bench_scenario(
+                    name,
+                    SCENARIOS[name],
+                    concurrency_levels,
+                    args.runs,
+                    llm_kwargs,
+                    not args.skip_memory,
+                )
+        except ImportError as e:
+            print(f"{name:<26} skipped: {e}")
+            continue
+        for result in results:
+            print(_format_row(result))
+        all_results.extend(results)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as json_file:
+            json.dump(all_results, json_file, indent=2)
+        print(f"\nWrote {len(all_results)} results to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Micro-benchmark: example_05's signature-driven cache keys vs. the old
+hand-written f-string keys.
+
+Tuple keys cost about the same as the f-string key. Digest keys hash the
+tuple's repr on top, so they are slower; they only pay off where a fixed
+16-byte key matters more than the extra time.
+
+Run from the repository root:
+    python -m benchmarks.bench_cache_keys --iterations 200000
+"""
+
+import argparse
+import sys
+import timeit
+from typing import Any, Dict
+
+from agents_and_callbacks.example_04_tool_arg_validation_modification.agent import (
+    schedule_meeting_tool,
+)
+from agents_and_callbacks.example_05_tool_response_transformation_caching.agent import (
+    convert_currency_tool,
+)
+from agents_and_callbacks.example_05_tool_response_transformation_caching.cache_keys import (
+    CacheKeyBuilder,
+)
+from tools_agent.agent import get_current_date_and_time
+
+
+def legacy_cache_key(tool_name: str, args: Dict[str, Any]) -> str:
+    """The string key builder example_05 used before CacheKeyBuilder."""
+    try:
+        amount_val = args.get("amount")
+        if amount_val is None:
+            amount_str = "0.00"
+        elif isinstance(amount_val, (int, float)):
+            amount_str = f"{float(amount_val):.2f}"
+        else:
+            try:
+                amount_str = f"{float(str(amount_val)):.2f}"
+            except ValueError:
+                amount_str = (
+                    str(amount_val).lower().strip()
+                    if str(amount_val).strip()
+                    else "invalid_amount_str"
+                )
+    except Exception:
+        amount_str = "amount_key_gen_error"
+
+    from_c_str = str(args.get("from_currency", "")).upper().strip()
+    to_c_str = str(args.get("to_currency", "")).upper().strip()
+
+    return f"{tool_name}_{amount_str}_{from_c_str}_{to_c_str}"
+
+
+def _report(label: str, nanoseconds: float, sample: Any) -> None:
+    print(f"{label:<40} {nanoseconds:8.0f} ns/key  {sys.getsizeof(sample):4d} B  {sample!r}")
+
+
+def run(iterations: int) -> None:
+    builder = CacheKeyBuilder(float_digits=2, case_insensitive={"from_currency", "to_currency"})
+    currency_args = {"amount": "100", "from_currency": " usd", "to_currency": "EUR "}
+    meeting_args = {
+        "meeting_date": "2025-12-25",
+        "topic": "Quarterly Review ",
+        "attendees": ["Ana", "Ben"],
+        "time": "afternoon",
+    }
+
+    cases = [
+        (
+            "legacy f-string (currency)",
+            lambda: legacy_cache_key("convert_currency_tool", currency_args),
+        ),
+        (
+            "CacheKeyBuilder tuple (currency)",
+            lambda: builder.build(
+                "convert_currency_tool", convert_currency_tool, currency_args
+            ),
+        ),
+        (
+            "CacheKeyBuilder digest (currency)",
+            lambda: builder.build(
+                "convert_currency_tool", convert_currency_tool, currency_args, digest=True
+            ),
+        ),
+        (
+            "CacheKeyBuilder tuple (meeting)",
+            lambda: builder.build(
+                "schedule_meeting_tool", schedule_meeting_tool, meeting_args
+            ),
+        ),
+        (
+            "CacheKeyBuilder tuple (no args)",
+            lambda: builder.build(
+                "get_current_date_and_time", get_current_date_and_time, {}
+            ),
+        ),
+    ]
+
+    print(f"{iterations} iterations per case\n")
+    timings = {}
+    for label, make_key in cases:
+        make_key()  # Compile the tool's signature outside the timed loop.
+        timings[label] = timeit.timeit(make_key, number=iterations) / iterations * 1e9
+        _report(label, timings[label], make_key())
+
+    legacy = timings["legacy f-string (currency)"]
+    print(
+        f"\nCurrency key vs. legacy: tuple "
+        f"{timings['CacheKeyBuilder tuple (currency)'] / legacy:.2f}x, digest "
+        f"{timings['CacheKeyBuilder digest (currency)'] / legacy:.2f}x "
+        "(the digest trades time for a fixed 16-byte key)"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cache key micro-benchmark.")
+    parser.add_argument("--iterations", type=int, default=200_000)
+    run(parser.parse_args().iterations)
@@ -0,0 +1,103 @@
+"""Benchmark: round-trips and wall time of the run-flow.py sequence.
+
+Runs --flows flows (list deployments, list sessions, create a session, get
+it, send a message, delete it) against deploying_agents.fake_agent_engines,
+where a new session only becomes visible after --ready-ms:
+
+- legacy:   the calls the free functions used to make, with a fresh
+            agent_engines.get per operation, the 1 s sleep after
+            create_session in run-flow.py and the 1 s sleep in get_session
+- uncached: DeploymentClient(ttl_seconds=0): readiness polling only
+- client:   one DeploymentClient reused for every flow
+
+Run from the repository root:
+    python -m benchmarks.bench_deployment_client --flows 5 --latency-ms 50 --ready-ms 300
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+from collections import Counter
+
+# The deploy scripts import each other as top-level modules.
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "deploying_agents")
+)
+
+from actions import DeploymentClient  # noqa: E402
+from fake_agent_engines import FakeAgentEngines  # noqa: E402
+
+USER_ID = "123"
+MESSAGE = "Create a post for what's new in Angular v20?"
+
+
+def legacy_flow(engines: FakeAgentEngines) -> None:
+    resource_id = list(engines.list())[0].resource_name
+    engines.get(resource_id).list_sessions(user_id=USER_ID)
+    session = engines.get(resource_id).create_session(user_id=USER_ID)
+    time.sleep(1)
+    deployment = engines.get(resource_id)
+    time.sleep(1)
+    deployment.get_session(user_id=USER_ID, session_id=session["id"])
+    list(
+        engines.get(resource_id).stream_query(
+            user_id=USER_ID, session_id=session["id"], message=MESSAGE
+        )
+    )
+    engines.get(resource_id).delete_session(user_id=USER_ID, session_id=session["id"])
+
+
+def client_flow(client: DeploymentClient) -> None:
+    resource_id = client.list_deployments()[0].resource_name
+    client.list_sessions(resource_id, USER_ID)
+    session = client.create_session(resource_id, USER_ID)
+    if client.get_session(resource_id, USER_ID, session["id"]) is None:
+        raise RuntimeError("Session never became visible.")
+    client.send_message(resource_id, USER_ID, session["id"], MESSAGE)
+    client.delete_session(resource_id, USER_ID, session["id"])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Deployment client benchmark.")
+    parser.add_argument("--flows", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Fake API latency.")
+    parser.add_argument(
+        "--ready-ms", type=float, default=300.0, help="Delay before a new session is visible."
+    )
+    args = parser.parse_args()
+
+    print(
+        f"{args.flows} flows, fake latency {args.latency_ms} ms, "
+        f"sessions visible after {args.ready_ms} ms\n"
+    )
+    print(f"{'mode':<10} {'s/flow':>7} {'calls/flow':>11} {'get/flow':>9}  calls by method")
+    results = {}
+    for mode in ("legacy", "uncached", "client"):
+        engines = FakeAgentEngines(
+            latency_seconds=args.latency_ms / 1000, ready_after_seconds=args.ready_ms / 1000
+        )
+        engines.create_deployment()
+        client = DeploymentClient(engines=engines, ttl_seconds=0 if mode == "uncached" else 300)
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(args.flows):
+                if mode == "legacy":
+                    legacy_flow(engines)
+                else:
+                    client_flow(client)
+        seconds = (time.perf_counter() - start) / args.flows
+        calls: Counter = engines.calls
+        results[mode] = sum(calls.values()) / args.flows
+        by_method = ", ".join(f"{method} {count}" for method, count in sorted(calls.items()))
+        print(
+            f"{mode:<10} {seconds:7.2f} {results[mode]:11.1f} "
+            f"{calls['get'] / args.flows:9.1f}  {by_method}"
+        )
+    print(f"\nRound-trips saved per flow: {results['legacy'] - results['client']:.1f}")
+
+
+if __name__ == "__main__":
+    main()
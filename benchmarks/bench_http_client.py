@@ -0,0 +1,113 @@
+"""Benchmark: the random-user tool before and after the async pooled client.
+
+Calls the tool `--calls` times, `--concurrency` at a time, against the local
+randomuser.me stub (benchmarks.randomuser_stub) and reports throughput,
+per-call latency, and how many connections the stub saw:
+
+- blocking: the original tool, a `requests.get` per call on the event loop
+- async:    tools_agent's get_randomuser_from_ramdomuserme on AsyncHttpClient,
+            one request per call
+- prefetch: the same tool popping users from its PrefetchBuffer, which is
+            refilled with batched `?results=N` requests
+
+A run with --fail-rate shows the retries absorbing transient 503s.
+
+Run from the repository root:
+    python -m benchmarks.bench_http_client --calls 200 --concurrency 16 --latency-ms 20
+"""
+
+import argparse
+import asyncio
+import os
+import time
+from typing import Callable, List, Tuple
+
+from agent_telemetry import summarize_durations
+
+from .randomuser_stub import serve_randomuser_stub
+
+
+def blocking_tool(url: str) -> dict:
+    # The tool as it was: a new connection per call, no timeout, no retries.
+    import requests
+
+    response = requests.get(url)
+    if response.status_code == 200:
+        user_info = response.json()["results"][0]
+        return {"full_name": f"{user_info['name']['first']} {user_info['name']['last']}"}
+    return {"error": "Failed to fetch data from randomuser.me"}
+
+
+async def _drive(call: Callable, calls: int, concurrency: int) -> Tuple[List[int], int]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[int] = []
+    errors = 0
+
+    async def one_call() -> None:
+        nonlocal errors
+        async with semaphore:
+            start_ns = time.perf_counter_ns()
+            result = await call()
+            latencies.append(time.perf_counter_ns() - start_ns)
+            errors += "error" in result
+
+    await asyncio.gather(*(one_call() for _ in range(calls)))
+    return latencies, errors
+
+
+def run(
+    calls: int, concurrency: int, latency_ms: float, fail_rate: float, prefetch_batch: int
+) -> None:
+    print(
+        f"{calls} calls, concurrency {concurrency}, stub latency {latency_ms} ms, "
+        f"fail rate {fail_rate}, prefetch batch {prefetch_batch}\n"
+    )
+    print(
+        f"{'client':<10} {'calls/s':>9} {'p50':>9} {'p95':>9} {'errors':>7} "
+        f"{'requests':>9} {'conns':>6}"
+    )
+    for mode in ("blocking", "async", "prefetch"):
+        with serve_randomuser_stub(latency_ms=latency_ms, fail_rate=fail_rate) as stub:
+            os.environ["RANDOMUSER_API_URL"] = stub.url
+            if mode == "blocking":
+
+                async def call() -> dict:
+                    return blocking_tool(stub.url)
+
+            else:
+                # Imported here so it picks up RANDOMUSER_API_URL.
+                from tools_agent import agent
+                from tools_agent.prefetch import PrefetchBuffer
+
+                agent.RANDOMUSER_API_URL = stub.url
+                agent.randomuser_prefetcher = (
+                    PrefetchBuffer(
+                        agent.fetch_randomusers,
+                        capacity=4 * prefetch_batch,
+                        low_water=prefetch_batch,
+                        batch_size=prefetch_batch,
+                    )
+                    if mode == "prefetch"
+                    else None
+                )
+                call = agent.get_randomuser_from_ramdomuserme
+
+            start = time.perf_counter()
+            latencies, errors = asyncio.run(_drive(call, calls, concurrency))
+            elapsed = time.perf_counter() - start
+            summary = summarize_durations(sorted(latencies))
+            print(
+                f"{mode:<10} {calls / elapsed:9.1f} {summary['p50_ms']:6.1f} ms "
+                f"{summary['p95_ms']:6.1f} ms {errors:7d} {stub.requests:9d} {stub.connections:6d}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Random-user HTTP client benchmark.")
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Stub server latency.")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Fraction of 503s.")
+    parser.add_argument("--prefetch-batch", type=int, default=25, help="Users per request.")
+    args = parser.parse_args()
+    run(args.calls, args.concurrency, args.latency_ms, args.fail_rate, args.prefetch_batch)
@@ -0,0 +1,144 @@
+"""Benchmark: cold import and agent construction time per agent package.
+
+Each package is measured in a fresh interpreter started with
+`python -X importtime`, in two steps:
+
+- import:     `import <package>` (what `adk web` and scripts pay up front)
+- root_agent: then `<package>.agent.root_agent`, which imports the agent
+              module and builds the agents
+
+and the heaviest top-level imports of the whole run are listed from the
+importtime report. Numbers are medians over --repeat runs.
+
+Run from the repository root:
+    python -m benchmarks.bench_import_time
+    python -m benchmarks.bench_import_time --packages multi_model,social_posts_agent --json imports.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PACKAGES = {
+    "tools_agent": "tools_agent",
+    "structured_output": "structured_output",
+    "marketing_campaign_agent": "marketing_campaign_agent",
+    "multi_model": "multi_model",
+    "sessions_and_agents": "sessions_and_agents",
+    "social_posts_agent": "social_posts_agent",
+    "example_01": "agents_and_callbacks.example_01_agent_lifecycle_logging",
+    "example_02": "agents_and_callbacks.example_02_model_input_sanitization",
+    "example_03": "agents_and_callbacks.example_03_model_response_enchancement",
+    "example_04": "agents_and_callbacks.example_04_tool_arg_validation_modification",
+    "example_05": "agents_and_callbacks.example_05_tool_response_transformation_caching",
+}
+
+_CHILD = """
+import importlib, json, time
+start = time.perf_counter()
+package = importlib.import_module({package!r})
+imported = time.perf_counter()
+importlib.import_module({package!r} + ".agent").root_agent
+built = time.perf_counter()
+print(json.dumps({{"import_ms": (imported - start) * 1e3, "root_agent_ms": (built - start) * 1e3}}))
+"""
+
+
+def _environment() -> Dict[str, str]:
+    env = dict(os.environ)
+    # social_posts_agent is deployed from (and imported relative to) deploying_agents/.
+    env["PYTHONPATH"] = os.pathsep.join(
+        [REPO_ROOT, os.path.join(REPO_ROOT, "deploying_agents"), env.get("PYTHONPATH", "")]
+    )
+    env.setdefault("GOOGLE_GENAI_MODEL", "gemini-2.0-flash")
+    env.setdefault("OPENAI_MODEL", "openai/gpt-4o")
+    env.setdefault("CLAUDE_MODEL", "anthropic/claude-3-5-sonnet")
+    env.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "True")
+    return env
+
+
+def _top_level_imports(importtime_report: str) -> List[Tuple[str, float]]:
+    """Returns (module, cumulative ms) for each top-level import in a -X importtime report."""
+    imports = []
+    for line in importtime_report.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        if not name[1:].startswith(" "):
+            imports.append((name.strip(), int(cumulative) / 1e3))
+    return imports
+
+
+def measure(package: str, repeat: int, env: Dict[str, str]) -> Dict[str, object]:
+    import_ms: List[float] = []
+    root_agent_ms: List[float] = []
+    heaviest: Dict[str, float] = {}
+    for _ in range(repeat):
+        command = [sys.executable, "-X", "importtime", "-W", "ignore"]
+        completed = subprocess.run(
+            [*command, "-c", _CHILD.format(package=package)],
+            capture_output=True,
+            text=True,
+            cwd=REPO_ROOT,
+            env=env,
+        )
+        if completed.returncode != 0:
+            errors = [
+                line for line in completed.stderr.splitlines() if not line.startswith("import time:")
+            ]
+            return {"package": package, "error": (errors or ["unknown error"])[-1]}
+        # Agents may print while they are built; the timings are the last line.
+        timings = json.loads(completed.stdout.strip().splitlines()[-1])
+        import_ms.append(timings["import_ms"])
+        root_agent_ms.append(timings["root_agent_ms"])
+        for name, cumulative_ms in _top_level_imports(completed.stderr):
+            heaviest[name] = max(heaviest.get(name, 0.0), cumulative_ms)
+    return {
+        "package": package,
+        "import_ms": statistics.median(import_ms),
+        "root_agent_ms": statistics.median(root_agent_ms),
+        "heaviest_imports": sorted(heaviest.items(), key=lambda item: -item[1])[:3],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Import-time benchmark for agent packages.")
+    parser.add_argument(
+        "--packages",
+        default=",".join(PACKAGES),
+        help="Comma-separated subset of: " + ", ".join(PACKAGES),
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Fresh interpreters per package.")
+    parser.add_argument("--json", help="Also write the results here.")
+    args = parser.parse_args()
+
+    env = _environment()
+    print(f"Median of {args.repeat} fresh interpreters per package\n")
+    print(f"{'package':<26} {'import':>10} {'root_agent':>11}  heaviest top-level imports")
+    results = []
+    for name in args.packages.split(","):
+        result = measure(PACKAGES[name], args.repeat, env)
+        result["name"] = name
+        results.append(result)
+        if "error" in result:
+            print(f"{name:<26} failed: {result['error']}")
+            continue
+        heaviest = ", ".join(f"{module} {ms:.0f}" for module, ms in result["heaviest_imports"])
+        print(
+            f"{name:<26} {result['import_ms']:7.1f} ms {result['root_agent_ms']:8.1f} ms  {heaviest}"
+        )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as json_file:
+            json.dump(results, json_file, indent=2)
+        print(f"\nWrote {len(results)} results to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Benchmark: InstructionTemplate vs. ADK's per-call state injection.
+
+Renders the PostAgent, PostsMergerAgent and AdviceGeneratorAgent instructions
+once per simulated turn against state holding large values, and reports the
+render cost per turn for:
+
+- inject:   google.adk's inject_session_state (what a plain string instruction uses)
+- template: InstructionTemplate with state unchanged between turns
+- changed:  InstructionTemplate with a referenced key replaced every turn
+
+Run from the repository root:
+    python -m benchmarks.bench_instruction_templates --value-kib 32
+"""
+
+import argparse
+import asyncio
+import os
+import time
+from types import SimpleNamespace
+from typing import Any, Dict
+
+from google.adk.utils.instructions_utils import inject_session_state
+
+os.environ.setdefault("GOOGLE_GENAI_MODEL", "gemini-2.0-flash")
+os.environ.setdefault("OPENAI_MODEL", "openai/gpt-4o")
+os.environ.setdefault("CLAUDE_MODEL", "anthropic/claude-3-5-sonnet")
+os.environ.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "True")
+
+from multi_model.agent import postsMergerAgent  # noqa: E402
+from sessions_and_agents.agent import root_agent as post_agent  # noqa: E402
+from structured_output.agent import advice_generator_agent  # noqa: E402
+
+
+def _state(value_kib: int) -> Dict[str, Any]:
+    text = ("Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 18)[:1024]
+    large = text * value_kib
+    return {
+        "user_name": "Ahsan",
+        "user_post_preferences": large,
+        "linkedIn_post": large,
+        "instagram_reel_script": large,
+        "problem_analysis_result": {
+            "consultant_type": "financial_advisor",
+            "identified_issues_summary": large,
+        },
+    }
+
+
+def _context(state: Dict[str, Any]) -> SimpleNamespace:
+    session = SimpleNamespace(id="bench-session", state=state, app_name="bench", user_id="u")
+    return SimpleNamespace(
+        _invocation_context=SimpleNamespace(session=session, artifact_service=None)
+    )
+
+
+def _time_per_turn(render, turns: int) -> float:
+    start = time.perf_counter()
+    for turn in range(turns):
+        render(turn)
+    return (time.perf_counter() - start) / turns * 1e6
+
+
+def run(value_kib: int, turns: int) -> None:
+    print(f"State values of {value_kib} KiB, {turns} turns\n")
+    print(f"{'agent':<24} {'inject':>12} {'template':>12} {'changed':>12}")
+    for agent in (post_agent, postsMergerAgent, advice_generator_agent):
+        template = agent.instruction
+        state = _state(value_kib)
+        context = _context(state)
+
+        rendered = template(context)
+        expected = asyncio.run(inject_session_state(template.template, context))
+        assert rendered == expected, f"{agent.name}: rendered instruction differs from ADK's"
+
+        loop = asyncio.new_event_loop()
+        inject_us = _time_per_turn(
+            lambda turn: loop.run_until_complete(
+                inject_session_state(template.template, context)
+            ),
+            turns,
+        )
+        loop.close()
+        cached_us = _time_per_turn(lambda turn: template(context), turns)
+
+        changing_key = template.keys[-1]
+        original = state[changing_key]
+
+        def render_changed(turn: int) -> None:
+            # A new value object each turn, as an agent's output_key would produce.
+            state[changing_key] = original if turn % 2 else _copy(original)
+            template(context)
+
+        changed_us = _time_per_turn(render_changed, turns)
+        print(f"{agent.name:<24} {inject_us:9.1f} us {cached_us:9.1f} us {changed_us:9.1f} us")
+
+
+def _copy(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {key: _copy(item) for key, item in value.items()} | {"turn": time.perf_counter()}
+    return value + " "
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Instruction template benchmark.")
+    parser.add_argument("--value-kib", type=int, default=16, help="Size of large state values.")
+    parser.add_argument("--turns", type=int, default=2000)
+    args = parser.parse_args()
+    run(args.value_kib, args.turns)
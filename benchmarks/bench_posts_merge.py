@@ -0,0 +1,104 @@
+"""Benchmark: deterministic PostsMerge stage vs. the PostsMergerAgent model call.
+
+Runs multi_model's SocialMediaAgent offline (every model replaced by
+benchmarks.fake_llm.FakeLlm) with the merge stage in each mode:
+
+- deterministic: PostsMergeAgent assembles the output from state
+- llm:           PostsMergeAgent.rewrite=True, so PostsMergerAgent runs
+
+and reports run latency, model calls per run and model tokens per run
+(prompt + output, the basis of per-call cost).
+
+Run from the repository root:
+    python -m benchmarks.bench_posts_merge --runs 64 --latency-ms 200
+"""
+
+import argparse
+import asyncio
+import contextlib
+import logging
+import os
+import time
+from typing import Dict, List
+
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+from agent_telemetry import SpanRecorder, instrument, summarize_durations
+
+from .fake_llm import FakeLlm, use_fake_llm
+
+os.environ.setdefault("GOOGLE_GENAI_MODEL", "gemini-2.0-flash")
+os.environ.setdefault("OPENAI_MODEL", "openai/gpt-4o")
+os.environ.setdefault("CLAUDE_MODEL", "anthropic/claude-3-5-sonnet")
+os.environ.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "True")
+logging.getLogger("opentelemetry.context").setLevel(logging.CRITICAL)
+
+from multi_model.agent import postsMergeAgent, root_agent  # noqa: E402
+
+
+async def _run(runs: int, concurrency: int) -> List[int]:
+    session_service = InMemorySessionService()
+    runner = Runner(agent=root_agent, app_name="bench", session_service=session_service)
+    message = types.Content(role="user", parts=[types.Part(text="Remote work productivity")])
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[int] = []
+
+    async def one_run(index: int) -> None:
+        async with semaphore:
+            start_ns = time.perf_counter_ns()
+            session = await session_service.create_session(
+                app_name="bench", user_id=f"user_{index}"
+            )
+            async for _ in runner.run_async(
+                user_id=session.user_id, session_id=session.id, new_message=message
+            ):
+                pass
+            latencies.append(time.perf_counter_ns() - start_ns)
+
+    await asyncio.gather(*(one_run(index) for index in range(runs)))
+    return latencies
+
+
+def _tokens(counters: Dict[str, int]) -> int:
+    return sum(
+        value
+        for name, value in counters.items()
+        if name.endswith(".prompt_tokens") or name.endswith(".output_tokens")
+    )
+
+
+def run(runs: int, concurrency: int, latency_ms: float, output_tokens: int) -> None:
+    llm = FakeLlm(latency_seconds=latency_ms / 1000, output_tokens=output_tokens)
+    use_fake_llm(root_agent, llm)
+    recorder = SpanRecorder(capacity=max(4096, runs * 32))
+    instrument(root_agent, recorder)
+
+    print(
+        f"{runs} runs, concurrency {concurrency}, fake model latency {latency_ms} ms, "
+        f"{output_tokens} output tokens\n"
+    )
+    print(f"{'merge':<14} {'run p50':>9} {'run p95':>9} {'calls/run':>10} {'tokens/run':>11}")
+    for mode in ("llm", "deterministic"):
+        postsMergeAgent.rewrite = mode == "llm"
+        recorder.reset()
+        llm.calls = 0
+        # The agents print to stdout; keep that out of the report.
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            latencies = asyncio.run(_run(runs, concurrency))
+        summary = summarize_durations(sorted(latencies))
+        print(
+            f"{mode:<14} {summary['p50_ms']:6.1f} ms {summary['p95_ms']:6.1f} ms "
+            f"{llm.calls / runs:10.1f} {_tokens(recorder.counters) / runs:11.0f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="PostsMerge benchmark.")
+    parser.add_argument("--runs", type=int, default=32)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--latency-ms", type=float, default=100.0, help="Fake model latency.")
+    parser.add_argument("--output-tokens", type=int, default=200)
+    args = parser.parse_args()
+    run(args.runs, args.concurrency, args.latency_ms, args.output_tokens)
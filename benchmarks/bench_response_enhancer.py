@@ -0,0 +1,141 @@
+"""Benchmark: example_03's copy-on-write after_model_callback_enhance vs. the
+previous deepcopy-every-response implementation.
+
+Replays the recorded responses in benchmarks/data/travel_responses.jsonl
+through both callbacks and reports latency and allocated memory per call.
+
+Run from the repository root:
+    python -m benchmarks.bench_response_enhancer
+"""
+
+import argparse
+import contextlib
+import copy
+import json
+import os
+import re
+import time
+import tracemalloc
+from types import SimpleNamespace
+from typing import Callable, List, Optional
+
+from google.adk.models import LlmResponse
+from google.genai import types
+
+from agents_and_callbacks.example_03_model_response_enchancement.agent import (
+    after_model_callback_enhance,
+)
+
+CORPUS_PATH = os.path.join(os.path.dirname(__file__), "data", "travel_responses.jsonl")
+
+
+def legacy_after_model_callback_enhance(
+    callback_context, llm_response: LlmResponse
+) -> Optional[LlmResponse]:
+    """The deepcopy-based callback example_03 used before ResponseEnhancer."""
+    if not llm_response.content or not llm_response.content.parts:
+        return llm_response
+
+    modified_llm_response = copy.deepcopy(llm_response)
+    original_text = modified_llm_response.content.parts[0].text
+    current_text = original_text
+    print(f"\n[AFTER MODEL] Original LLM response: '{original_text}'")
+
+    flight_match = re.search(
+        r"flight\s+(?P<flight_number>[A-Z0-9]{2,6})\s+from\s+(?P<origin>[\w\s]+?)\s+to\s+(?P<destination>[\w\s]+?)\s+on\s+(?P<date>\d{4}-\d{2}-\d{2})",
+        original_text,
+        re.IGNORECASE,
+    )
+    if flight_match:
+        flight_details = flight_match.groupdict()
+        flight_details["origin"] = flight_details["origin"].strip()
+        flight_details["destination"] = flight_details["destination"].strip()
+        callback_context.state["extracted_flight_info"] = flight_details
+        current_text += f"\n\n**Flight Summary Logged:**\nNumber: {flight_details['flight_number']}\nFrom: {flight_details['origin']}\nTo: {flight_details['destination']}\nDate: {flight_details['date']}"
+
+    if "refund policy" in original_text.lower():
+        refund_link = (
+            "\nFor more details, see our [Refund Policy](https://example.com/refunds)."
+        )
+        if refund_link not in current_text:
+            current_text += refund_link
+
+    if "baggage allowance" in original_text.lower():
+        baggage_link = "\nCheck our [Baggage Allowance](https://example.com/baggage)."
+        if baggage_link not in current_text:
+            current_text += baggage_link
+
+    if current_text != original_text:
+        modified_llm_response.content.parts[0].text = current_text
+        print(f"[AFTER MODEL] Enhanced response being sent to user: '{current_text}'")
+    return modified_llm_response
+
+
+def load_corpus() -> List[LlmResponse]:
+    with open(CORPUS_PATH, encoding="utf-8") as corpus_file:
+        return [
+            LlmResponse(
+                content=types.Content(
+                    role="model", parts=[types.Part(text=json.loads(line)["text"])]
+                )
+            )
+            for line in corpus_file
+            if line.strip()
+        ]
+
+
+def _final_text(callback: Callable, response: LlmResponse) -> str:
+    result = callback(SimpleNamespace(state={}, invocation_id="bench"), response) or response
+    return result.content.parts[0].text
+
+
+def measure(callback: Callable, corpus: List[LlmResponse], rounds: int) -> dict:
+    context = SimpleNamespace(state={}, invocation_id="bench")
+    calls = rounds * len(corpus)
+    # The callbacks log to stdout; keep that out of the measurement.
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for response in corpus:
+                callback(context, response)
+        elapsed = time.perf_counter() - start
+
+        tracemalloc.start()
+        peak_total = 0
+        for response in corpus:
+            tracemalloc.reset_peak()
+            baseline, _ = tracemalloc.get_traced_memory()
+            callback(context, response)
+            peak_total += tracemalloc.get_traced_memory()[1] - baseline
+        tracemalloc.stop()
+    return {
+        "us_per_call": elapsed / calls * 1e6,
+        "peak_kib_per_call": peak_total / len(corpus) / 1024,
+    }
+
+
+def run(rounds: int) -> None:
+    corpus = load_corpus()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for response in corpus:
+            assert _final_text(after_model_callback_enhance, response) == _final_text(
+                legacy_after_model_callback_enhance, response
+            )
+
+    print(f"{len(corpus)} recorded responses x {rounds} rounds\n")
+    print(f"{'callback':<14} {'latency':>12} {'peak alloc/call':>16}")
+    for label, callback in (
+        ("deepcopy", legacy_after_model_callback_enhance),
+        ("copy-on-write", after_model_callback_enhance),
+    ):
+        stats = measure(callback, corpus, rounds)
+        print(
+            f"{label:<14} {stats['us_per_call']:9.1f} us "
+            f"{stats['peak_kib_per_call']:12.1f} KiB"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Response enhancer benchmark.")
+    parser.add_argument("--rounds", type=int, default=200)
+    run(parser.parse_args().rounds)
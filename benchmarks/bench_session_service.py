@@ -0,0 +1,120 @@
+"""Benchmark: SqliteSessionService vs. InMemorySessionService.
+
+Creates sessions seeded with the PostAgent's state context and appends
+events with small state deltas, as a conversation would. Reports sessions
+per second (including the final flush), p50/p99 append_event latency,
+database size per session and bytes saved by value interning for:
+
+- memory:         InMemorySessionService (no persistence)
+- sqlite:         SqliteSessionService with write-behind batching
+- sqlite-inline:  the same, storing large state values inline (no interning)
+- sqlite-sync:    SqliteSessionService committing every write immediately
+
+Run from the repository root:
+    python -m benchmarks.bench_session_service --sessions 500 --events 20
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from typing import List
+
+from google.adk.events import Event, EventActions
+from google.adk.sessions import BaseSessionService, InMemorySessionService
+from google.genai import types
+
+from agent_telemetry import summarize_durations
+from sessions_and_agents.sqlite_session_service import SqliteSessionService
+
+STATE_CONTEXT = {
+    "user_name": "Ahsan",
+    "user_post_preferences": "- LinkedIn: Professional, engaging, and relevant to the topic.\n" * 12,
+}
+# Every fourth turn re-writes a large output_key value, as agents with output_key do.
+POST_GUIDELINES = "Use a hook under 60 characters, then bullet points and a question.\n" * 10
+
+
+def _event(index: int) -> Event:
+    return Event(
+        author="user" if index % 2 == 0 else "PostAgent",
+        invocation_id=f"inv-{index // 2}",
+        content=types.Content(
+            role="user" if index % 2 == 0 else "model",
+            parts=[types.Part(text=f"Message {index}: " + "lorem ipsum " * 20)],
+        ),
+        actions=EventActions(
+            state_delta={"turn": index, "last_topic": f"topic {index}"}
+            | ({"post_guidelines": POST_GUIDELINES} if index % 4 == 3 else {})
+        ),
+    )
+
+
+async def _workload(
+    service: BaseSessionService, sessions: int, events: int
+) -> List[int]:
+    append_latencies = []
+    for session_index in range(sessions):
+        session = await service.create_session(
+            app_name="bench", user_id=f"user_{session_index % 10}", state=dict(STATE_CONTEXT)
+        )
+        for event_index in range(events):
+            event = _event(event_index)
+            start_ns = time.perf_counter_ns()
+            await service.append_event(session, event)
+            append_latencies.append(time.perf_counter_ns() - start_ns)
+    return append_latencies
+
+
+def _database_bytes(db_path: str) -> int:
+    return sum(
+        os.path.getsize(path)
+        for path in (db_path, db_path + "-wal")
+        if os.path.exists(path)
+    )
+
+
+def run(sessions: int, events: int) -> None:
+    print(f"{sessions} sessions x {events} events\n")
+    print(
+        f"{'service':<14} {'sessions/s':>11} {'append p50':>11} {'append p99':>11} "
+        f"{'db/session':>11} {'saved/session':>14}"
+    )
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        factories = {
+            "memory": InMemorySessionService,
+            "sqlite": lambda: SqliteSessionService(os.path.join(tmp_dir, "batched.db")),
+            "sqlite-inline": lambda: SqliteSessionService(
+                os.path.join(tmp_dir, "inline.db"), intern_min_bytes=None
+            ),
+            "sqlite-sync": lambda: SqliteSessionService(
+                os.path.join(tmp_dir, "sync.db"), flush_interval_seconds=0
+            ),
+        }
+        for label, factory in factories.items():
+            service = factory()
+            start = time.perf_counter()
+            latencies = asyncio.run(_workload(service, sessions, events))
+            if isinstance(service, SqliteSessionService):
+                service.close()
+            elapsed = time.perf_counter() - start
+            db_size = saved = "-"
+            if isinstance(service, SqliteSessionService):
+                db_size = f"{_database_bytes(service.db_path) / sessions / 1024:.1f} KiB"
+                saved_bytes = service.interning_stats().get("bytes_saved", 0)
+                saved = f"{saved_bytes / sessions / 1024:.1f} KiB"
+            stats = summarize_durations(sorted(latencies))
+            print(
+                f"{label:<14} {sessions / elapsed:11.1f} "
+                f"{stats['p50_ms'] * 1000:8.1f} us {stats['p99_ms'] * 1000:8.1f} us "
+                f"{db_size:>11} {saved:>14}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Session service benchmark.")
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--events", type=int, default=10)
+    args = parser.parse_args()
+    run(args.sessions, args.events)
@@ -0,0 +1,102 @@
+"""Benchmark: accumulating send_message vs. streaming into a callback.
+
+The local fake agent_engines streams a reply of --chunks partial events,
+--interval-ms apart, followed by the final event, and the reply is consumed
+three ways:
+
+- accumulate: actions.send_message, which prints every event (to
+              /dev/null here) and returns them all at the end
+- callback:   DeploymentClient.stream_message with the TextDeltas filter
+- async:      DeploymentClient.astream_message with the TextDeltas filter
+
+"first item" is when the caller can act on the first piece of the reply
+(for send_message, only once the whole list is returned). Peak memory is
+measured in a second, tracemalloc-instrumented pass.
+
+Run from the repository root:
+    python -m benchmarks.bench_streaming --chunks 2000 --interval-ms 1
+"""
+
+import argparse
+import asyncio
+import contextlib
+import os
+import sys
+import time
+import tracemalloc
+
+# The deploy scripts import each other as top-level modules.
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "deploying_agents")
+)
+
+import actions  # noqa: E402
+from fake_agent_engines import FakeAgentEngines  # noqa: E402
+from streaming import StreamStats, TextDeltas  # noqa: E402
+
+USER_ID = "123"
+
+
+def consume(
+    mode: str, client: actions.DeploymentClient, resource_id: str, session_id: str, message: str
+) -> float:
+    """Runs one reply through `mode`; returns seconds until the first item reached the caller."""
+    start = time.perf_counter()
+    first = []
+
+    def on_item(item) -> None:
+        if not first:
+            first.append(time.perf_counter() - start)
+
+    if mode == "accumulate":
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            events = actions.send_message(resource_id, USER_ID, session_id, message)
+        on_item(events[0])
+    elif mode == "callback":
+        client.stream_message(
+            resource_id, USER_ID, session_id, message, on_item, event_filter=TextDeltas()
+        )
+    else:
+
+        async def run() -> None:
+            async for item in client.astream_message(
+                resource_id, USER_ID, session_id, message, TextDeltas(), StreamStats()
+            ):
+                on_item(item)
+
+        asyncio.run(run())
+    return first[0]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Streaming send_message benchmark.")
+    parser.add_argument("--chunks", type=int, default=2000, help="Partial events per reply.")
+    parser.add_argument("--chunk-chars", type=int, default=200)
+    parser.add_argument("--interval-ms", type=float, default=1.0, help="Gap between chunks.")
+    args = parser.parse_args()
+
+    engines = FakeAgentEngines(
+        reply_chunks=args.chunks, chunk_interval_seconds=args.interval_ms / 1000
+    )
+    deployment = engines.create_deployment()
+    actions.agent_engines = engines
+    client = actions.DeploymentClient(engines=engines)
+    session_id = deployment.create_session(user_id=USER_ID)["id"]
+    message = "x" * (args.chunks * args.chunk_chars - len("Echo: "))
+
+    print(f"{args.chunks} chunks of {args.chunk_chars} chars, {args.interval_ms} ms apart\n")
+    print(f"{'mode':<12} {'first item':>11} {'total':>8} {'peak memory':>12}")
+    for mode in ("accumulate", "callback", "async"):
+        start = time.perf_counter()
+        first = consume(mode, client, deployment.resource_name, session_id, message)
+        total = time.perf_counter() - start
+
+        tracemalloc.start()
+        consume(mode, client, deployment.resource_name, session_id, message)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{mode:<12} {first * 1e3:8.1f} ms {total:7.2f}s {peak / 2**20:9.2f} MiB")
+
+
+if __name__ == "__main__":
+    main()
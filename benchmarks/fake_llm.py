@@ -0,0 +1,118 @@
+"""A deterministic, offline stand-in for Gemini/OpenAI/Anthropic models.
+
+FakeLlm implements google.adk's BaseLlm, so it can replace the `model` of any
+LlmAgent. It sleeps for a configurable latency and then answers from a script:
+
+- If a scripted tool is available to the agent and the conversation does not
+  end in a function response yet, it calls that tool with the scripted args.
+- If the request has an output schema, it returns a minimal JSON instance.
+- Otherwise it returns the scripted text (or `output_tokens` filler words).
+
+Usage metadata is filled in so token counters and cost accounting can be
+exercised without network access.
+"""
+
+import asyncio
+import json
+import typing
+from enum import Enum
+from typing import Any, AsyncGenerator, Dict, Optional
+
+from google.adk.agents import BaseAgent, LlmAgent
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from google.genai import types
+from pydantic import BaseModel, Field
+
+# google_search only accepts Gemini 2 model names, so keep the prefix.
+FAKE_MODEL_NAME = "gemini-2.0-flash-offline-stub"
+
+
+class FakeLlm(BaseLlm):
+    model: str = FAKE_MODEL_NAME
+    latency_seconds: float = 0.0
+    output_tokens: int = 32
+    text: Optional[str] = None
+    tool_calls: Dict[str, Dict[str, Any]] = Field(default_factory=dict)
+    calls: int = 0
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+        self.calls += 1
+
+        function_call = self._next_function_call(llm_request)
+        if function_call:
+            part = types.Part(function_call=function_call)
+        else:
+            part = types.Part(text=self._response_text(llm_request))
+        yield LlmResponse(
+            content=types.Content(role="model", parts=[part]),
+            usage_metadata=types.GenerateContentResponseUsageMetadata(
+                prompt_token_count=_estimate_tokens(llm_request),
+                candidates_token_count=self.output_tokens,
+                total_token_count=_estimate_tokens(llm_request) + self.output_tokens,
+            ),
+        )
+
+    def _next_function_call(self, llm_request: LlmRequest) -> Optional[types.FunctionCall]:
+        last_content = llm_request.contents[-1] if llm_request.contents else None
+        if last_content and any(part.function_response for part in last_content.parts or []):
+            return None
+        for tool_name, args in self.tool_calls.items():
+            if tool_name in llm_request.tools_dict:
+                return types.FunctionCall(name=tool_name, args=dict(args))
+        return None
+
+    def _response_text(self, llm_request: LlmRequest) -> str:
+        schema = llm_request.config.response_schema if llm_request.config else None
+        if isinstance(schema, type) and issubclass(schema, BaseModel):
+            return json.dumps(sample_instance(schema))
+        if self.text is not None:
+            return self.text
+        return " ".join(["token"] * self.output_tokens)
+
+
+def _estimate_tokens(llm_request: LlmRequest) -> int:
+    # Roughly four characters per token, as a stable stand-in for a tokenizer.
+    characters = len(llm_request.config.system_instruction or "") if llm_request.config else 0
+    for content in llm_request.contents:
+        for part in content.parts or []:
+            characters += len(part.text or "")
+    return characters // 4
+
+
+def sample_instance(annotation: Any) -> Any:
+    """Builds the smallest JSON-compatible value matching a type annotation."""
+    if isinstance(annotation, type):
+        if issubclass(annotation, BaseModel):
+            return {
+                name: sample_instance(field.annotation)
+                for name, field in annotation.model_fields.items()
+            }
+        if issubclass(annotation, Enum):
+            return next(iter(annotation)).value
+        if issubclass(annotation, bool):
+            return False
+        if issubclass(annotation, (int, float)):
+            return 0
+        if issubclass(annotation, str):
+            return "stub"
+    origin = typing.get_origin(annotation)
+    arguments = [arg for arg in typing.get_args(annotation) if arg is not type(None)]
+    if origin in (list, set, tuple):
+        return [sample_instance(arguments[0])] if arguments else []
+    if origin is dict:
+        return {}
+    if arguments:  # Optional / Union
+        return sample_instance(arguments[0])
+    return None
+
+
+def use_fake_llm(agent: BaseAgent, llm: FakeLlm) -> None:
+    """Replaces the model of every LlmAgent in the tree rooted at `agent`."""
+    if isinstance(agent, LlmAgent):
+        agent.model = llm
+    for sub_agent in agent.sub_agents:
+        use_fake_llm(sub_agent, llm)
@@ -0,0 +1,152 @@
+"""A local stand-in for the randomuser.me API, for offline tests and benchmarks.
+
+The server speaks just enough HTTP/1.1 (GET, keep-alive, Content-Length) for
+httpx and requests. It answers every path with randomuser.me's response
+shape, honours `?results=N`, and can add latency and fail a fraction of
+requests with 503. It runs on its own event loop in a daemon thread, so the
+code under test can use any loop (or none):
+
+    with serve_randomuser_stub(latency_ms=20) as stub:
+        os.environ["RANDOMUSER_API_URL"] = stub.url
+        ...
+        print(stub.connections, stub.requests)
+
+Run standalone to point `adk web` at it:
+    python -m benchmarks.randomuser_stub --port 8765
+"""
+
+import argparse
+import asyncio
+import contextlib
+import itertools
+import json
+import random
+import threading
+from typing import Iterator, Optional
+from urllib.parse import parse_qs, urlsplit
+
+MAX_RESULTS = 5000  # randomuser.me's own limit.
+
+
+class RandomUserStub:
+    def __init__(self, latency_ms: float = 0.0, fail_rate: float = 0.0, seed: int = 0) -> None:
+        self.latency_seconds = latency_ms / 1000
+        self.fail_rate = fail_rate
+        self._random = random.Random(seed)
+        self._user_ids = itertools.count()
+        self.connections = 0
+        self.requests = 0
+        self.users_served = 0
+        self.url = ""
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def _user(self) -> dict:
+        user_id = next(self._user_ids)
+        return {
+            "name": {"title": "Mx", "first": f"First{user_id}", "last": f"Last{user_id}"},
+            "email": f"user{user_id}@example.com",
+            "phone": f"(555) 01{user_id % 100:02d}-{user_id % 10000:04d}",
+        }
+
+    def _response(self, target: str) -> bytes:
+        query = parse_qs(urlsplit(target).query)
+        try:
+            count = min(max(int(query.get("results", ["1"])[0]), 1), MAX_RESULTS)
+        except ValueError:
+            count = 1
+        self.users_served += count
+        body = json.dumps(
+            {"results": [self._user() for _ in range(count)], "info": {"results": count}}
+        ).encode("utf-8")
+        return (
+            b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+            + f"Content-Length: {len(body)}\r\n\r\n".encode("ascii")
+            + body
+        )
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            while True:
+                request = await reader.readuntil(b"\r\n\r\n")
+                request_line, *header_lines = request.decode("latin-1").split("\r\n")
+                method, target, _ = request_line.split(" ", 2)
+                headers = {
+                    name.strip().lower(): value.strip()
+                    for name, _, value in (line.partition(":") for line in header_lines if line)
+                }
+                self.requests += 1
+                if self.latency_seconds:
+                    await asyncio.sleep(self.latency_seconds)
+                if self._random.random() < self.fail_rate:
+                    writer.write(b"HTTP/1.1 503 Service Unavailable\r\nContent-Length: 0\r\n\r\n")
+                elif method in ("GET", "HEAD"):
+                    response = self._response(target)
+                    writer.write(response if method == "GET" else response.split(b"\r\n\r\n")[0] + b"\r\n\r\n")
+                else:
+                    writer.write(b"HTTP/1.1 405 Method Not Allowed\r\nContent-Length: 0\r\n\r\n")
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, asyncio.CancelledError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Starts the server in a daemon thread and returns its base URL."""
+        started = threading.Event()
+
+        def run() -> None:
+            self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self._loop)
+            self._server = self._loop.run_until_complete(
+                asyncio.start_server(self._handle, host, port)
+            )
+            bound_port = self._server.sockets[0].getsockname()[1]
+            self.url = f"http://{host}:{bound_port}/api/"
+            started.set()
+            self._loop.run_forever()
+            # Drop connections clients kept alive, then shut the loop down cleanly.
+            self._server.close()
+            handlers = asyncio.all_tasks(self._loop)
+            for handler in handlers:
+                handler.cancel()
+            self._loop.run_until_complete(asyncio.gather(*handlers, return_exceptions=True))
+            self._loop.close()
+
+        self._thread = threading.Thread(target=run, name="randomuser-stub", daemon=True)
+        self._thread.start()
+        started.wait()
+        return self.url
+
+    def stop(self) -> None:
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+
+
+@contextlib.contextmanager
+def serve_randomuser_stub(
+    latency_ms: float = 0.0, fail_rate: float = 0.0, seed: int = 0
+) -> Iterator[RandomUserStub]:
+    stub = RandomUserStub(latency_ms=latency_ms, fail_rate=fail_rate, seed=seed)
+    stub.start()
+    try:
+        yield stub
+    finally:
+        stub.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local randomuser.me stub server.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    args = parser.parse_args()
+    stub = RandomUserStub(latency_ms=args.latency_ms, fail_rate=args.fail_rate)
+    print(f"Serving on {stub.start(port=args.port)} (Ctrl+C to stop)")
+    with contextlib.suppress(KeyboardInterrupt):
+        threading.Event().wait()
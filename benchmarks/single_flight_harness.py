@@ -0,0 +1,72 @@
+"""Fires N concurrent identical currency conversions through example_05's
+tool callbacks and asserts that `convert_currency_tool` runs exactly once.
+
+Run from the repository root:
+    python -m benchmarks.single_flight_harness --requests 100
+"""
+
+import argparse
+import asyncio
+import time
+from types import SimpleNamespace
+from typing import Any, Dict
+
+from agents_and_callbacks.example_05_tool_response_transformation_caching import (
+    agent as currency_agent,
+)
+
+
+class CountingTool:
+    """Stands in for ADK's FunctionTool and counts real executions."""
+
+    name = "convert_currency_tool"
+    func = staticmethod(currency_agent.convert_currency_tool)
+
+    def __init__(self, latency_seconds: float) -> None:
+        self.latency_seconds = latency_seconds
+        self.calls = 0
+
+    async def run(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        self.calls += 1
+        await asyncio.sleep(self.latency_seconds)
+        return currency_agent.convert_currency_tool(**args)
+
+
+async def _call_tool(tool: CountingTool, args: Dict[str, Any]) -> Dict[str, Any]:
+    # Mirrors ADK's order: before callback, tool (unless short-circuited), then the
+    # after callback, which ADK also runs on a short-circuited result.
+    tool_context = SimpleNamespace(state={})
+    response = await currency_agent.before_tool_callback_cache(tool, args, tool_context)
+    if response is None:
+        response = await tool.run(args)
+    return await currency_agent.after_tool_callback_format_and_cache(
+        tool, args, tool_context, response
+    )
+
+
+async def run_harness(num_requests: int, latency_seconds: float) -> None:
+    currency_agent.TOOL_RESULT_CACHE.clear()
+    tool = CountingTool(latency_seconds)
+    args = {"amount": 100, "from_currency": "USD", "to_currency": "EUR"}
+
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(_call_tool(tool, dict(args)) for _ in range(num_requests))
+    )
+    elapsed = time.perf_counter() - start
+
+    assert len(results) == num_requests
+    assert tool.calls == 1, f"Expected 1 tool execution, got {tool.calls}"
+    assert len(currency_agent.IN_FLIGHT_TOOL_CALLS) == 0
+    print(
+        f"\n[HARNESS] {num_requests} concurrent requests -> {tool.calls} tool execution "
+        f"in {elapsed * 1000:.1f} ms."
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.2)
+    cli_args = parser.parse_args()
+    asyncio.run(run_harness(cli_args.requests, cli_args.latency))
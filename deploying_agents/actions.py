@@ -1,32 +1,263 @@
+import threading
 import time
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple
 
+from bulk_delete import BulkSessionDeleter
 from google.api_core import exceptions
+from streaming import EventFilter, StreamStats, astream_events, stream_events
 from vertexai import agent_engines
 
 
+class DeploymentClient:
+    """Session operations on Agent Engine deployments through cached handles.
+
+    Each deployment is resolved with `agent_engines.get` once and its handle
+    reused for `ttl_seconds` (0 disables the cache); `list_deployments` fills
+    the cache as well. `get_session` polls until a freshly created session
+    is visible, backing off exponentially from `poll_initial_seconds` up to
+    `poll_max_seconds`, and gives up after `ready_timeout_seconds`.
+    """
+
+    def __init__(
+        self,
+        engines: Any = None,
+        ttl_seconds: float = 300.0,
+        ready_timeout_seconds: float = 10.0,
+        poll_initial_seconds: float = 0.1,
+        poll_max_seconds: float = 2.0,
+    ) -> None:
+        self._engines = engines
+        self.ttl_seconds = ttl_seconds
+        self.ready_timeout_seconds = ready_timeout_seconds
+        self.poll_initial_seconds = poll_initial_seconds
+        self.poll_max_seconds = poll_max_seconds
+        # resource_id -> (expiry on the monotonic clock, deployment handle)
+        self._handles: Dict[str, Tuple[float, Any]] = {}
+        self._handles_engines: Any = None
+        self._lock = threading.Lock()
+
+    @property
+    def engines(self) -> Any:
+        # Looked up on every call so that a swapped `actions.agent_engines` is honoured.
+        return self._engines if self._engines is not None else agent_engines
+
+    def _handles_for(self, engines: Any) -> Dict[str, Tuple[float, Any]]:
+        # Handles from another backend are meaningless; callers hold self._lock.
+        if self._handles_engines is not engines:
+            self._handles.clear()
+            self._handles_engines = engines
+        return self._handles
+
+    def _cache(self, engines: Any, resource_id: str, deployment: Any) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._handles_for(engines)[resource_id] = (
+                time.monotonic() + self.ttl_seconds,
+                deployment,
+            )
+
+    def deployment(self, resource_id: str) -> Any:
+        """Returns the deployment handle, calling `agent_engines.get` only on a cache miss."""
+        engines = self.engines
+        with self._lock:
+            cached = self._handles_for(engines).get(resource_id)
+            if cached is not None and cached[0] > time.monotonic():
+                return cached[1]
+        deployment = engines.get(resource_id)
+        self._cache(engines, resource_id, deployment)
+        return deployment
+
+    def invalidate(self, resource_id: Optional[str] = None) -> None:
+        """Drops one cached handle, or all of them."""
+        with self._lock:
+            if resource_id is None:
+                self._handles.clear()
+            else:
+                self._handles.pop(resource_id, None)
+
+    def wait_for_session(self, deployment: Any, user_id: str, session_id: str) -> Dict[str, Any]:
+        """Returns the session as soon as it is visible; raises NotFound on timeout."""
+        deadline = time.monotonic() + self.ready_timeout_seconds
+        delay = self.poll_initial_seconds
+        while True:
+            try:
+                return deployment.get_session(user_id=user_id, session_id=session_id)
+            except exceptions.NotFound:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, self.poll_max_seconds)
+
+    def list_deployments(self) -> List[Any]:
+        """Lists all deployments and caches their handles."""
+        engines = self.engines
+        try:
+            deployments = list(engines.list())  # Convert generator to list immediately
+            if not deployments:
+                print("No deployments found.")
+                return []
+
+            print("Deployments:")
+            for deployment in deployments:
+                print(f"- {deployment.resource_name}")
+                self._cache(engines, deployment.resource_name, deployment)
+
+            return deployments
+        except exceptions.GoogleAPIError as e:
+            print(f"Error listing deployments: {e}")
+            return []
+
+    def create_session(self, resource_id: str, user_id: str) -> Optional[Dict[str, Any]]:
+        """Creates a new session, or returns None if an error occurs."""
+        try:
+            session = self.deployment(resource_id).create_session(user_id=user_id)
+            print(f"Session created: {session}")
+            return session
+        except exceptions.GoogleAPIError as e:
+            print(f"Error creating session: {e}")
+            return None
+
+    def list_sessions(self, resource_id: str, user_id: str) -> List[Any]:
+        """Lists the user's sessions, or returns an empty list if an error occurs."""
+        try:
+            sessions = self.deployment(resource_id).list_sessions(user_id=user_id)
+            print(f"Sessions for user {user_id}:")
+            for session in sessions["sessions"]:
+                print(f"- {session}")
+            return list(sessions["sessions"])  # Convert to list to ensure we have a concrete list
+        except exceptions.GoogleAPIError as e:
+            print(f"Error listing sessions: {e}")
+            return []
+
+    def get_session(
+        self, resource_id: str, user_id: str, session_id: str
+    ) -> Optional[Dict[str, Any]]:
+        """Gets a session once it is visible, or returns None if an error occurs."""
+        try:
+            session = self.wait_for_session(self.deployment(resource_id), user_id, session_id)
+            print(f"Session {session_id} details: {session}")
+            return session
+        except exceptions.GoogleAPIError as e:
+            print(f"Error getting session {session_id}: {e}")
+            return None
+
+    def send_message(
+        self, resource_id: str, user_id: str, session_id: str, message: str
+    ) -> List[Any]:
+        """Sends a message and returns all response events, or [] if an error occurs."""
+        events: List[Any] = []
+
+        def collect(event: Any) -> None:
+            print(f"Response event: {event}")
+            events.append(event)
+
+        print(f"Sending message: '{message}'")
+        if self.stream_message(resource_id, user_id, session_id, message, collect) is None:
+            return []
+        if not events:
+            print("No response events received from the agent.")
+        return events
+
+    def iter_message(
+        self,
+        resource_id: str,
+        user_id: str,
+        session_id: str,
+        message: str,
+        event_filter: Optional[EventFilter] = None,
+        stats: Optional[StreamStats] = None,
+    ) -> Iterator[Any]:
+        """Yields the response events as they arrive, without keeping them."""
+        deployment = self.deployment(resource_id)
+        return stream_events(
+            deployment.stream_query(user_id=user_id, session_id=session_id, message=message),
+            event_filter,
+            stats,
+        )
+
+    def astream_message(
+        self,
+        resource_id: str,
+        user_id: str,
+        session_id: str,
+        message: str,
+        event_filter: Optional[EventFilter] = None,
+        stats: Optional[StreamStats] = None,
+        max_buffered: int = 64,
+    ) -> AsyncIterator[Any]:
+        """Async iterator over the response events, with at most `max_buffered` in flight."""
+
+        def start_stream() -> Iterator[Any]:
+            deployment = self.deployment(resource_id)
+            return deployment.stream_query(user_id=user_id, session_id=session_id, message=message)
+
+        return astream_events(start_stream, event_filter, stats, max_buffered)
+
+    def stream_message(
+        self,
+        resource_id: str,
+        user_id: str,
+        session_id: str,
+        message: str,
+        on_event: Callable[[Any], None],
+        event_filter: Optional[EventFilter] = None,
+    ) -> Optional[StreamStats]:
+        """Passes each response event to `on_event` as it arrives.
+
+        Returns the stream's StreamStats, or None if an error occurs.
+        """
+        stats = StreamStats()
+        try:
+            for item in self.iter_message(
+                resource_id, user_id, session_id, message, event_filter, stats
+            ):
+                on_event(item)
+            return stats
+        except exceptions.GoogleAPIError as e:
+            print(f"Error sending message to session {session_id}: {e}")
+            return None
+
+    def delete_session(self, resource_id: str, user_id: str, session_id: str) -> Optional[Any]:
+        """Deletes a session and returns the response, or None if an error occurs."""
+        try:
+            response = self.deployment(resource_id).delete_session(
+                user_id=user_id, session_id=session_id
+            )
+            print(f"Session {session_id} deleted: {response}")
+            return response
+        except exceptions.GoogleAPIError as e:
+            print(f"Error deleting session {session_id}: {e}")
+            return None
+
+    def delete_all_sessions(self, resource_id: str, user_id: str, workers: int = 16) -> int:
+        """Deletes all of the user's sessions in parallel and returns how many were deleted."""
+        # Resolves the deployment through this client's handle cache.
+        deleter = BulkSessionDeleter(
+            engines=self.engines, workers=workers, get_deployment=self.deployment
+        )
+        report = deleter.delete_sessions([resource_id], [user_id])
+        for error in report.errors:
+            print(f"Error deleting session: {error}")
+        print(
+            f"Deleted {report.deleted} sessions for user {user_id} in {report.seconds:.1f}s "
+            f"({report.failed} failed, {report.retries} retries)"
+        )
+        return report.deleted
+
+
+# Shared by the functions below, so that they reuse deployment handles too.
+default_client = DeploymentClient()
+
+
 def list_deployments() -> List[Any]:
     """Lists all deployments.
 
     Returns:
         List of deployments, or empty list if none found or error occurs
     """
-    try:
-        deployments = list(
-            agent_engines.list()
-        )  # Convert generator to list immediately
-        if not deployments:
-            print("No deployments found.")
-            return []
-
-        print("Deployments:")
-        for deployment in deployments:
-            print(f"- {deployment.resource_name}")
-
-        return deployments
-    except exceptions.GoogleAPIError as e:
-        print(f"Error listing deployments: {e}")
-        return []
+    return default_client.list_deployments()
 
 
 def create_session(resource_id: str, user_id: str) -> Optional[Dict[str, Any]]:
@@ -39,14 +270,7 @@ def create_session(resource_id: str, user_id: str) -> Optional[Dict[str, Any]]:
     Returns:
         The created session or None if an error occurs
     """
-    try:
-        deployment = agent_engines.get(resource_id)
-        session = deployment.create_session(user_id=user_id)
-        print(f"Session created: {session}")
-        return session
-    except exceptions.GoogleAPIError as e:
-        print(f"Error creating session: {e}")
-        return None
+    return default_client.create_session(resource_id, user_id)
 
 
 def list_sessions(resource_id: str, user_id: str) -> List[Any]:
@@ -59,18 +283,7 @@ def list_sessions(resource_id: str, user_id: str) -> List[Any]:
     Returns:
         List of sessions or empty list if an error occurs
     """
-    try:
-        deployment = agent_engines.get(resource_id)
-        sessions = deployment.list_sessions(user_id=user_id)
-        print(f"Sessions for user {user_id}:")
-        for session in sessions["sessions"]:
-            print(f"- {session}")
-        return list(
-            sessions["sessions"]
-        )  # Convert to list to ensure we have a concrete list
-    except exceptions.GoogleAPIError as e:
-        print(f"Error listing sessions: {e}")
-        return []
+    return default_client.list_sessions(resource_id, user_id)
 
 
 def get_session(
@@ -85,17 +298,12 @@ def get_session(
 
     Returns:
         The session information or None if an error occurs
+
+    Note:
+        A session that was just created may not be visible yet; this polls
+        with exponential backoff until it is, instead of sleeping a fixed time.
     """
-    try:
-        deployment = agent_engines.get(resource_id)
-        # Add a small delay to allow the session to be fully initialized
-        time.sleep(1)
-        session = deployment.get_session(user_id=user_id, session_id=session_id)
-        print(f"Session {session_id} details: {session}")
-        return session
-    except exceptions.GoogleAPIError as e:
-        print(f"Error getting session {session_id}: {e}")
-        return None
+    return default_client.get_session(resource_id, user_id, session_id)
 
 
 def send_message(
@@ -115,26 +323,38 @@ def send_message(
     Note:
         If the agent doesn't respond to the message, no events will be printed.
         This is normal behavior if the agent is not configured to respond to messages.
+        Every event is printed and kept; for long runs use stream_message,
+        which hands events to a callback as they arrive and keeps none.
     """
-    try:
-        deployment = agent_engines.get(resource_id)
-        print(f"Sending message: '{message}'")
-        events = []
-        for event in deployment.stream_query(
-            user_id=user_id,
-            session_id=session_id,
-            message=message,
-        ):
-            print(f"Response event: {event}")
-            events.append(event)
+    return default_client.send_message(resource_id, user_id, session_id, message)
 
-        if not events:
-            print("No response events received from the agent.")
 
-        return events
-    except exceptions.GoogleAPIError as e:
-        print(f"Error sending message to session {session_id}: {e}")
-        return []
+def stream_message(
+    resource_id: str,
+    user_id: str,
+    session_id: str,
+    message: str,
+    on_event: Callable[[Any], None],
+    event_filter: Optional[EventFilter] = None,
+) -> Optional[StreamStats]:
+    """Streams the reply to a message into a callback.
+
+    Args:
+        resource_id: The ID of the resource/deployment
+        user_id: The ID of the user
+        session_id: The ID of the session
+        message: The message to send
+        on_event: Called with each event (or filtered item) as it arrives
+        event_filter: Optional filter, e.g. streaming.final_response or
+            streaming.TextDeltas()
+
+    Returns:
+        Event counts, time to first event and total stream time, or None if
+        an error occurs
+    """
+    return default_client.stream_message(
+        resource_id, user_id, session_id, message, on_event, event_filter
+    )
 
 
 def delete_session(resource_id: str, user_id: str, session_id: str) -> Optional[Any]:
@@ -148,72 +368,21 @@ def delete_session(resource_id: str, user_id: str, session_id: str) -> Optional[
     Returns:
         The deletion response or None if an error occurs
     """
-    try:
-        deployment = agent_engines.get(resource_id)
-        response = deployment.delete_session(user_id=user_id, session_id=session_id)
-        print(f"Session {session_id} deleted: {response}")
-        return response
-    except exceptions.GoogleAPIError as e:
-        print(f"Error deleting session {session_id}: {e}")
-        return None
+    return default_client.delete_session(resource_id, user_id, session_id)
 
 
-def delete_all_sessions(resource_id: str, user_id: str) -> int:
+def delete_all_sessions(resource_id: str, user_id: str, workers: int = 16) -> int:
     """Deletes all sessions for a specific user.
 
+    Sessions are deleted in parallel through BulkSessionDeleter, which
+    retries transient API errors.
+
     Args:
         resource_id: The ID of the resource/deployment
         user_id: The ID of the user
+        workers: Number of sessions deleted concurrently
 
     Returns:
         Number of sessions deleted
     """
-    try:
-        deployment = agent_engines.get(resource_id)
-        try:
-            # Get sessions directly from the API to ensure we have the correct format
-            sessions = deployment.list_sessions(user_id=user_id)
-            print(f"Sessions for user {user_id}: {sessions}")
-            sessions_list = list(sessions["sessions"])
-            print(f"Sessions list: {sessions_list}")
-            if not sessions_list:
-                print(f"No sessions found for user {user_id}")
-                return 0
-
-            print(f"Deleting all {len(sessions_list)} sessions for user {user_id}...")
-            deleted_count = 0
-
-            # Try to get session IDs directly from the API response
-            for session in sessions_list:
-                try:
-                    # Handle different possible formats of session objects
-                    session_id = None
-                    if isinstance(session, dict) and "id" in session:
-                        session_id = session["id"]
-                        print(f"Session ID is a dict: {session_id}")
-                    elif isinstance(session, str):
-                        # If session is a string, it might be the session ID itself
-                        session_id = session
-                        print(f"Session ID is a string: {session_id}")
-                    elif hasattr(session, "id"):
-                        # If session is an object with an id attribute
-                        session_id = session.id
-                        print(f"Session ID is an object: {session_id}")
-
-                    if session_id:
-                        delete_session(resource_id, user_id, session_id)
-                        deleted_count += 1
-                    else:
-                        print(f"Could not determine session ID for: {session}")
-                except Exception as e:
-                    print(f"Error deleting session: {e}")
-                    continue
-
-            print(f"Deleted {deleted_count} sessions for user {user_id}")
-            return deleted_count
-        except Exception as e:
-            print(f"Error listing sessions for deletion: {e}")
-            return 0
-    except exceptions.GoogleAPIError as e:
-        print(f"Error accessing deployment for session deletion: {e}")
-        return 0
+    return default_client.delete_all_sessions(resource_id, user_id, workers)
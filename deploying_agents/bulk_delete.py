@@ -0,0 +1,243 @@
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from google.api_core import exceptions
+from vertexai import agent_engines
+
+# Errors worth retrying: throttling, overload and timeouts.
+TRANSIENT_ERRORS = (
+    exceptions.TooManyRequests,
+    exceptions.ServiceUnavailable,
+    exceptions.InternalServerError,
+    exceptions.DeadlineExceeded,
+)
+
+
+def session_id_of(session: Any) -> Optional[str]:
+    """Returns the ID of a session as returned by list_sessions (dict, str or object)."""
+    if isinstance(session, dict):
+        return session.get("id")
+    if isinstance(session, str):
+        return session
+    return getattr(session, "id", None)
+
+
+class RateLimiter:
+    """A thread-safe token bucket: at most `rate_per_second` acquisitions per second."""
+
+    def __init__(self, rate_per_second: float, burst: int = 1) -> None:
+        self.interval = 1.0 / rate_per_second if rate_per_second > 0 else 0.0
+        self.burst = burst
+        self._next_free = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            # Unused capacity accumulates up to `burst` requests.
+            start = max(self._next_free, now - self.interval * (self.burst - 1))
+            self._next_free = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+class Checkpoint:
+    """An append-only JSONL record of finished work, so an interrupted cleanup can resume."""
+
+    def __init__(self, path: Optional[str]) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self.deleted_sessions: Set[Tuple[str, str, str]] = set()
+        self.deleted_deployments: Set[str] = set()
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as checkpoint_file:
+                for line in checkpoint_file:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # A line cut short by an interruption.
+                    if "session_id" in record:
+                        self.deleted_sessions.add(
+                            (record["resource_id"], record["user_id"], record["session_id"])
+                        )
+                    else:
+                        self.deleted_deployments.add(record["resource_id"])
+
+    def _append(self, record: Dict[str, str]) -> None:
+        if not self.path:
+            return
+        with self._lock, open(self.path, "a", encoding="utf-8") as checkpoint_file:
+            checkpoint_file.write(json.dumps(record) + "\n")
+
+    def session_deleted(self, resource_id: str, user_id: str, session_id: str) -> None:
+        self.deleted_sessions.add((resource_id, user_id, session_id))
+        self._append({"resource_id": resource_id, "user_id": user_id, "session_id": session_id})
+
+    def deployment_deleted(self, resource_id: str) -> None:
+        self.deleted_deployments.add(resource_id)
+        self._append({"resource_id": resource_id})
+
+    def remove(self) -> None:
+        """Deletes the checkpoint file once its run has finished."""
+        if self.path:
+            with self._lock:
+                try:
+                    os.remove(self.path)
+                except FileNotFoundError:
+                    pass
+
+
+@dataclass
+class BulkDeleteReport:
+    deleted: int = 0
+    skipped: int = 0
+    failed: int = 0
+    retries: int = 0
+    seconds: float = 0.0
+    errors: List[str] = field(default_factory=list)
+    # Deployments with a session that could not be listed or deleted.
+    failed_deployments: Set[str] = field(default_factory=set)
+
+
+class BulkSessionDeleter:
+    """Deletes every session of the given users across one or more deployments.
+
+    Each deployment handle is resolved once with `get_deployment` (by
+    default `engines.get`). Deletions run on a pool of `workers` threads,
+    throttled to `rate_per_second` requests across all of them. Transient
+    errors (TRANSIENT_ERRORS) are retried up to `retries` times with
+    jittered exponential backoff; a session that is already gone counts as
+    deleted. Any other error is recorded in the report against its
+    deployment, and the remaining deployments are still processed. With
+    `checkpoint_path` every deleted session and deployment is recorded, and
+    a rerun skips them.
+    """
+
+    def __init__(
+        self,
+        engines: Any = agent_engines,
+        workers: int = 16,
+        rate_per_second: float = 20.0,
+        retries: int = 5,
+        backoff_base_seconds: float = 0.5,
+        backoff_max_seconds: float = 30.0,
+        checkpoint_path: Optional[str] = None,
+        get_deployment: Optional[Callable[[str], Any]] = None,
+    ) -> None:
+        self.engines = engines
+        self.get_deployment = get_deployment or engines.get
+        self.workers = workers
+        self.rate_limiter = RateLimiter(rate_per_second, burst=workers)
+        self.retries = retries
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self.checkpoint = Checkpoint(checkpoint_path)
+        self._deployments: Dict[str, Any] = {}
+        self._report_lock = threading.Lock()
+
+    def _call(self, report: BulkDeleteReport, function, *args, **kwargs) -> Any:
+        attempt = 0
+        while True:
+            self.rate_limiter.acquire()
+            try:
+                return function(*args, **kwargs)
+            except TRANSIENT_ERRORS:
+                if attempt >= self.retries:
+                    raise
+            attempt += 1
+            with self._report_lock:
+                report.retries += 1
+            time.sleep(
+                random.uniform(
+                    0, min(self.backoff_max_seconds, self.backoff_base_seconds * 2**attempt)
+                )
+            )
+
+    def deployment(self, resource_id: str, report: BulkDeleteReport) -> Any:
+        if resource_id not in self._deployments:
+            self._deployments[resource_id] = self._call(report, self.get_deployment, resource_id)
+        return self._deployments[resource_id]
+
+    def _delete_one(
+        self,
+        deployment: Any,
+        resource_id: str,
+        user_id: str,
+        session_id: str,
+        report: BulkDeleteReport,
+    ) -> None:
+        try:
+            self._call(report, deployment.delete_session, user_id=user_id, session_id=session_id)
+        except exceptions.NotFound:
+            pass  # Deleted by an earlier, interrupted run.
+        except exceptions.GoogleAPIError as e:
+            self._record_failure(report, resource_id, f"{resource_id} {user_id} {session_id}: {e}")
+            return
+        self.checkpoint.session_deleted(resource_id, user_id, session_id)
+        with self._report_lock:
+            report.deleted += 1
+
+    def delete_sessions(
+        self, resource_ids: Iterable[str], user_ids: Iterable[str]
+    ) -> BulkDeleteReport:
+        report = BulkDeleteReport()
+        start = time.perf_counter()
+        user_ids = list(user_ids)
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for resource_id in resource_ids:
+                if resource_id in self.checkpoint.deleted_deployments:
+                    continue
+                try:
+                    deployment = self.deployment(resource_id, report)
+                except exceptions.GoogleAPIError as e:
+                    self._record_failure(report, resource_id, f"{resource_id}: {e}")
+                    continue
+                for user_id in user_ids:
+                    try:
+                        listed = self._call(report, deployment.list_sessions, user_id=user_id)
+                    except exceptions.GoogleAPIError as e:
+                        self._record_failure(report, resource_id, f"{resource_id} {user_id}: {e}")
+                        continue
+                    for session in listed["sessions"]:
+                        session_id = session_id_of(session)
+                        if session_id is None:
+                            self._record_failure(
+                                report, resource_id, f"No session ID in {session!r}"
+                            )
+                        elif (resource_id, user_id, session_id) in self.checkpoint.deleted_sessions:
+                            report.skipped += 1
+                        else:
+                            pool.submit(
+                                self._delete_one,
+                                deployment,
+                                resource_id,
+                                user_id,
+                                session_id,
+                                report,
+                            )
+        report.seconds = time.perf_counter() - start
+        return report
+
+    def _record_failure(self, report: BulkDeleteReport, resource_id: str, error: str) -> None:
+        with self._report_lock:
+            report.failed += 1
+            report.errors.append(error)
+            report.failed_deployments.add(resource_id)
+
+    def delete_deployment(self, resource_id: str, report: BulkDeleteReport) -> None:
+        if resource_id in self.checkpoint.deleted_deployments:
+            return
+        try:
+            self._call(report, self.engines.delete, resource_id)
+        except exceptions.NotFound:
+            pass
+        self.checkpoint.deployment_deleted(resource_id)
+        self._deployments.pop(resource_id, None)
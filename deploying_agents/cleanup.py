@@ -1,3 +1,5 @@
+import hashlib
+import json
 import os
 import sys
 
@@ -7,13 +9,19 @@ from dotenv import load_dotenv
 load_dotenv()
 
 import vertexai
-from actions import delete_all_sessions, delete_session, list_deployments
+from actions import list_deployments
+from bulk_delete import BulkSessionDeleter
 from google.api_core import exceptions
 from vertexai import agent_engines
 
 PROJECT_ID = os.environ.get("PROJECT_ID", "multiversity-418607")
 LOCATION = os.environ.get("LOCATION", "us-central1")
 STAGING_BUCKET = os.environ.get("STAGING_BUCKET", "gs://social-posts-agent-test-1")
+# Progress is recorded here (by default in a file named after the run); rerunning
+# after an interruption skips finished work. The file is removed once all is deleted.
+CHECKPOINT_PATH = os.environ.get("CLEANUP_CHECKPOINT")
+CLEANUP_WORKERS = int(os.environ.get("CLEANUP_WORKERS", "16"))
+CLEANUP_RATE_PER_SECOND = float(os.environ.get("CLEANUP_RATE_PER_SECOND", "20"))
 
 vertexai.init(
     project=PROJECT_ID,
@@ -21,6 +29,16 @@ vertexai.init(
     staging_bucket=STAGING_BUCKET,
 )
 
+
+def checkpoint_path(resource_ids, user_ids) -> str:
+    """Names the checkpoint after the deployments and users it covers.
+
+    Only a rerun of the same cleanup resumes from it; any other run starts
+    its own file.
+    """
+    run = json.dumps([PROJECT_ID, LOCATION, sorted(resource_ids), sorted(user_ids)])
+    return f".cleanup_checkpoint-{hashlib.sha256(run.encode()).hexdigest()[:12]}.jsonl"
+
 if __name__ == "__main__":
     # Example usage
     print("Listing deployments...")
@@ -31,16 +49,40 @@ if __name__ == "__main__":
         print("No deployments found. Exiting.")
         sys.exit(1)
 
-    for remote_app in deployments:
-        resource_id = remote_app.resource_name
-        USER_ID = "123"
+    USER_ID = "123"
+    resource_ids = [remote_app.resource_name for remote_app in deployments]
+    deleter = BulkSessionDeleter(
+        engines=agent_engines,
+        workers=CLEANUP_WORKERS,
+        rate_per_second=CLEANUP_RATE_PER_SECOND,
+        checkpoint_path=CHECKPOINT_PATH or checkpoint_path(resource_ids, [USER_ID]),
+    )
 
-        print("\nCleaning up: Deleting all sessions...")
-        delete_all_sessions(resource_id, USER_ID)
+    print("\nCleaning up: Deleting all sessions...")
+    report = deleter.delete_sessions(resource_ids, [USER_ID])
 
-        print("-" * 50)
-        print("All sessions deleted.")
-
-        agent_engines.delete(resource_id)
+    print("-" * 50)
+    print(
+        f"Deleted {report.deleted} sessions in {report.seconds:.1f}s "
+        f"({report.skipped} already deleted, {report.failed} failed, {report.retries} retries)."
+    )
+    for error in report.errors:
+        print(f"- {error}")
 
+    failed = set(report.failed_deployments)
+    for resource_id in resource_ids:
+        if resource_id in failed:
+            print(f"Deployment {resource_id} kept: some of its sessions could not be deleted.")
+            continue
+        try:
+            deleter.delete_deployment(resource_id, report)
+        except exceptions.GoogleAPIError as e:
+            print(f"Error deleting deployment {resource_id}: {e}")
+            failed.add(resource_id)
+            continue
         print(f"Deployment {resource_id} deleted.")
+
+    if failed:
+        print(f"{len(failed)} deployments not cleaned up; rerun to retry them.")
+        sys.exit(1)
+    deleter.checkpoint.remove()
@@ -1,10 +1,12 @@
 import os
+import sys
 
 from dotenv import load_dotenv
 
 load_dotenv()
 
 import vertexai
+from package import BASELINE_REQUIREMENTS, DistributionIndex, plan_package, stage_package
 from social_posts_agent.agent import root_agent
 from vertexai import agent_engines
 from vertexai.preview import reasoning_engines
@@ -12,6 +14,10 @@ from vertexai.preview import reasoning_engines
 PROJECT_ID = os.environ.get("PROJECT_ID", "multiversity-418607")
 LOCATION = os.environ.get("LOCATION", "us-central1")
 STAGING_BUCKET = os.environ.get("STAGING_BUCKET", "gs://social-posts-agent-test-1")
+# Opt in to shipping the planned requirements and a precompiled package (see package.py).
+SLIM_PACKAGE = os.environ.get("SLIM_PACKAGE") == "1"
+# Local directory the slimmed, precompiled agent package is staged in before upload.
+PACKAGE_STAGING_DIR = os.environ.get("PACKAGE_STAGING_DIR", os.path.join("build", "agent_engine"))
 
 vertexai.init(
     project=PROJECT_ID,
@@ -24,24 +30,37 @@ app = reasoning_engines.AdkApp(
     enable_tracing=True,
 )
 
-remote_app = agent_engines.create(
-    agent_engine=app,
-    requirements=[
-        "google-cloud-aiplatform[adk,agent_engines]",
-        "litellm",
-        "pydantic",
-        "python-dotenv",
-    ],
-    env_vars=[
-        "GOOGLE_API_KEY",
-        "OPENAI_API_KEY",
-        "ANTHROPIC_API_KEY",
-        "GOOGLE_GENAI_USE_VERTEXAI",
-        "CLAUDE_MODEL",
-        "OPENAI_MODEL",
-        "GOOGLE_GENAI_MODEL",
-    ],
-    extra_packages=["./social_posts_agent"],
-)
+requirements = BASELINE_REQUIREMENTS
+package_dir = "."
+package = "social_posts_agent"
+if SLIM_PACKAGE:
+    plan = plan_package(f"./{package}", DistributionIndex())
+    if plan.unresolved:
+        sys.exit(f"Imports with no installed distribution: {', '.join(plan.unresolved)}")
+    stage_package(plan, PACKAGE_STAGING_DIR)
+    print(f"Shipping {len(plan.modules)} modules with requirements {plan.requirements}")
+    requirements = plan.requirements
+    package_dir = PACKAGE_STAGING_DIR
+
+# extra_packages keep their relative path in the upload, so create from the package's parent.
+working_dir = os.getcwd()
+os.chdir(package_dir)
+try:
+    remote_app = agent_engines.create(
+        agent_engine=app,
+        requirements=requirements,
+        env_vars=[
+            "GOOGLE_API_KEY",
+            "OPENAI_API_KEY",
+            "ANTHROPIC_API_KEY",
+            "GOOGLE_GENAI_USE_VERTEXAI",
+            "CLAUDE_MODEL",
+            "OPENAI_MODEL",
+            "GOOGLE_GENAI_MODEL",
+        ],
+        extra_packages=[f"./{package}"],
+    )
+finally:
+    os.chdir(working_dir)
 
 print(f"Remote app created: {remote_app.resource_name}")
@@ -0,0 +1,201 @@
+"""A local, in-memory stand-in for `vertexai.agent_engines`.
+
+It implements the calls actions.py makes (list/get/delete on the module,
+create/list/get/delete session and stream_query on a deployment) with the
+same return shapes. It can add latency, fail a fraction of calls with a
+transient ServiceUnavailable, make new sessions visible to get_session
+only after `ready_after_seconds` like the eventually consistent backend,
+and stream each reply as `reply_chunks` partial events. Every call counts
+as one round-trip in `calls`, so scripts can be run and measured offline:
+
+    import actions
+    from fake_agent_engines import FakeAgentEngines
+
+    actions.agent_engines = engines = FakeAgentEngines(latency_seconds=0.05)
+    engines.create_deployment(sessions_per_user={"123": 1000})
+"""
+
+import itertools
+import random
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import Any, Dict, Iterator, List, Optional
+
+from google.api_core import exceptions
+
+
+def _public(session: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: value for key, value in session.items() if not key.startswith("_")}
+
+
+def _model_event(text: str, invocation_id: str, partial: bool = False) -> Dict[str, Any]:
+    event = {
+        "author": "fake_agent",
+        "content": {"role": "model", "parts": [{"text": text}]},
+        "invocation_id": invocation_id,
+        "timestamp": time.time(),
+    }
+    if partial:
+        event["partial"] = True
+    return event
+
+
+class FakeDeployment:
+    def __init__(self, engines: "FakeAgentEngines", resource_name: str) -> None:
+        self._engines = engines
+        self.resource_name = resource_name
+        # user_id -> session_id -> session
+        self._sessions: Dict[str, Dict[str, Dict[str, Any]]] = {}
+
+    def _session(self, user_id: str, session_id: str) -> Dict[str, Any]:
+        session = self._sessions.get(user_id, {}).get(session_id)
+        if session is None:
+            raise exceptions.NotFound(f"Session {session_id} not found.")
+        return session
+
+    def _ready_session(self, user_id: str, session_id: str) -> Dict[str, Any]:
+        session = self._session(user_id, session_id)
+        if time.monotonic() < session.get("_ready_at", 0.0):
+            raise exceptions.NotFound(f"Session {session_id} not found.")
+        return session
+
+    def create_session(self, user_id: str, **kwargs) -> Dict[str, Any]:
+        self._engines._round_trip("create_session")
+        with self._engines._lock:
+            session = {
+                "id": uuid.uuid4().hex,
+                "appName": self.resource_name,
+                "userId": user_id,
+                "state": dict(kwargs.get("state") or {}),
+                "events": [],
+                "lastUpdateTime": time.time(),
+                "_ready_at": time.monotonic() + self._engines.ready_after_seconds,
+            }
+            self._sessions.setdefault(user_id, {})[session["id"]] = session
+        return _public(session)
+
+    def list_sessions(self, user_id: str) -> Dict[str, List[Dict[str, Any]]]:
+        self._engines._round_trip("list_sessions")
+        with self._engines._lock:
+            sessions = [
+                session
+                for session in self._sessions.get(user_id, {}).values()
+                if time.monotonic() >= session.get("_ready_at", 0.0)
+            ]
+        return {"sessions": [dict(_public(session), events=[]) for session in sessions]}
+
+    def get_session(self, user_id: str, session_id: str) -> Dict[str, Any]:
+        self._engines._round_trip("get_session")
+        with self._engines._lock:
+            return _public(self._ready_session(user_id, session_id))
+
+    def stream_query(self, user_id: str, session_id: str, message: str) -> Iterator[Dict[str, Any]]:
+        """Streams a reply echoing `message`, as the deployed agent would.
+
+        With `reply_chunks` > 1 the text first arrives as that many partial
+        events, `chunk_interval_seconds` apart, followed by the final event.
+        """
+        self._engines._round_trip("stream_query")
+        with self._engines._lock:
+            self._ready_session(user_id, session_id)
+        text = f"Echo: {message}"
+        invocation_id = uuid.uuid4().hex
+        chunks = self._engines.reply_chunks
+        if chunks > 1:
+            size = -(-len(text) // chunks)
+            for start in range(0, len(text), size):
+                if start and self._engines.chunk_interval_seconds:
+                    time.sleep(self._engines.chunk_interval_seconds)
+                yield _model_event(text[start : start + size], invocation_id, partial=True)
+        event = _model_event(text, invocation_id)
+        with self._engines._lock:
+            self._ready_session(user_id, session_id)["events"].append(event)
+        yield dict(event)
+
+    def delete_session(self, user_id: str, session_id: str) -> None:
+        self._engines._round_trip("delete_session")
+        with self._engines._lock:
+            self._session(user_id, session_id)
+            del self._sessions[user_id][session_id]
+
+    def session_count(self, user_id: Optional[str] = None) -> int:
+        with self._engines._lock:
+            if user_id is not None:
+                return len(self._sessions.get(user_id, {}))
+            return sum(len(sessions) for sessions in self._sessions.values())
+
+
+class FakeAgentEngines:
+    """Drop-in for the `agent_engines` module used by actions.py and cleanup.py."""
+
+    def __init__(
+        self,
+        latency_seconds: float = 0.0,
+        failure_rate: float = 0.0,
+        seed: int = 0,
+        ready_after_seconds: float = 0.0,
+        reply_chunks: int = 1,
+        chunk_interval_seconds: float = 0.0,
+    ) -> None:
+        self.latency_seconds = latency_seconds
+        self.failure_rate = failure_rate
+        self.ready_after_seconds = ready_after_seconds
+        self.reply_chunks = reply_chunks
+        self.chunk_interval_seconds = chunk_interval_seconds
+        self._random = random.Random(seed)
+        self._lock = threading.RLock()
+        self._ids = itertools.count(1)
+        self._deployments: Dict[str, FakeDeployment] = {}
+        self.calls: Counter = Counter()
+
+    def _round_trip(self, method: str) -> None:
+        with self._lock:
+            self.calls[method] += 1
+            fail = self._random.random() < self.failure_rate
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+        if fail:
+            raise exceptions.ServiceUnavailable(f"{method}: backend temporarily unavailable.")
+
+    def create_deployment(
+        self, sessions_per_user: Optional[Dict[str, int]] = None
+    ) -> FakeDeployment:
+        """Adds a deployment, optionally pre-populated with sessions (not counted as calls)."""
+        with self._lock:
+            resource_name = (
+                f"projects/local/locations/local/reasoningEngines/{next(self._ids)}"
+            )
+            deployment = self._deployments[resource_name] = FakeDeployment(self, resource_name)
+        for user_id, count in (sessions_per_user or {}).items():
+            deployment._sessions[user_id] = {
+                session_id: {"id": session_id, "userId": user_id, "state": {}, "events": []}
+                for session_id in (uuid.uuid4().hex for _ in range(count))
+            }
+        return deployment
+
+    def list(self) -> Iterator[FakeDeployment]:
+        self._round_trip("list")
+        with self._lock:
+            return iter(list(self._deployments.values()))
+
+    def get(self, resource_name: str) -> FakeDeployment:
+        self._round_trip("get")
+        with self._lock:
+            deployment = self._deployments.get(resource_name)
+        if deployment is None:
+            raise exceptions.NotFound(f"Deployment {resource_name} not found.")
+        return deployment
+
+    def delete(self, resource_name: str, force: bool = False, **kwargs) -> None:
+        self._round_trip("delete")
+        with self._lock:
+            deployment = self._deployments.get(resource_name)
+            if deployment is None:
+                raise exceptions.NotFound(f"Deployment {resource_name} not found.")
+            if deployment.session_count() and not force:
+                raise exceptions.FailedPrecondition(
+                    f"Deployment {resource_name} still has sessions; pass force=True."
+                )
+            del self._deployments[resource_name]
@@ -0,0 +1,323 @@
+"""Load test for a deployed agent.
+
+Creates --sessions sessions spread over --users users, then sends
+--requests messages to them and reports throughput, latency and time to
+first event percentiles, and errors. Each session has at most one message
+in flight, like a real conversation.
+
+- closed loop (default): --concurrency workers each send their next
+  message as soon as the previous reply has finished streaming
+- open loop (--rate): messages arrive at a fixed rate whether or not
+  earlier replies are done. Latency is measured from the scheduled arrival,
+  so time spent waiting for a free session counts.
+
+Run against the first deployment (or --resource-id), or offline with
+--fake, which uses the in-memory fake_agent_engines backend:
+
+    python load_test.py --sessions 20 --users 5 --requests 200 --concurrency 10
+    python load_test.py --fake --rate 50 --requests 500 --json load.json
+"""
+
+import argparse
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+from actions import DeploymentClient
+from bulk_delete import TRANSIENT_ERRORS
+from google.api_core import exceptions
+from streaming import StreamStats
+
+PROJECT_ID = os.environ.get("PROJECT_ID", "multiversity-418607")
+LOCATION = os.environ.get("LOCATION", "us-central1")
+STAGING_BUCKET = os.environ.get("STAGING_BUCKET", "gs://social-posts-agent-test-1")
+DEFAULT_MESSAGE = "Create a post for what's new in Angular v20?"
+
+
+def percentile(values: Sequence[float], fraction: float) -> Optional[float]:
+    """Nearest-rank percentile of `values` (None if empty)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))]
+
+
+def with_retries(function: Callable[..., Any], *args, attempts: int = 3, **kwargs) -> Any:
+    """Calls `function`, retrying TRANSIENT_ERRORS with exponential backoff (setup only)."""
+    for attempt in range(attempts):
+        try:
+            return function(*args, **kwargs)
+        except TRANSIENT_ERRORS:
+            if attempt == attempts - 1:
+                raise
+            time.sleep(0.5 * 2**attempt)
+
+
+@dataclass
+class LoadTestReport:
+    mode: str
+    sessions: int
+    requests: int = 0
+    succeeded: int = 0
+    seconds: float = 0.0
+    latencies: List[float] = field(default_factory=list)
+    first_event_latencies: List[float] = field(default_factory=list)
+    errors: Counter = field(default_factory=Counter)
+
+    @property
+    def throughput(self) -> float:
+        return self.succeeded / self.seconds if self.seconds else 0.0
+
+    @property
+    def error_rate(self) -> float:
+        return (self.requests - self.succeeded) / self.requests if self.requests else 0.0
+
+    def summary(self) -> Dict[str, object]:
+        def percentiles(values: List[float]) -> Dict[str, Optional[float]]:
+            return {
+                name: percentile(values, fraction)
+                for name, fraction in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99), ("max", 1.0))
+            }
+
+        return {
+            "mode": self.mode,
+            "sessions": self.sessions,
+            "requests": self.requests,
+            "succeeded": self.succeeded,
+            "seconds": self.seconds,
+            "throughput_per_second": self.throughput,
+            "error_rate": self.error_rate,
+            "errors": dict(self.errors),
+            "latency_seconds": percentiles(self.latencies),
+            "time_to_first_event_seconds": percentiles(self.first_event_latencies),
+        }
+
+
+class LoadTest:
+    """Drives messages through a DeploymentClient and collects a LoadTestReport."""
+
+    def __init__(
+        self,
+        client: DeploymentClient,
+        resource_id: str,
+        message: str = DEFAULT_MESSAGE,
+    ) -> None:
+        self.client = client
+        self.resource_id = resource_id
+        self.message = message
+        self._lock = threading.Lock()
+
+    def create_sessions(self, sessions: int, users: int, workers: int) -> List[Tuple[str, str]]:
+        """Creates sessions round-robin over `users` users; returns (user_id, session_id) pairs."""
+        deployment = with_retries(self.client.deployment, self.resource_id)
+
+        def create(index: int) -> Tuple[str, str]:
+            user_id = f"load-test-user-{index % users}"
+            session_id = with_retries(deployment.create_session, user_id=user_id)["id"]
+            with_retries(self.client.wait_for_session, deployment, user_id, session_id)
+            return user_id, session_id
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(create, range(sessions)))
+
+    def delete_sessions(self, sessions: List[Tuple[str, str]], workers: int) -> None:
+        deployment = with_retries(self.client.deployment, self.resource_id)
+
+        def delete(session: Tuple[str, str]) -> None:
+            try:
+                with_retries(deployment.delete_session, user_id=session[0], session_id=session[1])
+            except exceptions.GoogleAPIError as e:
+                print(f"Error deleting session {session[1]}: {e}")
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(delete, sessions))
+
+    def _send(
+        self, idle: "queue.Queue[Tuple[str, str]]", report: LoadTestReport, started: float
+    ) -> None:
+        """Sends one message on the next idle session; latency counts from `started`."""
+        user_id, session_id = idle.get()
+        stats = StreamStats()
+        error = None
+        try:
+            for _ in self.client.iter_message(
+                self.resource_id, user_id, session_id, self.message, stats=stats
+            ):
+                pass  # Events are only counted.
+        except exceptions.GoogleAPIError as e:
+            error = type(e).__name__
+        finally:
+            idle.put((user_id, session_id))
+        finished = time.perf_counter()
+        with self._lock:
+            report.requests += 1
+            if error:
+                report.errors[error] += 1
+                return
+            report.succeeded += 1
+            report.latencies.append(finished - started)
+            if stats.time_to_first_event is not None:
+                # Includes any wait for a session, like the latency.
+                report.first_event_latencies.append(
+                    finished - started - stats.total_seconds + stats.time_to_first_event
+                )
+
+    def run_closed(
+        self, sessions: List[Tuple[str, str]], requests: int, concurrency: int
+    ) -> LoadTestReport:
+        report = LoadTestReport(mode=f"closed loop, {concurrency} workers", sessions=len(sessions))
+        idle: queue.Queue = queue.Queue()
+        for session in sessions:
+            idle.put(session)
+        claimed = [0]
+
+        def worker() -> None:
+            while True:
+                with self._lock:
+                    if claimed[0] >= requests:
+                        return
+                    claimed[0] += 1
+                self._send(idle, report, time.perf_counter())
+
+        start = time.perf_counter()
+        threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        report.seconds = time.perf_counter() - start
+        return report
+
+    def run_open(
+        self, sessions: List[Tuple[str, str]], requests: int, rate_per_second: float
+    ) -> LoadTestReport:
+        report = LoadTestReport(mode=f"open loop, {rate_per_second:g}/s", sessions=len(sessions))
+        idle: queue.Queue = queue.Queue()
+        for session in sessions:
+            idle.put(session)
+        start = time.perf_counter()
+        # One thread per session is enough: a request without a free session waits anyway.
+        with ThreadPoolExecutor(max_workers=len(sessions)) as pool:
+            for index in range(requests):
+                scheduled = start + index / rate_per_second
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                pool.submit(self._send, idle, report, scheduled)
+        report.seconds = time.perf_counter() - start
+        return report
+
+
+def print_report(report: LoadTestReport) -> None:
+    summary = report.summary()
+
+    def row(name: str, values: Dict[str, Optional[float]]) -> str:
+        cells = " ".join(
+            f"{key} {'-' if value is None else f'{value * 1e3:.0f}ms'}"
+            for key, value in values.items()
+        )
+        return f"{name:<20} {cells}"
+
+    print("-" * 50)
+    print(f"Mode:                {report.mode}")
+    print(f"Sessions:            {report.sessions}")
+    print(f"Requests:            {report.requests} in {report.seconds:.1f}s")
+    print(f"Throughput:          {report.throughput:.1f} replies/s")
+    errors = f" {dict(report.errors)}" if report.errors else ""
+    print(f"Error rate:          {report.error_rate:.1%}{errors}")
+    print(row("Latency:", summary["latency_seconds"]))
+    print(row("Time to first event:", summary["time_to_first_event_seconds"]))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test a deployed agent.")
+    parser.add_argument("--resource-id", help="Deployment to test (default: the first one).")
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--users", type=int, default=5)
+    parser.add_argument("--requests", type=int, default=100, help="Messages to send in total.")
+    parser.add_argument("--concurrency", type=int, default=10, help="Closed-loop workers.")
+    parser.add_argument("--rate", type=float, help="Open-loop arrivals per second.")
+    parser.add_argument("--message", default=DEFAULT_MESSAGE)
+    parser.add_argument("--keep-sessions", action="store_true")
+    parser.add_argument("--json", help="Also write the summary here.")
+    parser.add_argument("--fake", action="store_true", help="Use the offline fake backend.")
+    parser.add_argument("--fake-latency-ms", type=float, default=50.0)
+    parser.add_argument("--fake-fail-rate", type=float, default=0.0)
+    parser.add_argument("--fake-chunks", type=int, default=5, help="Partial events per reply.")
+    parser.add_argument("--fake-chunk-ms", type=float, default=20.0)
+    args = parser.parse_args()
+    for name in ("sessions", "users", "concurrency"):
+        if getattr(args, name) < 1:
+            parser.error(f"--{name} must be at least 1")
+    if args.requests < 0:
+        parser.error("--requests must not be negative")
+    if args.rate is not None and args.rate <= 0:
+        parser.error("--rate must be positive")
+
+    if args.fake:
+        from fake_agent_engines import FakeAgentEngines
+
+        engines = FakeAgentEngines(
+            latency_seconds=args.fake_latency_ms / 1000,
+            failure_rate=args.fake_fail_rate,
+            reply_chunks=args.fake_chunks,
+            chunk_interval_seconds=args.fake_chunk_ms / 1000,
+        )
+        engines.create_deployment()
+        client = DeploymentClient(engines=engines)
+    else:
+        import vertexai
+
+        vertexai.init(project=PROJECT_ID, location=LOCATION, staging_bucket=STAGING_BUCKET)
+        client = DeploymentClient()
+
+    resource_id = args.resource_id
+    if resource_id is None:
+        deployments = client.list_deployments()
+        if not deployments:
+            print("No deployments found. Exiting.")
+            sys.exit(1)
+        resource_id = deployments[0].resource_name
+
+    load_test = LoadTest(client, resource_id, args.message)
+    setup_workers = min(args.sessions, 16)
+    print(f"\nCreating {args.sessions} sessions for {args.users} users...")
+    try:
+        sessions = load_test.create_sessions(args.sessions, args.users, setup_workers)
+    except exceptions.GoogleAPIError as e:
+        print(f"Error creating sessions: {e}")
+        sys.exit(1)
+
+    print(f"Sending {args.requests} messages...")
+    try:
+        if args.rate:
+            report = load_test.run_open(sessions, args.requests, args.rate)
+        else:
+            report = load_test.run_closed(sessions, args.requests, args.concurrency)
+    finally:
+        if not args.keep_sessions:
+            load_test.delete_sessions(sessions, setup_workers)
+
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as json_file:
+            json.dump(dict(report.summary(), resource_id=resource_id), json_file, indent=2)
+        print(f"\nWrote the summary to {args.json}")
+    if report.requests and report.error_rate == 1.0:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,461 @@
+"""Slim packaging for Agent Engine deployments.
+
+Reads the agent package's imports with `ast` (nothing is imported) and
+derives what has to ship:
+
+- modules: only the package's .py files reachable from agent.py and
+  __init__.py; caches, .env files and unused modules stay behind
+- requirements: the distributions those imports come from, looked up in
+  the local installation's metadata. Third-party modules the agent imports
+  are scanned one level further for module-level imports of optional
+  dependencies (google.adk.models.lite_llm needs litellm, which google-adk
+  does not require). Distributions the package imports itself are always
+  listed; ones only that scan finds are listed when the other requirements
+  do not already pull them in. A distribution that an extra of the runtime
+  requirement provides is requested through that extra, as long as the
+  extra brings in nothing else the agent does not use.
+
+The package is copied to a local staging directory and compiled to
+bytecode there, when the target Python version (the one
+agent_engines.create requests, i.e. the local one, unless
+--python-version says otherwise) matches this interpreter. A report
+compares the installed size of the requirement closure, the package size
+and the cold import time of `root_agent` with the previous packaging.
+Everything runs offline.
+
+This is a report: deploy.py ships the full requirement list unless
+SLIM_PACKAGE=1 is set. For social_posts_agent the closure is the same
+either way (google-cloud-aiplatform[adk] already installs everything), so
+the difference is in the shipped package only.
+
+    python package.py --package social_posts_agent --staging-dir build/agent_engine
+"""
+
+import argparse
+import ast
+import compileall
+import os
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+from dataclasses import dataclass, field
+from importlib import metadata
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from packaging.requirements import Requirement
+
+# What AdkApp needs on Agent Engine whatever the agent imports (incl. tracing).
+RUNTIME_REQUIREMENTS = ["google-cloud-aiplatform[agent_engines]"]
+# What deploy.py ships unless SLIM_PACKAGE=1 is set.
+BASELINE_REQUIREMENTS = [
+    "google-cloud-aiplatform[adk,agent_engines]",
+    "litellm",
+    "pydantic",
+    "python-dotenv",
+]
+
+_STDLIB = set(sys.stdlib_module_names)
+# agent_engines.create asks for a runtime on the deploying interpreter's version.
+LOCAL_PYTHON_VERSION = f"{sys.version_info.major}.{sys.version_info.minor}"
+
+
+def _normalize(name: str) -> str:
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def module_imports(path: str, module: str, top_level_only: bool = False) -> Set[str]:
+    """Returns the absolute names of the modules imported by the file at `path`.
+
+    `module` is the file's own dotted name, used to resolve relative
+    imports. `from a import b` yields both `a` and `a.b`, since `b` may be
+    a submodule. With `top_level_only`, imports nested in functions or
+    classes (usually optional or lazy) are ignored.
+    """
+    with open(path, "rb") as source:
+        tree = ast.parse(source.read(), filename=path)
+    is_package = os.path.basename(path) == "__init__.py"
+    package_parts = module.split(".") if is_package else module.split(".")[:-1]
+    nodes = tree.body if top_level_only else ast.walk(tree)
+    imports: Set[str] = set()
+    for node in nodes:
+        if isinstance(node, ast.Import):
+            imports.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            if node.level:
+                base_parts = package_parts[: len(package_parts) - node.level + 1]
+                base = ".".join(base_parts + ([node.module] if node.module else []))
+            else:
+                base = node.module or ""
+            if base:
+                imports.add(base)
+            imports.update(f"{base}.{alias.name}" if base else alias.name for alias in node.names)
+    return imports
+
+
+def package_modules(package_dir: str) -> Dict[str, str]:
+    """Returns {dotted name: path} for the package's modules reachable from agent.py."""
+    package = os.path.basename(os.path.normpath(package_dir))
+    available = {}
+    for root, dirs, files in os.walk(package_dir):
+        dirs[:] = [name for name in dirs if not name.startswith((".", "__pycache__"))]
+        for name in files:
+            if name.endswith(".py"):
+                relative = os.path.relpath(os.path.join(root, name), package_dir)
+                parts = [package, *relative[:-3].split(os.sep)]
+                if parts[-1] == "__init__":
+                    parts.pop()
+                available[".".join(parts)] = os.path.join(root, name)
+
+    reachable: Dict[str, str] = {}
+    pending = [package, f"{package}.agent"]
+    while pending:
+        module = pending.pop()
+        if module in reachable or module not in available:
+            continue
+        reachable[module] = available[module]
+        # Parent packages are imported first.
+        parent = module.rpartition(".")[0]
+        pending.extend([parent] if parent else [])
+        pending.extend(
+            name for name in module_imports(available[module], module) if name in available
+        )
+    return reachable
+
+
+class DistributionIndex:
+    """Maps module names to installed distributions, using only their metadata."""
+
+    def __init__(self) -> None:
+        self.distributions: Dict[str, metadata.Distribution] = {}
+        # dotted module name -> distribution names providing it
+        self._modules: Dict[str, Set[str]] = {}
+        # dotted module name -> (distribution name, file) with its source
+        self._sources: Dict[str, Tuple[str, str]] = {}
+        for distribution in metadata.distributions():
+            name = _normalize(distribution.metadata["Name"] or "")
+            if not name or name in self.distributions:
+                continue
+            self.distributions[name] = distribution
+            for file in distribution.files or ():
+                parts = file.parts
+                if not file.name.endswith(".py") or ".." in parts or "__pycache__" in parts:
+                    continue
+                module_parts = list(parts[:-1])
+                if file.name != "__init__.py":
+                    module_parts.append(file.name[:-3])
+                for depth in range(1, len(module_parts) + 1):
+                    self._modules.setdefault(".".join(module_parts[:depth]), set()).add(name)
+                self._sources[".".join(module_parts)] = (name, str(file))
+
+    def distribution_of(self, module: str) -> Optional[str]:
+        """The distribution providing `module` (None for unknown or ambiguous names)."""
+        parts = module.split(".")
+        for depth in range(len(parts), 0, -1):
+            providers = self._modules.get(".".join(parts[:depth]))
+            if providers:
+                return next(iter(providers)) if len(providers) == 1 else None
+        return None
+
+    def provides(self, module: str) -> bool:
+        return module.split(".")[0] in self._modules
+
+    def source_of(self, module: str) -> Optional[str]:
+        located = self._sources.get(module)
+        if located is None:
+            return None
+        name, file = located
+        return str(self.distributions[name].locate_file(file))
+
+    def closure(self, requirements: Iterable[str]) -> Tuple[Set[str], Set[str]]:
+        """Returns (installed, missing) distribution names a requirement list pulls in."""
+        installed: Set[str] = set()
+        missing: Set[str] = set()
+        seen: Set[Tuple[str, frozenset]] = set()
+        pending = [(Requirement(requirement), frozenset({""})) for requirement in requirements]
+        while pending:
+            requirement, parent_extras = pending.pop()
+            if requirement.marker and not any(
+                requirement.marker.evaluate({"extra": extra}) for extra in parent_extras
+            ):
+                continue
+            name = _normalize(requirement.name)
+            extras = frozenset({""} | {_normalize(extra) for extra in requirement.extras})
+            if (name, extras) in seen:
+                continue
+            seen.add((name, extras))
+            distribution = self.distributions.get(name)
+            if distribution is None:
+                missing.add(name)
+                continue
+            installed.add(name)
+            pending.extend((Requirement(child), extras) for child in distribution.requires or ())
+        return installed, missing
+
+    def extras_providing(self, owner: str, name: str) -> Dict[str, Set[str]]:
+        """{extra: its direct requirements} for each extra of `owner` that requires `name`."""
+        extras: Dict[str, Set[str]] = {}
+        for requirement in self.distributions[owner].requires or ():
+            parsed = Requirement(requirement)
+            match = parsed.marker and re.search(
+                r"extra\s*==\s*['\"]([^'\"]+)['\"]", str(parsed.marker)
+            )
+            if match:
+                extras.setdefault(match.group(1), set()).add(_normalize(parsed.name))
+        return {extra: names for extra, names in extras.items() if name in names}
+
+    def installed_bytes(self, names: Iterable[str]) -> int:
+        total = 0
+        for name in names:
+            distribution = self.distributions[name]
+            for file in distribution.files or ():
+                path = distribution.locate_file(file)
+                if file.size is not None:
+                    total += file.size
+                elif os.path.isfile(path):
+                    total += os.path.getsize(path)
+        return total
+
+    def version(self, name: str) -> str:
+        return self.distributions[name].version
+
+
+def _with_extras(requirement: str, extras: Set[str]) -> str:
+    parsed = Requirement(requirement)
+    present = {_normalize(extra) for extra in parsed.extras}
+    parsed.extras = set(parsed.extras) | {
+        extra for extra in extras if _normalize(extra) not in present
+    }
+    return str(parsed)
+
+
+@dataclass
+class PackagePlan:
+    package: str
+    modules: Dict[str, str]
+    requirements: List[str]
+    imports: Dict[str, str] = field(default_factory=dict)  # distribution -> a module used
+    unresolved: List[str] = field(default_factory=list)
+
+
+def plan_package(
+    package_dir: str, index: DistributionIndex, pin: bool = False
+) -> PackagePlan:
+    """Works out which modules and requirements the package needs."""
+    package = os.path.basename(os.path.normpath(package_dir))
+    modules = package_modules(package_dir)
+    imported: Set[str] = set()
+    for module, path in modules.items():
+        imported.update(module_imports(path, module))
+    external = sorted(
+        name
+        for name in imported
+        if name.split(".")[0] not in _STDLIB and name.split(".")[0] != package
+    )
+
+    plan = PackagePlan(package=package, modules=modules, requirements=[])
+    direct = {index.distribution_of(name) for name in external}
+    # One more hop: module-level imports of the third-party modules used directly.
+    for name in list(external):
+        source = index.source_of(name)
+        if source:
+            external.extend(
+                imported_name
+                for imported_name in module_imports(source, name, top_level_only=True)
+                if imported_name.split(".")[0] not in _STDLIB
+            )
+
+    needed: Dict[str, str] = {}
+    for name in external:
+        distribution = index.distribution_of(name)
+        if distribution is not None:
+            needed.setdefault(distribution, name)
+        elif not index.provides(name):
+            plan.unresolved.append(name.split(".")[0])
+    plan.unresolved = sorted(set(plan.unresolved))
+
+    requirements = list(RUNTIME_REQUIREMENTS)
+    owner = _normalize(Requirement(requirements[0]).name)
+    closure, _ = index.closure(requirements)
+    # The package's own imports first: what they pull in need not be listed again.
+    for distribution in sorted(needed, key=lambda name: (name not in direct, name)):
+        if distribution == owner or (distribution in closure and distribution not in direct):
+            continue
+        # Prefer the runtime's own extra (it carries tested version bounds), but
+        # only one that brings in nothing the agent does not use.
+        extras = [
+            extra
+            for extra, names in index.extras_providing(owner, distribution).items()
+            if distribution not in closure and names <= set(needed) | closure
+        ]
+        if extras:
+            requirements[0] = _with_extras(requirements[0], {min(extras, key=len)})
+        else:
+            # Not in the closure yet, or the package imports it itself.
+            requirements.append(distribution)
+        closure, _ = index.closure(requirements)
+    plan.imports = {name: needed[name] for name in sorted(needed)}
+    if pin:
+        requirements = [
+            f"{requirement}=={index.version(_normalize(Requirement(requirement).name))}"
+            for requirement in requirements
+        ]
+    plan.requirements = requirements
+    return plan
+
+
+def stage_package(
+    plan: PackagePlan, staging_dir: str, python_version: str = LOCAL_PYTHON_VERSION
+) -> str:
+    """Copies the planned modules to `staging_dir`/<package> and compiles them.
+
+    Bytecode is only used by the interpreter version it was compiled for, so
+    nothing is compiled when the runtime's `python_version` is not this one.
+    """
+    target = os.path.join(staging_dir, plan.package)
+    if os.path.isdir(target):
+        shutil.rmtree(target)
+    package_root = None
+    for module, path in plan.modules.items():
+        if module == plan.package:
+            package_root = os.path.dirname(path)
+    for path in plan.modules.values():
+        destination = os.path.join(target, os.path.relpath(path, package_root))
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        shutil.copy2(path, destination)
+    if python_version == LOCAL_PYTHON_VERSION and not compileall.compile_dir(target, quiet=1):
+        raise RuntimeError(f"Could not compile {target}.")
+    with open(os.path.join(staging_dir, "requirements.txt"), "w", encoding="utf-8") as file:
+        file.write("\n".join(plan.requirements) + "\n")
+    return target
+
+
+def directory_bytes(path: str) -> int:
+    return sum(
+        os.path.getsize(os.path.join(root, name))
+        for root, _, files in os.walk(path)
+        for name in files
+    )
+
+
+_IMPORT_CHILD = """
+import importlib, time
+start = time.perf_counter()
+importlib.import_module({module!r}).root_agent
+print((time.perf_counter() - start) * 1e3)
+"""
+
+
+def cold_import_ms(search_path: str, package: str, repeat: int) -> float:
+    """Median time for a fresh interpreter to import `package`.agent and build root_agent.
+
+    Runs with -B, so modules without shipped bytecode are compiled every time,
+    as on a fresh container.
+    """
+    env = dict(os.environ, PYTHONPATH=search_path)
+    # The agent's models come from the environment; any names will do for an import.
+    env.setdefault("GOOGLE_GENAI_MODEL", "gemini-2.0-flash")
+    env.setdefault("OPENAI_MODEL", "openai/gpt-4o")
+    env.setdefault("CLAUDE_MODEL", "anthropic/claude-3-5-sonnet")
+    env.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "True")
+    timings = []
+    for _ in range(repeat):
+        completed = subprocess.run(
+            [
+                sys.executable,
+                "-B",
+                "-W",
+                "ignore",
+                "-c",
+                _IMPORT_CHILD.format(module=f"{package}.agent"),
+            ],
+            capture_output=True,
+            text=True,
+            cwd=search_path,
+            env=env,
+            check=True,
+        )
+        timings.append(float(completed.stdout.strip().splitlines()[-1]))
+    return statistics.median(timings)
+
+
+def _megabytes(size: int) -> str:
+    return f"{size / 2**20:.1f} MB"
+
+
+def _kilobytes(size: int) -> str:
+    return f"{size / 2**10:.1f} kB"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Stage a slim Agent Engine package.")
+    parser.add_argument("--package", default="social_posts_agent")
+    parser.add_argument("--staging-dir", default=os.path.join("build", "agent_engine"))
+    parser.add_argument("--pin", action="store_true", help="Pin the installed versions.")
+    parser.add_argument("--repeat", type=int, default=3, help="Cold imports per measurement.")
+    parser.add_argument("--skip-import-time", action="store_true")
+    parser.add_argument(
+        "--python-version",
+        default=LOCAL_PYTHON_VERSION,
+        help="Python version of the Agent Engine runtime; bytecode is shipped only for this one.",
+    )
+    args = parser.parse_args()
+
+    index = DistributionIndex()
+    plan = plan_package(args.package, index, pin=args.pin)
+    target = stage_package(plan, args.staging_dir, args.python_version)
+
+    compiled = "compiled" if args.python_version == LOCAL_PYTHON_VERSION else "not compiled"
+    print(f"Staged {len(plan.modules)} modules in {target} ({compiled}):")
+    for module in sorted(plan.modules):
+        print(f"- {module}")
+    print("\nDistributions imported:")
+    for distribution, module in plan.imports.items():
+        print(f"- {distribution} (e.g. {module})")
+    for module in plan.unresolved:
+        print(f"- {module} (not installed; add it to the requirements by hand)")
+    print("\nRequirements:")
+    for requirement in plan.requirements:
+        print(f"- {requirement}")
+
+    before, before_missing = index.closure(BASELINE_REQUIREMENTS)
+    after, after_missing = index.closure(plan.requirements)
+    print("\n" + "-" * 50)
+    print(f"{'':<28} {'before':>12} {'after':>12}")
+    print(f"{'requirements':<28} {len(BASELINE_REQUIREMENTS):>12} {len(plan.requirements):>12}")
+    print(f"{'distributions installed':<28} {len(before):>12} {len(after):>12}")
+    print(
+        f"{'installed size':<28} {_megabytes(index.installed_bytes(before)):>12} "
+        f"{_megabytes(index.installed_bytes(after)):>12}"
+    )
+    print(
+        f"{'package size':<28} {_kilobytes(directory_bytes(args.package)):>12} "
+        f"{_kilobytes(directory_bytes(target)):>12}"
+    )
+    if before_missing or after_missing:
+        print(f"Not installed locally, so not counted: {sorted(before_missing | after_missing)}")
+    if not args.skip_import_time:
+        with tempfile.TemporaryDirectory() as source_dir:
+            # The whole directory as extra_packages used to ship it, without local bytecode.
+            shutil.copytree(
+                args.package,
+                os.path.join(source_dir, plan.package),
+                ignore=shutil.ignore_patterns("__pycache__"),
+            )
+            before_ms = cold_import_ms(source_dir, plan.package, args.repeat)
+        after_ms = cold_import_ms(os.path.abspath(args.staging_dir), plan.package, args.repeat)
+        print(f"{'cold root_agent import':<28} {before_ms:>9.0f} ms {after_ms:>9.0f} ms")
+    dropped = sorted(before - after)
+    if dropped:
+        print(f"\nNo longer installed: {', '.join(dropped)}")
+    largest = sorted(after, key=lambda name: -index.installed_bytes([name]))[:5]
+    print(
+        "Largest distributions left: "
+        + ", ".join(f"{name} {_megabytes(index.installed_bytes([name]))}" for name in largest)
+    )
+
+
+if __name__ == "__main__":
+    main()
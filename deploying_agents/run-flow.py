@@ -1,6 +1,5 @@
 import os
 import sys
-import time
 
 from dotenv import load_dotenv
 
@@ -8,19 +7,16 @@ from dotenv import load_dotenv
 load_dotenv()
 
 import vertexai
-from actions import (
-    create_session,
-    delete_session,
-    get_session,
-    list_deployments,
-    list_sessions,
-    send_message,
-)
+from actions import DeploymentClient
+from streaming import event_text, final_response
 
 # Get deployment settings from environment variables
 PROJECT_ID = os.environ.get("PROJECT_ID", "multiversity-418607")
 LOCATION = os.environ.get("LOCATION", "us-central1")
 STAGING_BUCKET = os.environ.get("STAGING_BUCKET", "gs://social-posts-agent-test-1")
+# How long a deployment handle is reused, and how long to wait for a new session.
+DEPLOYMENT_CACHE_TTL_SECONDS = float(os.environ.get("DEPLOYMENT_CACHE_TTL_SECONDS", "300"))
+SESSION_READY_TIMEOUT_SECONDS = float(os.environ.get("SESSION_READY_TIMEOUT_SECONDS", "10"))
 
 vertexai.init(
     project=PROJECT_ID,
@@ -29,8 +25,13 @@ vertexai.init(
 )
 
 if __name__ == "__main__":
+    client = DeploymentClient(
+        ttl_seconds=DEPLOYMENT_CACHE_TTL_SECONDS,
+        ready_timeout_seconds=SESSION_READY_TIMEOUT_SECONDS,
+    )
+
     print("Listing deployments...")
-    deployments = list_deployments()
+    deployments = client.list_deployments()
 
     if not deployments:
         print("No deployments found. Exiting.")
@@ -45,13 +46,12 @@ if __name__ == "__main__":
 
     # List all sessions
     print("\nListing sessions...")
-    sessions = list_sessions(resource_id, user_id)
+    sessions = client.list_sessions(resource_id, user_id)
     print(f"sessions: {sessions}")
 
     if not sessions:
         print(f"No sessions found. Creating session for user {user_id}...")
-        session = create_session(resource_id, user_id)
-        time.sleep(1)
+        session = client.create_session(resource_id, user_id)
 
         if not session:
             print("Failed to create session. Exiting.")
@@ -68,7 +68,7 @@ if __name__ == "__main__":
         # Get the session object
     # Get session details
     print("\nGetting session details...")
-    session_info = get_session(resource_id, user_id, session_id)
+    session_info = client.get_session(resource_id, user_id, session_id)
 
     if not session_info:
         print("Failed to get session details. Continuing with other operations.")
@@ -76,13 +76,22 @@ if __name__ == "__main__":
 
     print("\nSending message...")
 
-    send_message(
+    # Only the final responses are printed, as soon as each one arrives.
+    stats = client.stream_message(
         resource_id,
         user_id,
         session_id,
         message="Create a post for what's new in Angular v20?",
+        on_event=lambda event: print(f"{event.get('author')}: {event_text(event)}\n"),
+        event_filter=final_response,
     )
+    if stats is not None:
+        first = "-" if stats.time_to_first_event is None else f"{stats.time_to_first_event:.2f}s"
+        print(
+            f"{stats.events} events ({stats.delivered} final responses); "
+            f"first event after {first}, stream done after {stats.total_seconds:.2f}s"
+        )
 
     # Delete the session we created
     # print("\nDeleting session...")
-    # delete_session(resource_id, user_id, session_id)
+    # client.delete_session(resource_id, user_id, session_id)
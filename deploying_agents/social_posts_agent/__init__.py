@@ -1 +1,10 @@
-from . import agent
+import importlib
+
+
+def __getattr__(name: str):
+    # `adk web` looks up `agent` / `root_agent` on the package; the agent
+    # module (and google.adk with it) is only imported at that point.
+    if name in ("agent", "root_agent"):
+        agent = importlib.import_module(f"{__name__}.agent")
+        return agent if name == "agent" else agent.root_agent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
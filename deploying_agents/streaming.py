@@ -0,0 +1,150 @@
+import asyncio
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, Optional, Set, Tuple
+
+# Maps a raw stream_query event to what the caller receives, or None to drop it.
+EventFilter = Callable[[Dict[str, Any]], Optional[Any]]
+
+
+@dataclass
+class StreamStats:
+    """Counters for one streamed reply; the events themselves are not kept."""
+
+    events: int = 0
+    delivered: int = 0
+    time_to_first_event: Optional[float] = None
+    total_seconds: float = 0.0
+
+
+def _parts(event: Dict[str, Any]) -> list:
+    return ((event.get("content") or {}).get("parts")) or []
+
+
+def event_text(event: Dict[str, Any]) -> str:
+    """Returns the concatenated text parts of an event ("" if there are none)."""
+    return "".join(part.get("text") or "" for part in _parts(event))
+
+
+def is_final_response(event: Dict[str, Any]) -> bool:
+    """Mirrors Event.is_final_response for the dicts stream_query yields."""
+    if (event.get("actions") or {}).get("skip_summarization"):
+        return True
+    if event.get("partial"):
+        return False
+    return not any(
+        part.get("function_call") or part.get("function_response") for part in _parts(event)
+    )
+
+
+def final_response(event: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Filter: only final responses, i.e. no tool calls, tool results or partial chunks."""
+    return event if is_final_response(event) else None
+
+
+class TextDeltas:
+    """Filter: only new text, as it arrives.
+
+    With streaming enabled an agent sends its reply as partial chunks and
+    then repeats the whole text in a final event; that repeat is dropped.
+    Use a fresh instance per stream.
+    """
+
+    def __init__(self) -> None:
+        # (invocation_id, author) of replies that are being streamed in chunks.
+        self._streaming: Set[Tuple[Any, Any]] = set()
+
+    def __call__(self, event: Dict[str, Any]) -> Optional[str]:
+        key = (event.get("invocation_id"), event.get("author"))
+        if event.get("partial"):
+            self._streaming.add(key)
+        elif key in self._streaming:
+            self._streaming.discard(key)
+            return None
+        return event_text(event) or None
+
+
+def stream_events(
+    events: Iterable[Dict[str, Any]],
+    event_filter: Optional[EventFilter] = None,
+    stats: Optional[StreamStats] = None,
+) -> Iterator[Any]:
+    """Yields each event (or what `event_filter` makes of it) as soon as it arrives.
+
+    Nothing is buffered, so memory stays flat however long the stream is.
+    Time to first event and total time are measured from the call that
+    starts the stream and written to `stats`.
+    """
+    stats = stats if stats is not None else StreamStats()
+    start = time.perf_counter()
+    try:
+        for event in events:
+            stats.events += 1
+            if stats.time_to_first_event is None:
+                stats.time_to_first_event = time.perf_counter() - start
+            item = event_filter(event) if event_filter else event
+            if item is not None:
+                stats.delivered += 1
+                yield item
+    finally:
+        stats.total_seconds = time.perf_counter() - start
+
+
+_DONE = object()
+
+
+async def astream_events(
+    start_stream: Callable[[], Iterable[Dict[str, Any]]],
+    event_filter: Optional[EventFilter] = None,
+    stats: Optional[StreamStats] = None,
+    max_buffered: int = 64,
+) -> AsyncIterator[Any]:
+    """Async version of stream_events for the blocking stream_query generator.
+
+    The stream is consumed on a worker thread and handed over through a
+    queue of at most `max_buffered` events, so a slow consumer pauses the
+    stream instead of piling events up in memory. Breaking out of the loop
+    (or closing the iterator) returns at once: stream_query cannot be
+    interrupted, so the worker stops at the stream's next event in the
+    background. Each stream holds a thread of the loop's default executor
+    until then, which caps the number of concurrent streams at that
+    executor's size (and asyncio.run waits for those threads on exit).
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max_buffered)
+    stop = threading.Event()
+
+    def produce() -> None:
+        try:
+            for item in stream_events(start_stream(), event_filter, stats):
+                if stop.is_set():
+                    break
+                asyncio.run_coroutine_threadsafe(queue.put(item), loop).result()
+            result: Any = _DONE
+        except BaseException as e:  # Re-raised in the consumer.
+            result = e
+        if not stop.is_set():
+            asyncio.run_coroutine_threadsafe(queue.put(result), loop).result()
+
+    worker = loop.run_in_executor(None, produce)
+    finished = False
+    try:
+        while True:
+            item = await queue.get()
+            if item is _DONE:
+                finished = True
+                break
+            if isinstance(item, BaseException):
+                finished = True
+                raise item
+            yield item
+    finally:
+        stop.set()
+        # Unblock a worker waiting on a full queue; it puts at most one more
+        # event before it sees `stop`.
+        while not queue.empty():
+            queue.get_nowait()
+        if finished:
+            # The worker has handed over its last item and is returning.
+            await asyncio.shield(worker)
@@ -0,0 +1,3 @@
+from .template import InstructionTemplate, compile_template
+
+__all__ = ["InstructionTemplate", "compile_template"]
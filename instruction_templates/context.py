@@ -0,0 +1,12 @@
+from google.adk.agents.readonly_context import ReadonlyContext
+from google.adk.sessions import Session
+
+
+def context_session(context: ReadonlyContext) -> Session:
+    """Returns the session behind a callback, tool or instruction context.
+
+    ReadonlyContext does not expose the session itself (only a read-only view
+    of its state), so this reads the private `_invocation_context`. Check it
+    when upgrading from the pinned google-adk 1.5.0 in requirements.txt.
+    """
+    return context._invocation_context.session
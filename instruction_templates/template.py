@@ -0,0 +1,145 @@
+import copy
+import re
+from collections import OrderedDict
+from typing import Any, List, Mapping, Tuple, Union
+
+from google.adk.agents.readonly_context import ReadonlyContext
+from google.adk.sessions import State
+
+from .context import context_session
+
+# Same placeholder syntax as google.adk.utils.instructions_utils.inject_session_state.
+_PLACEHOLDER = re.compile(r"{+[^{}]*}+")
+
+
+class _Missing:
+    def __repr__(self) -> str:
+        return "<missing>"
+
+
+_MISSING = _Missing()
+# Values of these types can be cached by reference instead of a deep-copied snapshot.
+_IMMUTABLE_TYPES = (str, bytes, int, float, bool, type(None), tuple, frozenset, _Missing)
+
+
+class _Placeholder:
+    __slots__ = ("key", "optional")
+
+    def __init__(self, key: str, optional: bool) -> None:
+        self.key = key
+        self.optional = optional
+
+
+def _is_valid_state_name(name: str) -> bool:
+    parts = name.split(":")
+    if len(parts) == 1:
+        return name.isidentifier()
+    if len(parts) == 2:
+        prefixes = (State.APP_PREFIX, State.USER_PREFIX, State.TEMP_PREFIX)
+        return parts[0] + ":" in prefixes and parts[1].isidentifier()
+    return False
+
+
+def compile_template(template: str) -> List[Union[str, _Placeholder]]:
+    """Splits a template into literal strings and state placeholders.
+
+    Placeholders follow ADK's rules: `{key}` is replaced by `str(state[key])`,
+    `{key?}` renders as "" when the key is missing, and anything that is not a
+    valid state name (e.g. JSON braces) is kept verbatim.
+    """
+    segments: List[Union[str, _Placeholder]] = []
+    last_end = 0
+    for match in _PLACEHOLDER.finditer(template):
+        name = match.group().lstrip("{").rstrip("}").strip()
+        optional = name.endswith("?")
+        name = name.removesuffix("?")
+        if name.startswith("artifact."):
+            raise ValueError(
+                f"Artifact placeholder {match.group()} is not supported by InstructionTemplate; "
+                "use a plain string instruction instead."
+            )
+        if not _is_valid_state_name(name):
+            continue  # Stays part of the surrounding literal.
+        segments.append(template[last_end : match.start()])
+        segments.append(_Placeholder(name, optional))
+        last_end = match.end()
+    segments.append(template[last_end:])
+    return [segment for segment in segments if segment != ""]
+
+
+class InstructionTemplate:
+    """An instruction provider that renders `{state_key}` placeholders once per change.
+
+    The template is parsed once into literal and placeholder segments. For
+    each session the rendered instruction is cached together with the values
+    it was rendered from; the next model call re-renders only if one of the
+    referenced state values has changed. Unchanged values are detected by
+    identity first (ADK replaces a state value whenever a delta sets it),
+    falling back to equality, and mutable values are compared against a
+    snapshot so in-place edits are still picked up.
+
+    Use it wherever a string instruction would go:
+
+        LlmAgent(..., instruction=InstructionTemplate("Name: {user_name}"))
+    """
+
+    def __init__(self, template: str, max_sessions: int = 1024) -> None:
+        self.template = template
+        self.segments = compile_template(template)
+        self.keys: Tuple[str, ...] = tuple(
+            dict.fromkeys(
+                segment.key for segment in self.segments if isinstance(segment, _Placeholder)
+            )
+        )
+        self.max_sessions = max_sessions
+        # session id -> (snapshots of the referenced values, rendered text)
+        self._rendered: "OrderedDict[str, Tuple[Tuple[Any, ...], str]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "sessions": len(self._rendered)}
+
+    def render(self, state: Mapping[str, Any]) -> str:
+        parts = []
+        for segment in self.segments:
+            if isinstance(segment, str):
+                parts.append(segment)
+            elif segment.key in state:
+                parts.append(str(state[segment.key]))
+            elif not segment.optional:
+                raise KeyError(f"Context variable not found: `{segment.key}`.")
+        return "".join(parts)
+
+    def __call__(self, readonly_context: ReadonlyContext) -> str:
+        session = context_session(readonly_context)
+        state = session.state
+        values = tuple(state.get(key, _MISSING) for key in self.keys)
+
+        cached = self._rendered.get(session.id)
+        if cached is not None and _unchanged(cached[0], values):
+            self._rendered.move_to_end(session.id)
+            self.hits += 1
+            return cached[1]
+
+        self.misses += 1
+        rendered = self.render(state)
+        snapshots = tuple(
+            value if isinstance(value, _IMMUTABLE_TYPES) else copy.deepcopy(value)
+            for value in values
+        )
+        self._rendered[session.id] = (snapshots, rendered)
+        self._rendered.move_to_end(session.id)
+        if len(self._rendered) > self.max_sessions:
+            self._rendered.popitem(last=False)
+        return rendered
+
+
+def _unchanged(snapshots: Tuple[Any, ...], values: Tuple[Any, ...]) -> bool:
+    for snapshot, value in zip(snapshots, values):
+        if snapshot is value and isinstance(value, _IMMUTABLE_TYPES):
+            continue
+        if type(snapshot) is not type(value) or snapshot != value:
+            return False
+    return True
+
@@ -1,3 +1,5 @@
+import os
+
 from google.adk.agents import SequentialAgent
 from .instructions import CAMPAIGN_ORCHESTRATOR_INSTRUCTION
 from .sub_agents import (
@@ -7,17 +9,36 @@ from .sub_agents import (
     visual_suggester_agent,
     formatter_agent,
 )
+from .dag import DagAgent, infer_reads
+from .stage_cache import CachedStageAgent, DiskStageCache
+
+stages = [
+    market_research_agent,
+    messaging_strategist_agent,
+    ad_copy_writer_agent,
+    visual_suggester_agent,
+    formatter_agent,
+]
+# Upstream output_keys each stage reads, inferred from the state['...'] references
+# in instructions.py. Together with the stage's instruction, model and the user's
+# message they form the stage cache key, and they define the DAG's edges.
+STAGE_READS = infer_reads(stages)
+
+# Set CAMPAIGN_STAGE_CACHE_DIR to skip stages whose inputs are unchanged on reruns.
+STAGE_CACHE_DIR = os.environ.get("CAMPAIGN_STAGE_CACHE_DIR")
+STAGE_CACHE_MAX_MB = int(os.environ.get("CAMPAIGN_STAGE_CACHE_MAX_MB", "64"))
+# Set CAMPAIGN_ORCHESTRATION=dag to start each stage as soon as the stages it reads from are done.
+ORCHESTRATION = os.environ.get("CAMPAIGN_ORCHESTRATION", "sequential")
+
+if STAGE_CACHE_DIR:
+    stage_cache = DiskStageCache(STAGE_CACHE_DIR, max_bytes=STAGE_CACHE_MAX_MB * 1024 * 1024)
+    stages = [CachedStageAgent(stage, STAGE_READS[stage.name], stage_cache) for stage in stages]
 
-campaign_orchestrator = SequentialAgent(
+orchestrator_class = DagAgent if ORCHESTRATION == "dag" else SequentialAgent
+campaign_orchestrator = orchestrator_class(
     name="MarketingCampaignAssistant",
     description=CAMPAIGN_ORCHESTRATOR_INSTRUCTION,
-    sub_agents=[
-        market_research_agent,
-        messaging_strategist_agent,
-        ad_copy_writer_agent,
-        visual_suggester_agent,
-        formatter_agent,
-    ],
+    sub_agents=stages,
 )
 
 root_agent = campaign_orchestrator
@@ -0,0 +1,194 @@
+import asyncio
+import re
+import time
+from typing import Any, AsyncGenerator, Dict, List, Optional, Sequence, Tuple
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event
+from pydantic import Field
+
+# Key of the run report in the custom_metadata of a DagAgent's last event.
+REPORT_METADATA_KEY = "dag_report"
+_FINISHED = object()
+
+# state['key'] / state["key"] as written in instructions.py, and ADK's {key} / {key?} placeholders.
+_STATE_REFERENCE = re.compile(r"""state\[\s*['"]([A-Za-z_][\w:]*)['"]\s*\]|\{([A-Za-z_][\w:]*)\??\}""")
+
+
+def _stage(agent: BaseAgent) -> BaseAgent:
+    # Look through wrappers such as CachedStageAgent to the LlmAgent they run.
+    return getattr(agent, "stage", agent)
+
+
+def referenced_state_keys(agent: BaseAgent) -> List[str]:
+    """Returns the state keys an agent's instruction refers to, in order of appearance."""
+    instruction = getattr(_stage(agent), "instruction", "")
+    if not isinstance(instruction, str):
+        instruction = getattr(instruction, "template", "")
+    keys = (match.group(1) or match.group(2) for match in _STATE_REFERENCE.finditer(instruction))
+    return list(dict.fromkeys(keys))
+
+
+def infer_reads(agents: Sequence[BaseAgent]) -> Dict[str, List[str]]:
+    """Maps each agent name to the other agents' output_keys its instruction reads."""
+    produced = {getattr(_stage(agent), "output_key", None) for agent in agents} - {None}
+    return {
+        agent.name: [
+            key
+            for key in referenced_state_keys(agent)
+            if key in produced and key != getattr(_stage(agent), "output_key", None)
+        ]
+        for agent in agents
+    }
+
+
+def infer_dependencies(agents: Sequence[BaseAgent]) -> Dict[str, List[str]]:
+    """Maps each agent name to the names of the agents whose output it reads."""
+    producers = {
+        _stage(agent).output_key: agent.name
+        for agent in agents
+        if getattr(_stage(agent), "output_key", None)
+    }
+    return {
+        name: [producers[key] for key in keys]
+        for name, keys in infer_reads(agents).items()
+    }
+
+
+class DagAgent(BaseAgent):
+    """Runs sub-agents as a dependency graph instead of a fixed sequence.
+
+    Dependencies are inferred from each sub-agent's instruction (state['key']
+    and {key} references) and the other sub-agents' output_keys, unless given
+    explicitly. A sub-agent starts as soon as everything it depends on has
+    finished, so independent stages run concurrently like ParallelAgent.
+    Unlike ParallelAgent, every stage runs on the invocation's own branch, so
+    downstream stages see upstream outputs in the conversation history.
+
+    Each stage's event generator is driven by one task of its own (a pump
+    feeding a shared queue), so tracing contexts are entered and left in the
+    same task.
+
+    After each run it prints the critical-path latency next to the serial
+    total (the sum of all stage durations) and yields one last event whose
+    custom_metadata[REPORT_METADATA_KEY] holds the report, so concurrent
+    invocations each keep their own.
+    """
+
+    dependencies: Dict[str, List[str]] = Field(default_factory=dict)
+
+    def model_post_init(self, __context) -> None:
+        super().model_post_init(__context)
+        if not self.dependencies:
+            self.dependencies = infer_dependencies(self.sub_agents)
+        names = {agent.name for agent in self.sub_agents}
+        for name, upstream in self.dependencies.items():
+            unknown = set(upstream) - names
+            if unknown:
+                raise ValueError(f"{name} depends on unknown sub-agents: {sorted(unknown)}")
+        self._check_acyclic()
+
+    def _check_acyclic(self) -> None:
+        remaining = {agent.name: set(self.dependencies.get(agent.name, ())) for agent in self.sub_agents}
+        while remaining:
+            ready = [name for name, upstream in remaining.items() if not upstream]
+            if not ready:
+                raise ValueError(f"Sub-agent dependencies form a cycle: {sorted(remaining)}")
+            for name in ready:
+                del remaining[name]
+            for upstream in remaining.values():
+                upstream.difference_update(ready)
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        agents = {agent.name: agent for agent in self.sub_agents}
+        waiting = {name: set(self.dependencies.get(name, ())) for name in agents}
+        queue: "asyncio.Queue[Tuple[str, Any, Optional[asyncio.Event]]]" = asyncio.Queue()
+        pumps: Dict[str, asyncio.Task] = {}
+        durations: Dict[str, float] = {}
+        run_start = time.perf_counter()
+
+        async def pump(name: str) -> None:
+            started = time.perf_counter()
+            try:
+                async for event in agents[name].run_async(ctx):
+                    # Like ParallelAgent, a sub-agent only moves on once the
+                    # runner has processed (and persisted) its previous event.
+                    processed = asyncio.Event()
+                    await queue.put((name, event, processed))
+                    await processed.wait()
+            except Exception as e:
+                await queue.put((name, e, None))
+                return
+            durations[name] = time.perf_counter() - started
+            await queue.put((name, _FINISHED, None))
+
+        def start_ready() -> None:
+            # Sub-agents are started in declaration order among those that are ready.
+            for name in [name for name, upstream in waiting.items() if not upstream]:
+                del waiting[name]
+                pumps[name] = asyncio.create_task(pump(name))
+
+        start_ready()
+        running = len(pumps)
+        try:
+            while running:
+                name, item, processed = await queue.get()
+                if item is _FINISHED:
+                    running -= 1
+                    for upstream in waiting.values():
+                        upstream.discard(name)
+                    before = len(pumps)
+                    start_ready()
+                    running += len(pumps) - before
+                elif isinstance(item, Exception):
+                    raise item
+                else:
+                    yield item
+                    processed.set()
+        finally:
+            for task in pumps.values():
+                task.cancel()
+
+        report = self._report(durations, time.perf_counter() - run_start)
+        print(
+            f"[DAG] Critical path {report['critical_path_seconds']:.2f}s "
+            f"({' -> '.join(report['critical_path'])}), "
+            f"serial total {report['serial_seconds']:.2f}s, "
+            f"wall {report['wall_seconds']:.2f}s"
+        )
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            custom_metadata={REPORT_METADATA_KEY: report},
+        )
+
+    def _report(self, durations: Dict[str, float], wall_seconds: float) -> Dict[str, object]:
+        # Longest path by measured duration, in dependency order (sub_agents
+        # are acyclic, and each finish time depends only on finished upstreams).
+        finish: Dict[str, float] = {}
+        previous: Dict[str, Optional[str]] = {}
+        pending = [agent.name for agent in self.sub_agents if agent.name in durations]
+        while pending:
+            for name in list(pending):
+                upstream = [dep for dep in self.dependencies.get(name, ()) if dep in durations]
+                if any(dep not in finish for dep in upstream):
+                    continue
+                slowest = max(upstream, key=finish.__getitem__, default=None)
+                finish[name] = durations[name] + (finish[slowest] if slowest else 0.0)
+                previous[name] = slowest
+                pending.remove(name)
+
+        path: List[str] = []
+        node = max(finish, key=finish.__getitem__, default=None)
+        while node:
+            path.append(node)
+            node = previous[node]
+        return {
+            "critical_path": path[::-1],
+            "critical_path_seconds": max(finish.values(), default=0.0),
+            "serial_seconds": sum(durations.values()),
+            "wall_seconds": wall_seconds,
+            "stage_seconds": durations,
+        }
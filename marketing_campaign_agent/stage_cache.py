@@ -0,0 +1,142 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from typing import Any, AsyncGenerator, Dict, List, Optional
+
+from google.adk.agents import BaseAgent, LlmAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from google.genai import types
+
+
+class DiskStageCache:
+    """A size-bounded, content-addressed cache of stage outputs on local disk.
+
+    Each entry is one JSON file named by its key. Reads refresh the file's
+    modification time, and writes evict the least recently used files until
+    the directory is under `max_bytes`. Writes go through a temporary file and
+    os.replace, so a crash never leaves a partial entry behind.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 64 * 1024 * 1024) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._total_bytes = sum(size for _, size, _ in self._entries())
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _entries(self):
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and entry.name.endswith(".json"):
+                stat = entry.stat()
+                yield entry.path, stat.st_size, stat.st_mtime
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as cache_file:
+                value = json.load(cache_file)
+            os.utime(path)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        return value
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        data = json.dumps(value, ensure_ascii=False).encode("utf-8")
+        path = self._path(key)
+        with self._lock:
+            previous_size = os.path.getsize(path) if os.path.exists(path) else 0
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as tmp_file:
+                tmp_file.write(data)
+            os.replace(tmp_path, path)
+            self._total_bytes += len(data) - previous_size
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        # Oldest access first; only runs when the size bound is exceeded.
+        for path, size, _ in sorted(self._entries(), key=lambda entry: entry[2]):
+            if self._total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            self._total_bytes -= size
+
+
+class CachedStageAgent(BaseAgent):
+    """Runs an LlmAgent stage, or replays its stored output if nothing changed.
+
+    The cache key hashes the stage's name, instruction and model, the user's
+    message, and the current values of the upstream state keys the stage
+    reads (`reads`). On a hit the stored output is emitted as the stage's
+    event, so it lands in state under the stage's `output_key` and in the
+    conversation history exactly as a fresh run would; the model is not
+    called. On a miss the stage runs normally and its output is stored.
+    """
+
+    model_config = {"arbitrary_types_allowed": True}
+
+    stage: LlmAgent
+    reads: List[str]
+    cache: DiskStageCache
+
+    def __init__(self, stage: LlmAgent, reads: List[str], cache: DiskStageCache) -> None:
+        super().__init__(
+            name=f"{stage.name}Cached",
+            description=stage.description,
+            sub_agents=[stage],
+            stage=stage,
+            reads=reads,
+            cache=cache,
+        )
+
+    def cache_key(self, ctx: InvocationContext) -> str:
+        instruction = self.stage.instruction
+        if not isinstance(instruction, str):
+            instruction = getattr(instruction, "template", repr(instruction))
+        user_text = ""
+        if ctx.user_content and ctx.user_content.parts:
+            user_text = "".join(part.text or "" for part in ctx.user_content.parts)
+        material = {
+            "stage": self.stage.name,
+            "instruction": instruction,
+            "model": self.stage.canonical_model.model,
+            "user": user_text,
+            "reads": {key: ctx.session.state.get(key) for key in self.reads},
+        }
+        encoded = json.dumps(material, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        key = self.cache_key(ctx)
+        output_key = self.stage.output_key
+        cached = self.cache.get(key)
+        if cached is not None:
+            print(f"[STAGE CACHE] Hit for {self.stage.name}; skipping the model call.")
+            yield Event(
+                invocation_id=ctx.invocation_id,
+                author=self.stage.name,
+                branch=ctx.branch,
+                content=types.Content(role="model", parts=[types.Part(text=cached["output"])]),
+                actions=EventActions(
+                    state_delta={output_key: cached["output"]} if output_key else {}
+                ),
+                custom_metadata={"stage_cache": "hit"},
+            )
+            return
+
+        failed = False
+        async for event in self.stage.run_async(ctx):
+            failed = failed or bool(event.error_code)
+            yield event
+        output = ctx.session.state.get(output_key) if output_key else None
+        if not failed and isinstance(output, str):
+            self.cache.set(key, {"stage": self.stage.name, "output": output})
@@ -0,0 +1,67 @@
+from typing import AsyncGenerator, Optional
+
+from google.adk.agents import BaseAgent, LlmAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event
+from google.genai import types
+
+# (label, state key) for each section of the merged output, in order.
+SECTIONS = (
+    ("LinkedIn Post", "linkedIn_post"),
+    ("Instagram Post", "instagram_reel_script"),
+)
+
+
+class PostsMergeAgent(BaseAgent):
+    """Merges the generated posts from state into one output without a model call.
+
+    The merged text follows the PostsMergerAgent's output format: one
+    "- <Platform> Post: <post>" section per entry in SECTIONS. The `fallback`
+    LlmAgent runs instead when `rewrite` is set (the output should be
+    rewritten freely rather than assembled), or when a post is missing from
+    state so there is nothing to assemble.
+    """
+
+    fallback: Optional[LlmAgent] = None
+    rewrite: bool = False
+
+    def __init__(
+        self,
+        name: str,
+        description: str = "",
+        fallback: Optional[LlmAgent] = None,
+        rewrite: bool = False,
+    ) -> None:
+        super().__init__(
+            name=name,
+            description=description,
+            sub_agents=[fallback] if fallback else [],
+            fallback=fallback,
+            rewrite=rewrite,
+        )
+
+    def merge(self, state) -> Optional[str]:
+        """Returns the merged posts, or None if a post is missing or empty."""
+        sections = []
+        for label, key in SECTIONS:
+            post = state.get(key)
+            if not isinstance(post, str) or not post.strip():
+                return None
+            sections.append(f"- {label}: {post.strip()}")
+        return "\n".join(sections)
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        merged = None if self.rewrite else self.merge(ctx.session.state)
+        if merged is None and self.fallback is not None:
+            async for event in self.fallback.run_async(ctx):
+                yield event
+            return
+        if merged is None:
+            missing = [key for _, key in SECTIONS if not ctx.session.state.get(key)]
+            merged = f"Could not merge the posts; missing: {', '.join(missing)}."
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            content=types.Content(role="model", parts=[types.Part(text=merged)]),
+        )
@@ -0,0 +1,154 @@
+import asyncio
+import time
+import weakref
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Set
+
+import litellm
+from agent_telemetry import prepend_callback
+from google.adk.agents import BaseAgent, LlmAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models.google_llm import Gemini
+from google.adk.models.lite_llm import LiteLlm
+from google.genai import types
+
+
+def _llm_agents(agent: BaseAgent) -> List[LlmAgent]:
+    agents = [agent] if isinstance(agent, LlmAgent) else []
+    for sub_agent in agent.sub_agents:
+        agents.extend(_llm_agents(sub_agent))
+    return agents
+
+
+def _saved_by(step: Callable[[], Any]) -> float:
+    """Runs `step` twice; returns how much less the second run took.
+
+    Only used for steps whose result is cached where the request finds it,
+    so the difference is the time the request no longer spends.
+    """
+    start = time.perf_counter()
+    step()
+    cold = time.perf_counter() - start
+    start = time.perf_counter()
+    step()
+    return max(cold - (time.perf_counter() - start), 0.0)
+
+
+def _warm_lite_llm(model: str) -> float:
+    saved = 0.0
+    try:
+        saved += _saved_by(lambda: litellm.get_llm_provider(model))
+    except Exception:
+        return saved  # The request reports this itself.
+    try:
+        # completion() looks the model up in the same cached map.
+        saved += _saved_by(lambda: litellm.get_model_info(model))
+    except Exception:
+        pass  # Not in LiteLLM's model map; only cost tracking is affected.
+    return saved
+
+
+@dataclass
+class _LoopState:
+    """Prewarm tasks of one event loop; asyncio tasks cannot be awaited from another."""
+
+    tasks: Dict[str, asyncio.Task] = field(default_factory=dict)
+    reported: Set[str] = field(default_factory=set)
+
+
+class Prewarmer:
+    """Does the downstream agents' one-off setup while the first stage runs.
+
+    When the first sub-agent of a pipeline starts, a background task per
+    downstream LlmAgent does setup that the agent's first request would
+    otherwise do itself, and leaves the result where that request finds it:
+
+    - a string model is resolved to its BaseLlm and the API client is built;
+      the instance then replaces the string as `agent.model`, so ADK sends
+      the request with that client instead of building a new one,
+    - for LiteLlm models, LiteLLM's provider and model info lookups run once;
+      LiteLLM caches both, and completion() repeats them on every call.
+
+    No connection is opened: LiteLLM's HTTP clients only connect when a
+    real request is sent.
+
+    Each downstream agent waits for its own setup before it starts. Every
+    step is timed cold and then again warm, and only the difference, less
+    any time the agent spent waiting for the setup, is reported as saved.
+    Setup runs once per event loop; a failed step only means the first
+    request pays that cost as before.
+    """
+
+    def __init__(self, pipeline: BaseAgent) -> None:
+        self.first_stage = pipeline.sub_agents[0]
+        self.downstream = [
+            agent for stage in pipeline.sub_agents[1:] for agent in _llm_agents(stage)
+        ]
+        self._loops: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopState]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self.report: Dict[str, Dict[str, float]] = {}
+
+    def attach(self) -> None:
+        self.first_stage.before_agent_callback = prepend_callback(
+            self.start, self.first_stage.before_agent_callback
+        )
+        for agent in self.downstream:
+            agent.before_agent_callback = prepend_callback(self.wait, agent.before_agent_callback)
+
+    def _loop_state(self) -> _LoopState:
+        loop = asyncio.get_running_loop()
+        state = self._loops.get(loop)
+        if state is None:
+            state = self._loops[loop] = _LoopState()
+        return state
+
+    def start(self, callback_context: CallbackContext) -> Optional[types.Content]:
+        state = self._loop_state()
+        for agent in self.downstream:
+            if agent.name not in state.tasks:
+                state.tasks[agent.name] = asyncio.create_task(self._prewarm(agent))
+        return None
+
+    async def wait(self, callback_context: CallbackContext) -> Optional[types.Content]:
+        agent_name = callback_context.agent_name
+        state = self._loop_state()
+        task = state.tasks.get(agent_name)
+        if task is None or agent_name in state.reported:
+            return None
+        state.reported.add(agent_name)
+        wait_start = time.perf_counter()
+        setup_saved = await task
+        waited = time.perf_counter() - wait_start
+        saved = max(setup_saved - waited, 0.0)
+        self.report[agent_name] = {
+            "setup_saved_seconds": setup_saved,
+            "waited_seconds": waited,
+            "saved_seconds": saved,
+        }
+        print(
+            f"[PREWARM] {agent_name}: saved {saved:.3f}s "
+            f"(setup the request skips {setup_saved:.3f}s, waited {waited:.3f}s for it)."
+        )
+        return None
+
+    async def _prewarm(self, agent: LlmAgent) -> float:
+        model = agent.model
+        if not model:
+            return 0.0
+        llm = agent.canonical_model  # A new instance per call for a string model.
+        saved = 0.0
+        if isinstance(llm, Gemini):
+            saved += await asyncio.to_thread(_saved_by, lambda: llm.api_client)
+        if isinstance(model, str) and agent.model == model:
+            agent.model = llm
+        if isinstance(llm, LiteLlm):
+            saved += await asyncio.to_thread(_warm_lite_llm, llm.model)
+        return saved
+
+
+def enable_prewarm(pipeline: BaseAgent) -> Prewarmer:
+    """Prewarms `pipeline`'s downstream agents while its first sub-agent runs."""
+    prewarmer = Prewarmer(pipeline)
+    prewarmer.attach()
+    return prewarmer
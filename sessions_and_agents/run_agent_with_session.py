@@ -1,11 +1,12 @@
+import asyncio
 import uuid
 
-from agent import root_agent
 from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
 from google.genai import types
 
-session_service = InMemorySessionService()
+from .agent import root_agent
+
 state_context = {
     "user_name": "Ahsan",
     "user_post_preferences": """
@@ -30,46 +31,54 @@ SESSION_ID = str(uuid.uuid4())
 USER_ID = "ahsanayaz"
 APP_NAME = "Social Media Post Generator"
 
-session = session_service.create_session(
-    app_name=APP_NAME,
-    user_id=USER_ID,
-    session_id=SESSION_ID,
-    state=state_context,
-)
 
-print("Session ID:", session.id)
+async def main():
+    session_service = InMemorySessionService()
+    session = await session_service.create_session(
+        app_name=APP_NAME,
+        user_id=USER_ID,
+        session_id=SESSION_ID,
+        state=state_context,
+    )
+
+    print("Session ID:", session.id)
+
+    runner = Runner(
+        agent=root_agent,
+        session_service=session_service,
+        app_name=APP_NAME,
+    )
+
+    user_query = types.Content(
+        role="user",
+        parts=[
+            types.Part(
+                text="What does the user want at the beginning of the post?",
+            )
+        ],
+    )
 
-runner = Runner(
-    agent=root_agent,
-    session_service=session_service,
-    app_name=APP_NAME,
-)
+    async for event in runner.run_async(
+        user_id=USER_ID,
+        session_id=SESSION_ID,
+        new_message=user_query,
+    ):
+        if event.is_final_response():
+            if event.content and event.content.parts:
+                print("Final response:", event.content.parts[0].text)
 
-user_query = types.Content(
-    role="user",
-    parts=[
-        types.Part(
-            text="What does the user want at the beginning of the post?",
-        )
-    ],
-)
+    session = await session_service.get_session(
+        app_name=APP_NAME,
+        user_id=USER_ID,
+        session_id=SESSION_ID,
+    )
 
-for event in runner.run(
-    user_id=USER_ID,
-    session_id=SESSION_ID,
-    new_message=user_query,
-):
-    if event.is_final_response():
-        if event.content and event.content.parts:
-            print("Final response:", event.content.parts[0].text)
+    print("\n\n\nSession state:", session.state)
 
-session = session_service.get_session(
-    app_name=APP_NAME,
-    user_id=USER_ID,
-    session_id=SESSION_ID,
-)
+    for key, value in session.state.items():
+        print(f"{key}: {value}")
 
-print("\n\n\nSession state:", session.state)
 
-for key, value in session.state.items():
-    print(f"{key}: {value}")
+# Run from the repository root: python -m sessions_and_agents.run_agent_with_session
+if __name__ == "__main__":
+    asyncio.run(main())
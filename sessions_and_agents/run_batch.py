@@ -0,0 +1,201 @@
+"""Runs many queries through the PostAgent concurrently.
+
+Reads one JSON object per line from an input file, runs each query with
+Runner.run_async (at most --concurrency at a time, sharing one session
+service), and appends one JSON result per line to the output file as each
+run finishes. Prints a throughput and latency summary at the end.
+
+Input lines need a query text under "query", "text" or "body" (or the field
+given with --text-field). Optional "user_id" and "id"/"request_id" are
+carried through to the output. By default every query gets a fresh session;
+with --sessions per-user each user_id keeps one session, and every line
+must then have a "user_id".
+
+Usage (from the repository root):
+    python -m sessions_and_agents.run_batch queries.jsonl results.jsonl --concurrency 16
+    python -m sessions_and_agents.run_batch queries.jsonl results.jsonl --sessions per-user
+    python -m sessions_and_agents.run_batch queries.jsonl results.jsonl --db sessions.db
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+from agent_telemetry import percentile
+from google.adk.runners import Runner
+from google.adk.sessions import BaseSessionService, InMemorySessionService
+from google.genai import types
+
+from .agent import root_agent
+from .run_agent_with_session import APP_NAME, USER_ID, state_context
+from .sqlite_session_service import SqliteSessionService
+
+TEXT_FIELDS = ("query", "text", "body")
+
+
+def read_queries(
+    path: str, text_field: Optional[str], require_user_id: bool = False
+) -> Iterator[Dict[str, Any]]:
+    """Yields queries lazily so large input files are never loaded at once.
+
+    Lines without a "user_id" run as USER_ID, unless `require_user_id` is set.
+    """
+    with open(path, encoding="utf-8") as input_file:
+        for line_number, line in enumerate(input_file, start=1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            fields = (text_field,) if text_field else TEXT_FIELDS
+            text = next((record[field] for field in fields if record.get(field)), None)
+            if text is None:
+                raise ValueError(f"{path}:{line_number} has no query text in {fields}.")
+            if require_user_id and not record.get("user_id"):
+                # They would all share USER_ID's session and run one at a time.
+                raise ValueError(
+                    f"{path}:{line_number} has no user_id, which --sessions per-user needs."
+                )
+            yield {
+                "id": record.get("id", record.get("request_id", line_number)),
+                "user_id": record.get("user_id", USER_ID),
+                "query": text,
+            }
+
+
+class BatchRunner:
+    """Runs queries with bounded concurrency and a bounded backlog.
+
+    With `reuse_sessions`, each user_id keeps one session across its queries
+    and that user's queries run one at a time, so turns are never interleaved
+    within a session. Otherwise every query gets a fresh session.
+    """
+
+    def __init__(
+        self,
+        runner: Runner,
+        session_service: BaseSessionService,
+        output_file,
+        concurrency: int,
+        reuse_sessions: bool,
+    ) -> None:
+        self.runner = runner
+        self.session_service = session_service
+        self.output_file = output_file
+        self.concurrency = concurrency
+        self.reuse_sessions = reuse_sessions
+        self.latencies: List[float] = []
+        self.errors = 0
+        self._user_sessions: Dict[str, str] = {}
+        self._user_locks: Dict[str, asyncio.Lock] = {}
+
+    async def run(self, queries: Iterator[Dict[str, Any]]) -> None:
+        # The queue bounds how far reading can get ahead of the workers (backpressure).
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        workers = [asyncio.create_task(self._worker(queue)) for _ in range(self.concurrency)]
+        for query in queries:
+            await queue.put(query)
+        for _ in workers:
+            await queue.put(None)
+        await asyncio.gather(*workers)
+
+    async def _worker(self, queue: asyncio.Queue) -> None:
+        while True:
+            query = await queue.get()
+            if query is None:
+                return
+            if self.reuse_sessions:
+                lock = self._user_locks.setdefault(query["user_id"], asyncio.Lock())
+                async with lock:
+                    result = await self._run_query(query)
+            else:
+                result = await self._run_query(query)
+            self.output_file.write(json.dumps(result) + "\n")
+            self.output_file.flush()
+
+    async def _session_id(self, user_id: str) -> str:
+        if self.reuse_sessions and user_id in self._user_sessions:
+            return self._user_sessions[user_id]
+        session = await self.session_service.create_session(
+            app_name=APP_NAME, user_id=user_id, state=dict(state_context)
+        )
+        if self.reuse_sessions:
+            self._user_sessions[user_id] = session.id
+        return session.id
+
+    async def _run_query(self, query: Dict[str, Any]) -> Dict[str, Any]:
+        start = time.perf_counter()
+        result: Dict[str, Any] = {"id": query["id"], "user_id": query["user_id"]}
+        try:
+            session_id = await self._session_id(query["user_id"])
+            result["session_id"] = session_id
+            message = types.Content(role="user", parts=[types.Part(text=query["query"])])
+            response = None
+            async for event in self.runner.run_async(
+                user_id=query["user_id"], session_id=session_id, new_message=message
+            ):
+                if event.is_final_response() and event.content and event.content.parts:
+                    response = event.content.parts[0].text
+            result["response"] = response
+        except Exception as e:
+            self.errors += 1
+            result["error"] = str(e)
+        latency = time.perf_counter() - start
+        self.latencies.append(latency)
+        result["latency_ms"] = round(latency * 1000, 2)
+        return result
+
+
+def print_summary(batch: BatchRunner, elapsed: float) -> None:
+    completed = len(batch.latencies)
+    print(f"\nCompleted {completed} queries ({batch.errors} errors) in {elapsed:.2f}s")
+    if not completed:
+        return
+    latencies = sorted(batch.latencies)
+    print(f"Throughput: {completed / elapsed:.2f} queries/s")
+    print(
+        "Latency: "
+        + ", ".join(
+            f"p{int(fraction * 100)} {percentile(latencies, fraction) * 1000:.0f} ms"
+            for fraction in (0.5, 0.95, 0.99)
+        )
+        + f", max {latencies[-1] * 1000:.0f} ms"
+    )
+
+
+async def main(args: argparse.Namespace) -> None:
+    if args.db:
+        session_service = SqliteSessionService(args.db)
+    else:
+        session_service = InMemorySessionService()
+    runner = Runner(agent=root_agent, session_service=session_service, app_name=APP_NAME)
+    reuse_sessions = args.sessions == "per-user"
+    with open(args.output, "a", encoding="utf-8") as output_file:
+        batch = BatchRunner(
+            runner,
+            session_service,
+            output_file,
+            concurrency=args.concurrency,
+            reuse_sessions=reuse_sessions,
+        )
+        start = time.perf_counter()
+        await batch.run(read_queries(args.input, args.text_field, reuse_sessions))
+        print_summary(batch, time.perf_counter() - start)
+    if args.db:
+        session_service.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a JSONL file of queries through the agent.")
+    parser.add_argument("input", help="JSONL file with one query per line.")
+    parser.add_argument("output", help="JSONL file results are appended to.")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument(
+        "--sessions",
+        choices=("fresh", "per-user"),
+        default="fresh",
+        help="Create a session for every query, or reuse one session per user_id.",
+    )
+    parser.add_argument("--text-field", help="Field holding the query text.")
+    parser.add_argument("--db", help="Persist sessions to this SQLite file instead of memory.")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,479 @@
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+from google.adk.events import Event
+from google.adk.sessions import BaseSessionService, Session, State
+from google.adk.sessions.base_session_service import GetSessionConfig, ListSessionsResponse
+
+from .state_interning import ValueInterner
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    last_update_time REAL NOT NULL,
+    PRIMARY KEY (app_name, user_id, id)
+);
+CREATE TABLE IF NOT EXISTS session_state (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (app_name, user_id, session_id, key)
+);
+CREATE TABLE IF NOT EXISTS user_state (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (app_name, user_id, key)
+);
+CREATE TABLE IF NOT EXISTS app_state (
+    app_name TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (app_name, key)
+);
+CREATE TABLE IF NOT EXISTS events (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS blobs (
+    hash TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_by_session ON events (app_name, user_id, session_id, seq);
+"""
+
+# Statements are constants so sqlite3's per-connection statement cache reuses
+# the compiled (prepared) form on every call.
+_UPSERT_SESSION = (
+    "INSERT INTO sessions (app_name, user_id, id, last_update_time) VALUES (?, ?, ?, ?) "
+    "ON CONFLICT (app_name, user_id, id) DO UPDATE SET last_update_time = excluded.last_update_time"
+)
+_UPSERT_SESSION_STATE = (
+    "INSERT INTO session_state (app_name, user_id, session_id, key, value) VALUES (?, ?, ?, ?, ?) "
+    "ON CONFLICT (app_name, user_id, session_id, key) DO UPDATE SET value = excluded.value"
+)
+_UPSERT_USER_STATE = (
+    "INSERT INTO user_state (app_name, user_id, key, value) VALUES (?, ?, ?, ?) "
+    "ON CONFLICT (app_name, user_id, key) DO UPDATE SET value = excluded.value"
+)
+_UPSERT_APP_STATE = (
+    "INSERT INTO app_state (app_name, key, value) VALUES (?, ?, ?) "
+    "ON CONFLICT (app_name, key) DO UPDATE SET value = excluded.value"
+)
+_INSERT_EVENT = (
+    "INSERT INTO events (app_name, user_id, session_id, timestamp, data) VALUES (?, ?, ?, ?, ?)"
+)
+_INSERT_BLOB = "INSERT OR IGNORE INTO blobs (hash, value) VALUES (?, ?)"
+_DELETE_BLOB = "DELETE FROM blobs WHERE hash = ?"
+_DELETE_SESSION = "DELETE FROM sessions WHERE app_name = ? AND user_id = ? AND id = ?"
+_DELETE_SESSION_STATE = (
+    "DELETE FROM session_state WHERE app_name = ? AND user_id = ? AND session_id = ?"
+)
+_DELETE_EVENTS = "DELETE FROM events WHERE app_name = ? AND user_id = ? AND session_id = ?"
+
+
+class SqliteSessionService(BaseSessionService):
+    """A session service that persists sessions to a local SQLite database.
+
+    The database runs in WAL mode. Appending an event inserts one event row and
+    upserts only the state keys in its delta; sessions are never rewritten as
+    a whole. Writes are buffered and committed in batches by a background
+    thread at least every `flush_interval_seconds`, or as soon as
+    `max_batch_size` writes are pending. Reads flush pending writes first, so
+    a caller always sees its own appends.
+
+    State values whose JSON is at least `intern_min_bytes` long are interned
+    (see ValueInterner): session state rows and event state deltas store a
+    reference, and the value is written once to the blobs table. Pass
+    `intern_min_bytes=None` to store every value inline. Blobs that nothing
+    references any more are deleted by `sweep_blobs()`, which `close()` runs
+    if sessions were deleted.
+
+    Write-behind trades durability for latency: a crash can lose up to one
+    flush interval of events. Use `flush_interval_seconds=0` to commit every
+    write immediately, and call `close()` on shutdown. A batch that fails to
+    commit is put back at the head of the queue and retried on the next
+    flush; the background thread logs the error, while `flush()` and
+    `close()` raise it.
+
+    SQLite calls block, so the async methods run them on a worker thread
+    (`asyncio.to_thread`) rather than on the event loop. Buffered appends only
+    take that hop when the writer has to commit itself.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        flush_interval_seconds: float = 0.05,
+        max_batch_size: int = 512,
+        intern_min_bytes: Optional[int] = 256,
+    ) -> None:
+        self.db_path = db_path
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_batch_size = max_batch_size
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._db_lock = threading.Lock()
+        self.interner = ValueInterner(intern_min_bytes) if intern_min_bytes else None
+        self._pending: List[Tuple[str, tuple]] = []
+        self._pending_lock = threading.Lock()
+        self._flush_requested = threading.Event()
+        # Set while pending writes touch app: or user: state shared across sessions.
+        self._shared_state_dirty = False
+        # Set by delete_session: blobs may have lost their last reference.
+        self._blobs_orphaned = False
+        self._closed = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        if flush_interval_seconds > 0:
+            self._flusher = threading.Thread(
+                target=self._flush_loop, name="SqliteSessionFlusher", daemon=True
+            )
+            self._flusher.start()
+
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[Dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> Session:
+        session_id = session_id.strip() if session_id and session_id.strip() else str(uuid.uuid4())
+        now = time.time()
+        writes = [(_UPSERT_SESSION, (app_name, user_id, session_id, now))]
+        writes.extend(self._state_writes(app_name, user_id, session_id, state or {}))
+        await self._write(writes)
+        session = Session(
+            app_name=app_name,
+            user_id=user_id,
+            id=session_id,
+            state=dict(state or {}),
+            last_update_time=now,
+        )
+        return await asyncio.to_thread(self._merge_shared_state, session)
+
+    async def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig] = None,
+    ) -> Optional[Session]:
+        return await asyncio.to_thread(
+            self._load_session, app_name, user_id, session_id, config
+        )
+
+    def _load_session(
+        self, app_name: str, user_id: str, session_id: str, config: Optional[GetSessionConfig]
+    ) -> Optional[Session]:
+        self.flush()
+        with self._db_lock:
+            row = self._conn.execute(
+                "SELECT last_update_time FROM sessions WHERE app_name = ? AND user_id = ? AND id = ?",
+                (app_name, user_id, session_id),
+            ).fetchone()
+            if row is None:
+                return None
+            state = {
+                key: self._decode_locked(json.loads(value))
+                for key, value in self._conn.execute(
+                    "SELECT key, value FROM session_state "
+                    "WHERE app_name = ? AND user_id = ? AND session_id = ?",
+                    (app_name, user_id, session_id),
+                ).fetchall()
+            }
+            events = []
+            for (data,) in self._select_events(app_name, user_id, session_id, config):
+                event = Event.model_validate_json(data)
+                if event.actions.state_delta:
+                    for key, value in event.actions.state_delta.items():
+                        event.actions.state_delta[key] = self._decode_locked(value)
+                events.append(event)
+        session = Session(
+            app_name=app_name,
+            user_id=user_id,
+            id=session_id,
+            state=state,
+            events=events,
+            last_update_time=row[0],
+        )
+        return self._merge_shared_state(session)
+
+    def _select_events(
+        self, app_name: str, user_id: str, session_id: str, config: Optional[GetSessionConfig]
+    ) -> List[Tuple[str]]:
+        query = "SELECT data FROM events WHERE app_name = ? AND user_id = ? AND session_id = ?"
+        params: List[Any] = [app_name, user_id, session_id]
+        if config and config.after_timestamp:
+            query += " AND timestamp >= ?"
+            params.append(config.after_timestamp)
+        if config and config.num_recent_events:
+            rows = self._conn.execute(
+                query + " ORDER BY seq DESC LIMIT ?", (*params, config.num_recent_events)
+            ).fetchall()
+            rows.reverse()
+            return rows
+        return self._conn.execute(query + " ORDER BY seq", params).fetchall()
+
+    async def list_sessions(self, *, app_name: str, user_id: str) -> ListSessionsResponse:
+        return await asyncio.to_thread(self._list_sessions, app_name, user_id)
+
+    def _list_sessions(self, app_name: str, user_id: str) -> ListSessionsResponse:
+        self.flush()
+        with self._db_lock:
+            rows = self._conn.execute(
+                "SELECT id, last_update_time FROM sessions WHERE app_name = ? AND user_id = ?",
+                (app_name, user_id),
+            ).fetchall()
+        return ListSessionsResponse(
+            sessions=[
+                Session(app_name=app_name, user_id=user_id, id=session_id, last_update_time=updated)
+                for session_id, updated in rows
+            ]
+        )
+
+    async def delete_session(self, *, app_name: str, user_id: str, session_id: str) -> None:
+        key = (app_name, user_id, session_id)
+        self._blobs_orphaned = True
+        await self._write(
+            [(_DELETE_EVENTS, key), (_DELETE_SESSION_STATE, key), (_DELETE_SESSION, key)]
+        )
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        if event.partial:
+            return event
+        await super().append_event(session=session, event=event)
+        session.last_update_time = event.timestamp
+
+        app_name, user_id, session_id = session.app_name, session.user_id, session.id
+        writes: List[Tuple[str, tuple]] = []
+        stored_event = event
+        if self.interner and event.actions and event.actions.state_delta:
+            # Serialize a shallow copy whose delta holds references, not the values.
+            delta = {}
+            for key, value in event.actions.state_delta.items():
+                delta[key], new_blob = self.interner.encode(value)
+                if new_blob:
+                    writes.append((_INSERT_BLOB, new_blob))
+            if any(delta[key] is not value for key, value in event.actions.state_delta.items()):
+                stored_event = event.model_copy(
+                    update={"actions": event.actions.model_copy(update={"state_delta": delta})}
+                )
+        writes.append(
+            (
+                _INSERT_EVENT,
+                (
+                    app_name,
+                    user_id,
+                    session_id,
+                    event.timestamp,
+                    stored_event.model_dump_json(exclude_none=True),
+                ),
+            )
+        )
+        writes.append((_UPSERT_SESSION, (app_name, user_id, session_id, event.timestamp)))
+        if event.actions and event.actions.state_delta:
+            writes.extend(
+                self._state_writes(app_name, user_id, session_id, event.actions.state_delta)
+            )
+        await self._write(writes)
+        return event
+
+    def _merge_shared_state(self, session: Session) -> Session:
+        if self._shared_state_dirty:
+            self.flush()
+        with self._db_lock:
+            for key, value in self._conn.execute(
+                "SELECT key, value FROM app_state WHERE app_name = ?", (session.app_name,)
+            ).fetchall():
+                session.state[State.APP_PREFIX + key] = self._decode_locked(json.loads(value))
+            for key, value in self._conn.execute(
+                "SELECT key, value FROM user_state WHERE app_name = ? AND user_id = ?",
+                (session.app_name, session.user_id),
+            ).fetchall():
+                session.state[State.USER_PREFIX + key] = self._decode_locked(json.loads(value))
+        return session
+
+    def _decode_locked(self, value: Any) -> Any:
+        if self.interner is None:
+            return value
+        return self.interner.decode(value, self._load_blob_locked)
+
+    def _load_blob_locked(self, value_hash: str) -> Optional[str]:
+        row = self._conn.execute("SELECT value FROM blobs WHERE hash = ?", (value_hash,)).fetchone()
+        return row[0] if row else None
+
+    def _state_writes(
+        self, app_name: str, user_id: str, session_id: str, state: Dict[str, Any]
+    ) -> List[Tuple[str, tuple]]:
+        writes = []
+        for key, value in state.items():
+            if key.startswith(State.TEMP_PREFIX):
+                continue
+            if self.interner:
+                value, new_blob = self.interner.encode(value)
+                if new_blob:
+                    writes.append((_INSERT_BLOB, new_blob))
+            encoded = json.dumps(value)
+            if key.startswith(State.APP_PREFIX):
+                writes.append(
+                    (_UPSERT_APP_STATE, (app_name, key.removeprefix(State.APP_PREFIX), encoded))
+                )
+            elif key.startswith(State.USER_PREFIX):
+                writes.append(
+                    (
+                        _UPSERT_USER_STATE,
+                        (app_name, user_id, key.removeprefix(State.USER_PREFIX), encoded),
+                    )
+                )
+            else:
+                writes.append((_UPSERT_SESSION_STATE, (app_name, user_id, session_id, key, encoded)))
+        return writes
+
+    def interning_stats(self) -> Dict[str, int]:
+        """Returns how many values were interned and the net bytes saved so far."""
+        return self.interner.stats() if self.interner else {}
+
+    async def _write(self, writes: List[Tuple[str, tuple]]) -> None:
+        shared = any(sql in (_UPSERT_APP_STATE, _UPSERT_USER_STATE) for sql, _ in writes)
+        if self._flusher is None:
+            await asyncio.to_thread(self._commit, writes)
+            return
+        with self._pending_lock:
+            self._pending.extend(writes)
+            self._shared_state_dirty |= shared
+            pending = len(self._pending)
+        if pending >= self.max_batch_size * 2:
+            # The flusher is falling behind; make the writer pay for the commit.
+            await asyncio.to_thread(self.flush)
+        elif pending >= self.max_batch_size:
+            self._flush_requested.set()
+
+    def flush(self) -> None:
+        """Commits all pending writes in one transaction.
+
+        If the commit fails, the writes are put back at the head of the queue
+        (ahead of anything appended meanwhile) and the error is raised.
+        """
+        with self._db_lock:
+            # Taking the batch under the database lock keeps commits in write order.
+            with self._pending_lock:
+                writes, self._pending = self._pending, []
+                shared, self._shared_state_dirty = self._shared_state_dirty, False
+            if not writes:
+                return
+            try:
+                self._commit_locked(writes)
+            except Exception:
+                with self._pending_lock:
+                    self._pending[:0] = writes
+                    self._shared_state_dirty |= shared
+                raise
+
+    def _commit(self, writes: List[Tuple[str, tuple]]) -> None:
+        with self._db_lock:
+            try:
+                self._commit_locked(writes)
+            except Exception:
+                # Nothing is queued without a flush thread, so these blobs were never written.
+                if self.interner:
+                    self.interner.release(params for sql, params in writes if sql == _INSERT_BLOB)
+                raise
+
+    def _commit_locked(self, writes: List[Tuple[str, tuple]]) -> None:
+        self._conn.execute("BEGIN")
+        try:
+            # Consecutive writes with the same statement go through one executemany call.
+            start = 0
+            while start < len(writes):
+                sql = writes[start][0]
+                end = start
+                while end < len(writes) and writes[end][0] == sql:
+                    end += 1
+                self._conn.executemany(sql, [params for _, params in writes[start:end]])
+                start = end
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+        if self.interner:
+            self.interner.mark_stored(params for sql, params in writes if sql == _INSERT_BLOB)
+
+    def sweep_blobs(self) -> int:
+        """Deletes blobs that no state row or event references; returns how many.
+
+        This reads every state row and event, and a reference handed out by an
+        append that is still being built could be missed, so run it while no
+        writes are in flight (on shutdown, or between batches).
+        """
+        if self.interner is None:
+            return 0
+        self.flush()
+        with self._db_lock:
+            referenced = set()
+            for query in (
+                "SELECT value FROM session_state",
+                "SELECT value FROM user_state",
+                "SELECT value FROM app_state",
+                "SELECT data FROM events",
+            ):
+                for (text,) in self._conn.execute(query):
+                    referenced.update(self.interner.references(text))
+            orphans = [
+                value_hash
+                for (value_hash,) in self._conn.execute("SELECT hash FROM blobs").fetchall()
+                if value_hash not in referenced
+            ]
+            if orphans:
+                self._commit_locked([(_DELETE_BLOB, (value_hash,)) for value_hash in orphans])
+            self.interner.forget(orphans)
+            self._blobs_orphaned = False
+        return len(orphans)
+
+    def _flush_loop(self) -> None:
+        while not self._closed.is_set():
+            self._flush_requested.wait(self.flush_interval_seconds)
+            self._flush_requested.clear()
+            try:
+                self.flush()
+            except Exception:
+                # The batch stays queued; the next flush (or close) retries it.
+                logger.exception("Flushing %d pending session writes failed", len(self._pending))
+
+    def close(self) -> None:
+        """Flushes pending writes, stops the flush thread and closes the database.
+
+        Raises the commit error if the pending writes still cannot be flushed.
+        """
+        self._closed.set()
+        self._flush_requested.set()
+        if self._flusher is not None:
+            self._flusher.join()
+            self._flusher = None
+        try:
+            self.flush()
+            if self._blobs_orphaned:
+                self.sweep_blobs()
+        finally:
+            self._conn.close()
+
@@ -0,0 +1,159 @@
+import hashlib
+import json
+import re
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+# A stored state value of the form {"$blob": "<hash>"} refers to an interned value.
+REF_KEY = "$blob"
+# A user value that would itself read as a reference is stored as {"$value": value}.
+ESCAPE_KEY = "$value"
+_REFERENCE_PATTERN = re.compile(r'"\$blob":\s*"([0-9a-f]{32})"')
+
+
+class ValueInterner:
+    """Stores large state values once, keyed by the hash of their JSON encoding.
+
+    Values whose JSON encoding is at least `min_bytes` long are replaced by a
+    small reference; the value itself is persisted once as a blob. Seeding
+    every session with the same `user_post_preferences` text, or repeating a
+    large value in many state deltas, then costs one blob plus a ~50-byte
+    reference per copy.
+
+    Decoded strings are cached by hash, so sessions loaded from the same blob
+    share one string object instead of holding a copy each. Lists and dicts
+    are re-parsed from cached JSON on every load, because callbacks may
+    mutate them in place.
+
+    A blob only counts as stored once the caller reports it committed
+    (`mark_stored`); until then every encode of the value hands the blob out
+    again, so a dropped batch never leaves references to a missing blob.
+    """
+
+    def __init__(self, min_bytes: int = 256, max_cached: int = 1024) -> None:
+        self.min_bytes = min_bytes
+        self.max_cached = max_cached
+        # str value -> (hash, encoded size). str objects cache their own hash,
+        # so re-encoding the same string object costs one dict lookup.
+        self._hashes_by_text: "OrderedDict[str, Tuple[str, int]]" = OrderedDict()
+        # hash -> (True, decoded str) or (False, JSON text of a list/dict value).
+        self._values_by_hash: "OrderedDict[str, Tuple[bool, Any]]" = OrderedDict()
+        # Blobs known to be in the database, and blobs handed out but not committed yet.
+        self._stored_hashes = set()
+        self._pending_hashes = set()
+        self.values_interned = 0
+        self.blobs_stored = 0
+        self.bytes_saved = 0
+
+    def encode(self, value: Any) -> Tuple[Any, Optional[Tuple[str, str]]]:
+        """Returns (value or a reference to it, (hash, JSON) of a new blob to persist or None)."""
+        if isinstance(value, str):
+            # json.dumps escapes non-ASCII, so the encoding is at least len + 2 bytes.
+            if len(value) + 2 < self.min_bytes:
+                return value, None
+            known = self._hashes_by_text.get(value)
+            if known is not None and known[0] in self._stored_hashes:
+                self._hashes_by_text.move_to_end(value)
+                return self._reference(known[0], known[1]), None
+        elif value is None or isinstance(value, (bool, int, float)):
+            return value, None
+
+        encoded = json.dumps(value)
+        size = len(encoded)
+        if size < self.min_bytes:
+            return ({ESCAPE_KEY: value} if _is_marker(value) else value), None
+        value_hash = hashlib.blake2b(encoded.encode("ascii"), digest_size=16).hexdigest()
+        if isinstance(value, str):
+            self._remember_text(value, value_hash, size)
+        new_blob = None
+        if value_hash not in self._stored_hashes and value_hash not in self._pending_hashes:
+            self._pending_hashes.add(value_hash)
+            self.bytes_saved -= size
+            new_blob = (value_hash, encoded)
+        return self._reference(value_hash, size), new_blob
+
+    def mark_stored(self, blobs: Iterable[Tuple[str, str]]) -> None:
+        """Records that `blobs` returned by `encode` were committed."""
+        for value_hash, _ in blobs:
+            if value_hash not in self._stored_hashes:
+                self._stored_hashes.add(value_hash)
+                self.blobs_stored += 1
+            self._pending_hashes.discard(value_hash)
+
+    def release(self, blobs: Iterable[Tuple[str, str]]) -> None:
+        """Records that `blobs` returned by `encode` were never written, so they are re-issued."""
+        for value_hash, encoded in blobs:
+            if value_hash in self._pending_hashes:
+                self._pending_hashes.discard(value_hash)
+                self.bytes_saved += len(encoded)
+
+    def forget(self, value_hashes: Iterable[str]) -> None:
+        """Drops deleted blobs, so encoding their value again writes a new blob."""
+        forgotten = set(value_hashes)
+        if not forgotten:
+            return
+        self._stored_hashes -= forgotten
+        for value_hash in forgotten:
+            self._values_by_hash.pop(value_hash, None)
+        for text, (value_hash, _) in list(self._hashes_by_text.items()):
+            if value_hash in forgotten:
+                del self._hashes_by_text[text]
+
+    def _remember_text(self, text: str, value_hash: str, size: int) -> None:
+        self._hashes_by_text[text] = (value_hash, size)
+        if len(self._hashes_by_text) > self.max_cached:
+            self._hashes_by_text.popitem(last=False)
+
+    def _reference(self, value_hash: str, size: int) -> Dict[str, str]:
+        reference = {REF_KEY: value_hash}
+        self.values_interned += 1
+        self.bytes_saved += size - len(json.dumps(reference))
+        return reference
+
+    def decode(self, value: Any, load_blob: Callable[[str], Optional[str]]) -> Any:
+        """Resolves a reference produced by `encode`; other values are returned as is."""
+        if not _is_marker(value):
+            return value
+        if ESCAPE_KEY in value:
+            return value[ESCAPE_KEY]
+        value_hash = value[REF_KEY]
+        cached = self._values_by_hash.get(value_hash)
+        if cached is not None:
+            self._values_by_hash.move_to_end(value_hash)
+            is_text, cached_value = cached
+            return cached_value if is_text else json.loads(cached_value)
+
+        encoded = load_blob(value_hash)
+        if encoded is None:
+            raise KeyError(f"Interned state value {value_hash} is missing.")
+        decoded = json.loads(encoded)
+        if isinstance(decoded, str):
+            self._values_by_hash[value_hash] = (True, decoded)
+            self._remember_text(decoded, value_hash, len(encoded))
+        else:
+            self._values_by_hash[value_hash] = (False, encoded)
+        if len(self._values_by_hash) > self.max_cached:
+            self._values_by_hash.popitem(last=False)
+        self._stored_hashes.add(value_hash)
+        return decoded
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "values_interned": self.values_interned,
+            "blobs_stored": self.blobs_stored,
+            "bytes_saved": self.bytes_saved,
+        }
+
+    @staticmethod
+    def references(text: str) -> Iterator[str]:
+        """Yields the blob hashes referenced anywhere in a stored JSON text."""
+        for match in _REFERENCE_PATTERN.finditer(text):
+            yield match.group(1)
+
+
+def _is_marker(value: Any) -> bool:
+    return (
+        isinstance(value, dict)
+        and len(value) == 1
+        and (REF_KEY in value or ESCAPE_KEY in value)
+    )
@@ -4,6 +4,8 @@ from typing import List, Optional
 from google.adk.agents import LlmAgent, SequentialAgent
 from pydantic import BaseModel, Field
 
+from instruction_templates import InstructionTemplate
+
 
 class ConsultantTypeEnum(PyEnum):
     PSYCHOLOGIST = "psychologist"
@@ -70,7 +72,7 @@ Based on the provided input {problem_analysis_result} generate the following in
 advice_generator_agent = LlmAgent(
     name="AdviceGeneratorAgent",
     model="gemini-2.0-flash",
-    instruction=advice_generator_instructions,
+    instruction=InstructionTemplate(advice_generator_instructions),
     input_schema=ProblemAnalysis,
     output_schema=ConsultationResp,
     output_key="final_consultation_response",
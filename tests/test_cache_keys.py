@@ -0,0 +1,51 @@
+from typing import List
+
+from agents_and_callbacks.example_05_tool_response_transformation_caching.cache_keys import (
+    CacheKeyBuilder,
+)
+
+
+def convert(amount: float, from_currency: str, to_currency: str, note: str = "") -> dict:
+    return {}
+
+
+def schedule(date: str, attendees: List[str], tool_context=None) -> dict:
+    return {}
+
+
+def test_floats_are_quantized():
+    keys = CacheKeyBuilder(float_digits=2)
+    args = {"from_currency": "USD", "to_currency": "EUR", "note": ""}
+    assert keys.build("convert", convert, dict(args, amount=100)) == keys.build(
+        "convert", convert, dict(args, amount=100.001)
+    )
+
+
+def test_case_folding_is_opt_in():
+    keys = CacheKeyBuilder(case_insensitive={"from_currency", "to_currency"})
+    upper = {"amount": 1.0, "from_currency": "USD", "to_currency": "EUR", "note": "Hi"}
+    lower = {"amount": 1.0, "from_currency": " usd", "to_currency": "eur", "note": "Hi"}
+    assert keys.build("convert", convert, upper) == keys.build("convert", convert, lower)
+    assert keys.build("convert", convert, upper) != keys.build(
+        "convert", convert, dict(upper, note="hi")
+    )
+
+
+def test_strings_are_kept_as_given_by_default():
+    keys = CacheKeyBuilder()
+    key = keys.build("schedule", schedule, {"date": "2025-12-25", "attendees": ["Ana", "ben"]})
+    assert key == ("schedule", "2025-12-25", ("Ana", "ben"))
+
+
+def test_undeclared_arguments_are_part_of_the_key():
+    keys = CacheKeyBuilder()
+    args = {"date": "2025-12-25", "attendees": []}
+    assert keys.build("schedule", schedule, args) != keys.build(
+        "schedule", schedule, dict(args, room="B")
+    )
+
+
+def test_digest_is_fixed_size():
+    keys = CacheKeyBuilder()
+    digest = keys.build("schedule", schedule, {"date": "x", "attendees": []}, digest=True)
+    assert isinstance(digest, bytes) and len(digest) == 16
@@ -0,0 +1,175 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from agents_and_callbacks.example_05_tool_response_transformation_caching import (
+    agent as currency_agent,
+)
+from agents_and_callbacks.example_05_tool_response_transformation_caching.cache import (
+    ToolResultCache,
+)
+
+ARGS = {"amount": 100, "from_currency": "USD", "to_currency": "EUR"}
+TOOL = SimpleNamespace(name="convert_currency_tool", func=currency_agent.convert_currency_tool)
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(
+        currency_agent, "TOOL_RESULT_CACHE", ToolResultCache(ttl_seconds=10, clock=clock)
+    )
+    return clock
+
+
+def call_tool(args=ARGS):
+    """Runs a call the way ADK does: the after callback also sees short-circuited results."""
+
+    async def run():
+        tool_context = SimpleNamespace(state={})
+        response = await currency_agent.before_tool_callback_cache(TOOL, args, tool_context)
+        if response is None:
+            response = currency_agent.convert_currency_tool(**args)
+        return await currency_agent.after_tool_callback_format_and_cache(
+            TOOL, args, tool_context, response
+        )
+
+    return asyncio.run(run())
+
+
+def test_cache_hits_are_not_cached_again(clock):
+    first = call_tool()
+    for _ in range(3):
+        clock.now += 1
+        hit = call_tool()
+
+    assert "cached_result" not in first["raw_details"]
+    assert hit["raw_details"]["cached_result"] == first["raw_details"]
+    assert hit["result_summary"] == first["result_summary"]
+    cached = currency_agent.TOOL_RESULT_CACHE.get(currency_agent._generate_cache_key(TOOL, ARGS))
+    assert cached == first["raw_details"]
+
+
+def test_cache_hits_do_not_extend_the_ttl(clock):
+    call_tool()
+    clock.now = 9
+    call_tool()
+    clock.now = 10
+
+    key = currency_agent._generate_cache_key(TOOL, ARGS)
+    assert currency_agent.TOOL_RESULT_CACHE.get(key) is None
+
+
+def test_errors_are_not_cached(clock):
+    args = {"amount": 1, "from_currency": "USD", "to_currency": "XYZ"}
+    call_tool(args)
+
+    assert len(currency_agent.TOOL_RESULT_CACHE) == 0
+    assert len(currency_agent.IN_FLIGHT_TOOL_CALLS) == 0
+
+
+def test_leader_failure_wakes_waiting_callers(clock):
+    calls = []
+
+    async def convert_currency_tool(amount: float, from_currency: str, to_currency: str):
+        calls.append(amount)
+        await asyncio.sleep(0.05)
+        if len(calls) == 1:
+            raise RuntimeError("rates unavailable")
+        return currency_agent.convert_currency_tool(amount, from_currency, to_currency)
+
+    tool = currency_agent.SingleFlightTool(convert_currency_tool)
+
+    async def call(args):
+        tool_context = SimpleNamespace(state={})
+        response = await currency_agent.before_tool_callback_cache(tool, args, tool_context)
+        if response is None:
+            response = await tool.run_async(args=args, tool_context=tool_context)
+        return await currency_agent.after_tool_callback_format_and_cache(
+            tool, args, tool_context, response
+        )
+
+    async def run():
+        leader = asyncio.create_task(call(dict(ARGS)))
+        await asyncio.sleep(0)
+        follower = await asyncio.wait_for(call(dict(ARGS)), timeout=5)
+        with pytest.raises(RuntimeError):
+            await leader
+        return follower
+
+    follower = asyncio.run(run())
+    assert follower["raw_details"]["converted_amount"] == pytest.approx(92.0)
+    assert len(calls) == 2
+    assert len(currency_agent.IN_FLIGHT_TOOL_CALLS) == 0
+
+
+def test_any_cacheable_tool_is_cached_with_one_key_per_call(clock, monkeypatch):
+    def lookup_rate(from_currency: str, to_currency: str) -> dict:
+        return {"rate": 0.92}
+
+    tool = SimpleNamespace(name="lookup_rate", func=lookup_rate)
+    monkeypatch.setattr(currency_agent, "CACHEABLE_TOOLS", {"lookup_rate"})
+    built = []
+    generate_cache_key = currency_agent._generate_cache_key
+    monkeypatch.setattr(
+        currency_agent,
+        "_generate_cache_key",
+        lambda *args: built.append(args) or generate_cache_key(*args),
+    )
+    args = {"from_currency": "USD", "to_currency": "EUR"}
+
+    async def call():
+        tool_context = SimpleNamespace(state={})
+        response = await currency_agent.before_tool_callback_cache(tool, args, tool_context)
+        if response is None:
+            response = lookup_rate(**args)
+        return await currency_agent.after_tool_callback_format_and_cache(
+            tool, args, tool_context, response
+        )
+
+    assert asyncio.run(call()) == {"rate": 0.92}
+    assert len(built) == 1
+    assert asyncio.run(call()) == {"rate": 0.92}
+    assert currency_agent.TOOL_RESULT_CACHE.stats()["hits"] == 1
+
+
+def test_cancelled_leader_wakes_waiting_callers(clock):
+    calls = []
+
+    async def convert_currency_tool(amount: float, from_currency: str, to_currency: str):
+        calls.append(amount)
+        await asyncio.sleep(0.05 if len(calls) > 1 else 10)
+        return currency_agent.convert_currency_tool(amount, from_currency, to_currency)
+
+    tool = currency_agent.SingleFlightTool(convert_currency_tool)
+
+    async def call(args):
+        tool_context = SimpleNamespace(state={})
+        response = await currency_agent.before_tool_callback_cache(tool, args, tool_context)
+        if response is None:
+            response = await tool.run_async(args=args, tool_context=tool_context)
+        return await currency_agent.after_tool_callback_format_and_cache(
+            tool, args, tool_context, response
+        )
+
+    async def run():
+        leader = asyncio.create_task(call(dict(ARGS)))
+        await asyncio.sleep(0.01)
+        follower = asyncio.create_task(call(dict(ARGS)))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        return await asyncio.wait_for(follower, timeout=5)
+
+    follower = asyncio.run(run())
+    assert follower["raw_details"]["converted_amount"] == pytest.approx(92.0)
+    assert len(calls) == 2
+    assert len(currency_agent.IN_FLIGHT_TOOL_CALLS) == 0
@@ -0,0 +1,58 @@
+import json
+
+from google.genai import types
+
+from agents_and_callbacks.example_02_model_input_sanitization.agent import PII_REDACTOR
+from agents_and_callbacks.example_02_model_input_sanitization.incremental import (
+    IncrementalSanitizer,
+)
+
+CARD = "4111 1111 1111 1111"
+
+
+def history(turns):
+    """Rebuilds the raw contents, as ADK does from the session events on every call."""
+    contents = []
+    for index, text in enumerate(turns):
+        contents.append(types.Content(role="user", parts=[types.Part(text=text)]))
+        if index < len(turns) - 1:
+            contents.append(types.Content(role="model", parts=[types.Part(text="ok")]))
+    return contents
+
+
+def run_turns(sanitizer, turns):
+    marker = None
+    for count in range(1, len(turns) + 1):
+        contents = history(turns[:count])
+        marker, _ = sanitizer.sanitize(contents, json.loads(json.dumps(marker)))
+    return contents, marker
+
+
+def test_earlier_pii_stays_redacted():
+    turns = [f"My card is {CARD}", "What is 2 + 2?", "And 3 + 3?"]
+    contents, _ = run_turns(IncrementalSanitizer(PII_REDACTOR), turns)
+
+    assert CARD not in contents[0].parts[0].text
+    assert "[REDACTED PII]" in contents[0].parts[0].text
+    assert contents[-1].parts[0].text == "And 3 + 3?"
+
+
+def test_marker_holds_no_text():
+    turns = [f"My card is {CARD}"] + [f"Question {index} " + "x" * 500 for index in range(10)]
+    _, marker = run_turns(IncrementalSanitizer(PII_REDACTOR), turns)
+
+    assert marker["count"] == 21
+    assert marker["pii_parts"] == [[0, 0]]
+    assert len(json.dumps(marker)) < 200
+
+
+def test_rewritten_history_is_scanned_again():
+    sanitizer = IncrementalSanitizer(PII_REDACTOR)
+    _, marker = run_turns(sanitizer, ["Hello", "Hi again"])
+
+    # Same length, but the last scanned entry changed.
+    contents = history(["Hello", f"My card is {CARD}"])
+    new_marker, counts = sanitizer.sanitize(contents, marker)
+
+    assert counts == {"CREDIT_CARD": 1}
+    assert new_marker["pii_parts"] == [[2, 0]]
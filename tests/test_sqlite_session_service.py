@@ -0,0 +1,118 @@
+import asyncio
+import sqlite3
+
+import pytest
+from google.adk.events import Event, EventActions
+
+from sessions_and_agents.sqlite_session_service import SqliteSessionService
+
+APP, USER = "app", "user"
+
+
+@pytest.fixture
+def service(tmp_path):
+    # A long interval keeps the background flusher out of the way.
+    service = SqliteSessionService(str(tmp_path / "sessions.db"), flush_interval_seconds=60)
+    yield service
+    if service._flusher is not None:
+        service.close()
+
+
+def fail_commits(monkeypatch, service, times):
+    commit = service._commit_locked
+    failures = [times]
+
+    def flaky_commit(writes):
+        if failures[0]:
+            failures[0] -= 1
+            raise sqlite3.OperationalError("database is locked")
+        commit(writes)
+
+    monkeypatch.setattr(service, "_commit_locked", flaky_commit)
+
+
+def append_turn(service, session, turn):
+    event = Event(author="user", actions=EventActions(state_delta={"turn": turn}))
+    asyncio.run(service.append_event(session, event))
+
+
+def test_failed_flush_keeps_writes_queued(monkeypatch, service):
+    session = asyncio.run(service.create_session(app_name=APP, user_id=USER, session_id="s"))
+    append_turn(service, session, 1)
+    fail_commits(monkeypatch, service, times=1)
+
+    with pytest.raises(sqlite3.OperationalError):
+        service.flush()
+    append_turn(service, session, 2)
+    service.flush()
+
+    loaded = asyncio.run(service.get_session(app_name=APP, user_id=USER, session_id="s"))
+    assert [event.actions.state_delta["turn"] for event in loaded.events] == [1, 2]
+    assert loaded.state["turn"] == 2
+
+
+def test_close_raises_when_writes_cannot_be_flushed(monkeypatch, service):
+    asyncio.run(service.create_session(app_name=APP, user_id=USER, session_id="s"))
+    fail_commits(monkeypatch, service, times=2)
+
+    with pytest.raises(sqlite3.OperationalError):
+        service.close()
+
+
+LARGE = "Use a hook under 60 characters, then bullet points and a question.\n" * 10
+
+
+def reopen(tmp_path, service, **kwargs):
+    service.close()
+    return SqliteSessionService(str(tmp_path / "sessions.db"), **kwargs)
+
+
+def test_interned_values_survive_a_failed_commit_and_restart(monkeypatch, tmp_path):
+    service = SqliteSessionService(str(tmp_path / "sessions.db"), flush_interval_seconds=0)
+    fail_commits(monkeypatch, service, times=1)
+    with pytest.raises(sqlite3.OperationalError):
+        asyncio.run(
+            service.create_session(app_name=APP, user_id=USER, session_id="a", state={"g": LARGE})
+        )
+    # The dropped blob is written again with the next session that uses the value.
+    asyncio.run(
+        service.create_session(app_name=APP, user_id=USER, session_id="b", state={"g": LARGE})
+    )
+
+    service = reopen(tmp_path, service)
+    asyncio.run(
+        service.create_session(app_name=APP, user_id=USER, session_id="c", state={"g": LARGE})
+    )
+    service = reopen(tmp_path, service)
+    for session_id in ("b", "c"):
+        loaded = asyncio.run(
+            service.get_session(app_name=APP, user_id=USER, session_id=session_id)
+        )
+        assert loaded.state["g"] == LARGE
+    service.close()
+
+
+def test_values_shaped_like_references_round_trip(service):
+    state = {"small": {"$blob": "not-a-hash"}, "escaped": {"$value": 1}, "large": {"$blob": LARGE}}
+    asyncio.run(service.create_session(app_name=APP, user_id=USER, session_id="s", state=state))
+    loaded = asyncio.run(service.get_session(app_name=APP, user_id=USER, session_id="s"))
+    assert {key: loaded.state[key] for key in state} == state
+
+
+def test_unreferenced_blobs_are_swept_on_close(tmp_path, service):
+    for session_id in ("a", "b"):
+        asyncio.run(
+            service.create_session(
+                app_name=APP,
+                user_id=USER,
+                session_id=session_id,
+                state={session_id: LARGE + session_id},
+            )
+        )
+    asyncio.run(service.delete_session(app_name=APP, user_id=USER, session_id="a"))
+
+    service = reopen(tmp_path, service, flush_interval_seconds=60)
+    blobs = service._conn.execute("SELECT COUNT(*) FROM blobs").fetchone()[0]
+    loaded = asyncio.run(service.get_session(app_name=APP, user_id=USER, session_id="b"))
+    assert blobs == 1
+    assert loaded.state["b"] == LARGE + "b"
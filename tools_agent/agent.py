@@ -1,6 +1,41 @@
+import os
+
+import httpx
 from google.adk.agents import Agent
 from google.adk.tools import google_search
 
+from .http_client import AsyncHttpClient
+from .prefetch import PrefetchBuffer
+
+# Point RANDOMUSER_API_URL at a stub server to run the tool offline.
+RANDOMUSER_API_URL = os.environ.get("RANDOMUSER_API_URL", "https://randomuser.me/api/")
+# Shared by every call, so connections are reused. Random users are not
+# cached unless RANDOMUSER_CACHE_TTL_SECONDS is set.
+randomuser_client = AsyncHttpClient(
+    timeout_seconds=float(os.environ.get("RANDOMUSER_TIMEOUT_SECONDS", "10")),
+    cache_ttl_seconds=float(os.environ.get("RANDOMUSER_CACHE_TTL_SECONDS", "0")),
+)
+
+
+async def fetch_randomusers(count: int) -> list:
+    users = await randomuser_client.get_json(RANDOMUSER_API_URL, params={"results": count})
+    return users['results']
+
+
+# Users are fetched RANDOMUSER_PREFETCH_BATCH at a time and handed out one per
+# call; set it to 0 to make one request per call instead.
+RANDOMUSER_PREFETCH_BATCH = int(os.environ.get("RANDOMUSER_PREFETCH_BATCH", "25"))
+randomuser_prefetcher = (
+    PrefetchBuffer(
+        fetch_randomusers,
+        capacity=4 * RANDOMUSER_PREFETCH_BATCH,
+        low_water=RANDOMUSER_PREFETCH_BATCH,
+        batch_size=RANDOMUSER_PREFETCH_BATCH,
+    )
+    if RANDOMUSER_PREFETCH_BATCH > 0
+    else None
+)
+
 
 def get_current_date_and_time() -> dict:
     """
@@ -12,26 +47,27 @@ def get_current_date_and_time() -> dict:
         "date_and_time": now.strftime("%Y-%m-%d %H:%M:%S"),
     }
 
-def get_randomuser_from_ramdomuserme() -> dict:
+async def get_randomuser_from_ramdomuserme() -> dict:
     """
     Returns a random user from randomuser.me API.
     Returns a dictionary with user's full name, email, and phone number.
     """
-    import requests
-    response = requests.get("https://randomuser.me/api/")
-    if response.status_code == 200:
-        user = response.json()
-        user_info = user['results'][0]
+    try:
+        if randomuser_prefetcher is not None:
+            user_info = await randomuser_prefetcher.get()
+        else:
+            user_info = (await fetch_randomusers(1))[0]
         full_name = f"{user_info['name']['first']} {user_info['name']['last']}"
         email = user_info['email']
         phone = user_info['phone']
-        return {
-            "full_name": full_name,
-            "email": email,
-            "phone": phone
-        }
-    else:
+    # ValueError covers a body that is not JSON; LookupError a missing field.
+    except (httpx.HTTPError, LookupError, ValueError):
         return {"error": "Failed to fetch data from randomuser.me"}
+    return {
+        "full_name": full_name,
+        "email": email,
+        "phone": phone
+    }
 
 
 root_agent = Agent(
@@ -0,0 +1,120 @@
+import asyncio
+import json
+import random
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+
+# Status codes worth retrying: rate limiting and transient server errors.
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+class AsyncHttpClient:
+    """A shared async JSON client with keep-alive pooling, retries and an optional cache.
+
+    One httpx.AsyncClient (and its connection pool) is kept per event loop,
+    so every tool call reuses open connections instead of paying DNS, TCP
+    and TLS setup each time. Connection errors, timeouts and retryable
+    status codes are retried up to `retries` times with full-jitter
+    exponential backoff. With `cache_ttl_seconds` > 0, successful responses
+    are cached per URL and query parameters for that long (bounded LRU).
+    """
+
+    def __init__(
+        self,
+        timeout_seconds: float = 10.0,
+        connect_timeout_seconds: float = 3.0,
+        max_connections: int = 32,
+        retries: int = 3,
+        backoff_base_seconds: float = 0.1,
+        backoff_max_seconds: float = 2.0,
+        cache_ttl_seconds: float = 0.0,
+        cache_size: int = 256,
+    ) -> None:
+        self.timeout = httpx.Timeout(timeout_seconds, connect=connect_timeout_seconds)
+        self.limits = httpx.Limits(
+            max_connections=max_connections, max_keepalive_connections=max_connections
+        )
+        self.retries = retries
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Tuple[str, Tuple], Tuple[float, str]]" = OrderedDict()
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self.requests_sent = 0
+        self.retries_done = 0
+        self.cache_hits = 0
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # Pooled connections belong to the loop that opened them, so each loop
+        # keeps its own client; it goes away with its loop.
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            client = self._clients[loop] = httpx.AsyncClient(
+                timeout=self.timeout, limits=self.limits
+            )
+        return client
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(
+            0, min(self.backoff_max_seconds, self.backoff_base_seconds * 2**attempt)
+        )
+
+    async def get_json(self, url: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """GETs `url` and returns the decoded JSON body.
+
+        Raises httpx.HTTPStatusError for a non-2xx response,
+        httpx.TransportError for connection problems once retries run out, and
+        ValueError (json.JSONDecodeError) if the body is not JSON.
+        """
+        cache_key = (url, tuple(sorted((params or {}).items())))
+        if self.cache_ttl_seconds > 0:
+            cached = self._cache.get(cache_key)
+            if cached is not None and cached[0] > time.monotonic():
+                self._cache.move_to_end(cache_key)
+                self.cache_hits += 1
+                # Decoded per hit, so callers can't change the cached value.
+                return json.loads(cached[1])
+
+        client = self._get_client()
+        attempt = 0
+        while True:
+            self.requests_sent += 1
+            try:
+                response = await client.get(url, params=params)
+                if response.status_code not in RETRY_STATUS_CODES or attempt >= self.retries:
+                    response.raise_for_status()
+                    break
+            except httpx.TransportError:
+                if attempt >= self.retries:
+                    raise
+            attempt += 1
+            self.retries_done += 1
+            await asyncio.sleep(self._backoff(attempt))
+
+        if self.cache_ttl_seconds > 0:
+            self._cache[cache_key] = (time.monotonic() + self.cache_ttl_seconds, response.text)
+            self._cache.move_to_end(cache_key)
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return response.json()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "requests_sent": self.requests_sent,
+            "retries": self.retries_done,
+            "cache_hits": self.cache_hits,
+        }
+
+    async def aclose(self) -> None:
+        """Closes the running event loop's client."""
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
@@ -0,0 +1,88 @@
+import asyncio
+from collections import deque
+from typing import Any, Awaitable, Callable, List, Optional
+
+
+class PrefetchBuffer:
+    """A bounded buffer of items fetched ahead of time in batches.
+
+    `get()` pops the next item in O(1). Whenever the buffer drops below
+    `low_water`, one background refill is started that asks `fetch_batch`
+    for enough items to top the buffer back up to `capacity`, at most
+    `batch_size` per request. A caller that finds the buffer empty waits
+    for that refill instead of starting its own, so a burst of calls costs
+    one upstream request per batch rather than one per call.
+    """
+
+    def __init__(
+        self,
+        fetch_batch: Callable[[int], Awaitable[List[Any]]],
+        capacity: int = 100,
+        low_water: int = 10,
+        batch_size: int = 50,
+    ) -> None:
+        if not 0 <= low_water < capacity:
+            raise ValueError("low_water must be at least 0 and below capacity.")
+        self.fetch_batch = fetch_batch
+        self.capacity = capacity
+        self.low_water = low_water
+        self.batch_size = batch_size
+        self._items: deque = deque()
+        self._refill: Optional[asyncio.Task] = None
+        self.hits = 0
+        self.misses = 0
+        self.batches_fetched = 0
+        self.last_error: Optional[BaseException] = None
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _refill_in_flight(self) -> Optional[asyncio.Task]:
+        # A task from an earlier event loop can never finish in this one.
+        task = self._refill
+        if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+            return None
+        return task
+
+    def _ensure_refill(self) -> asyncio.Task:
+        task = self._refill_in_flight()
+        if task is None:
+            task = self._refill = asyncio.create_task(self._fill())
+        return task
+
+    async def _fill(self) -> None:
+        try:
+            count = min(self.batch_size, self.capacity - len(self._items))
+            if count > 0:
+                items = await self.fetch_batch(count)
+                self.batches_fetched += 1
+                if not items:
+                    raise LookupError("fetch_batch returned no items.")
+                room = self.capacity - len(self._items)
+                self._items.extend(items[:room])
+            self.last_error = None
+        except Exception as e:
+            self.last_error = e
+
+    async def get(self) -> Any:
+        """Returns the next item; raises the refill's error if none could be fetched."""
+        if self._items:
+            self.hits += 1
+        else:
+            self.misses += 1
+            while not self._items:
+                await asyncio.shield(self._ensure_refill())
+                if not self._items and self.last_error is not None:
+                    raise self.last_error
+        item = self._items.popleft()
+        if len(self._items) < self.low_water:
+            self._ensure_refill()
+        return item
+
+    def stats(self) -> dict:
+        return {
+            "buffered": len(self._items),
+            "hits": self.hits,
+            "misses": self.misses,
+            "batches_fetched": self.batches_fetched,
+        }